@@ -0,0 +1,659 @@
+# Probability engine of the assist mode.
+#
+# For every covered cell, the Assist estimates the chance that it is a mine and the chance that it holds a
+# letter of the words, from what the player can see. It powers the heatmap overlay of the board (key 'h')
+# and the bots of game/bots.py.
+#
+# The visible hints are turned into the constraints of the solver (game/solver.Knowledge). The covered cells
+# that take part in a constraint are split into independent components. Each cell of a component is a mine,
+# a word letter or neither, and the assignments that satisfy every constraint are weighted by how likely
+# their number of mines and word letters is:
+#
+#     weight = p_mine ^ mines * p_word ^ word_letters * p_other ^ others
+#
+# where p_mine and p_word are the shares of the mines and word letters not found yet among the covered
+# cells (the difficulty tells the number of mines, the word list the number of letters). A cell that no
+# letter hint covers only has to be told apart from a mine: it is either a mine or "safe", and a safe cell
+# counts p_word + p_other, holding a word letter with chance p_word / (p_word + p_other). Cells outside
+# every constraint get p_mine and p_word directly.
+#
+# Components of up to EXACT_NODE_BUDGET search nodes are enumerated exactly. Larger ones are estimated by
+# Gibbs sampling, which is anytime: every update() spends at most SAMPLE_TIME_BUDGET on the chains, and
+# Board.idle() calls refine() each time keys.get() times out in Board.play(), while the player thinks, until
+# every chain has made SAMPLE_STEPS steps.
+#
+# Components are cached by their cells and constraints. After a reveal, only the components the revealed
+# cell touches change, so update() only redoes those. Exact results are stored per number of mines and
+# word letters, so a change of p_mine and p_word only reweights them, and the chains of sampled
+# components carry on with the new weights.
+
+import math
+import random
+import time
+from game.grid import COVERED
+from game.solver import Knowledge, UNKNOWN, MINE_CONSTRAINT, word_letter_table
+
+# Cell states in a component assignment
+IS_MINE = 0
+IS_WORD = 1
+IS_OTHER = 2
+IS_SAFE = 3  # Not a mine, in no letter constraint
+
+EXACT_NODE_BUDGET = 3000     # Search nodes an exact enumeration may visit before the component is sampled
+EXACT_CELL_LIMIT = 400       # Larger components are always sampled (the exact search recurses once per cell)
+SAMPLE_NODE_BUDGET = 5000    # Search nodes spent looking for the first assignment of a chain
+SAMPLE_CHAINS = 4            # Chains of a sampled component, each from its own first assignment
+SAMPLE_BURN_IN = 50          # Gibbs steps of a chain before its states are counted
+SAMPLE_STEPS = 2000          # Gibbs steps after which a chain is left alone (by default)
+SAMPLE_STEP_CHUNK = 10       # Gibbs steps a chain makes before the time budget is checked again
+SAMPLE_TIME_BUDGET = 0.02    # Seconds of sampling per update() or refine()
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class Assist:
+
+    # Mine and word letter probabilities of the covered cells of a board.
+    # Attributes:
+    # -----------
+    # board : Board
+    #     The board, read only through what the screen shows.
+    # knowledge : Knowledge
+    #     The constraints of the revealed cells.
+    # pending : list of int
+    #     Cells revealed since the last update().
+    # dirty : bool
+    #     Whether the probabilities are out of date.
+    # mine_probability : list of float
+    #     For each cell, the chance that it is a mine (0 for revealed cells, 1 for a stepped-on mine).
+    # word_probability : list of float
+    #     For each cell, the chance that it holds a word letter.
+    # cache : dict
+    #     Component key -> component result, see solve_component().
+    # chains : list
+    #     (cells, list of _ComponentSearch) of the sampled components of the board.
+    # sample_steps : int
+    #     Gibbs steps after which a chain is left alone.
+    #
+    # Methods:
+    # --------
+    # cell_revealed(index):
+    #     Tells the assist that a cell was revealed.
+    # update():
+    #     Recomputes the probabilities after reveals.
+    # refine(time_budget):
+    #     Spends more time on the sampled components.
+    # refining():
+    #     Checks if the sampled components would still gain from refine().
+
+    def __init__(self, board, sample_steps=SAMPLE_STEPS):
+        self.board = board
+        self.sample_steps = sample_steps
+        self.knowledge = Knowledge(board.size)
+        self.is_word_letter = word_letter_table(board.selected_words)
+        self.cache = {}
+        self.chains = []
+        self.rng = random.Random(0)  # Samples are repeatable
+        cell_count = board.size * board.size
+        self.mine_probability = [0.0] * cell_count
+        self.word_probability = [0.0] * cell_count
+        cells = board.grid.cells
+        self.pending = [index for index in range(cell_count) if not cells[index] & COVERED]
+        self.dirty = True
+
+    def cell_revealed(self, index):
+
+        # Tells the assist that a cell was revealed. The probabilities are recomputed on the next update().
+
+        self.pending.append(index)
+        self.dirty = True
+
+    def priors(self):
+
+        # Gets the chances of a covered cell outside every constraint to be a mine, a word letter or neither.
+        #
+        # Returns:
+        #     tuple: p_mine, p_word, p_other.
+
+        knowledge = self.knowledge
+        unknown = 0
+        known_mines = 0
+        known_words = 0
+        for index in range(self.board.size * self.board.size):
+            if knowledge.revealed[index]:
+                known_mines += knowledge.mine[index] == 1
+                known_words += knowledge.word[index] == 1
+            elif knowledge.mine[index] == 1:
+                known_mines += 1
+            elif knowledge.word[index] == 1:
+                known_words += 1
+            else:
+                unknown += 1
+        if unknown == 0:
+            return 0.0, 0.0, 1.0
+        word_letters = sum(len(word) for word in self.board.selected_words)
+        p_mine = min(0.95, max(0.001, (self.board.mine_count - known_mines) / unknown))
+        p_word = min(0.95 - p_mine, max(0.001, (word_letters - known_words) / unknown))
+        return p_mine, p_word, 1.0 - p_mine - p_word
+
+    def update(self):
+
+        # Recomputes the probabilities after the cells given to cell_revealed() were revealed.
+        # Does nothing if no cell was revealed since the last update.
+
+        if not self.dirty:
+            return
+        knowledge = self.knowledge
+        grid = self.board.grid
+        for index in self.pending:
+            if not knowledge.revealed[index]:
+                knowledge.observe(grid, index, self.is_word_letter)
+        self.pending = []
+        knowledge.propagate()
+        self.dirty = False
+
+        priors = p_mine, p_word, p_other = self.priors()
+        mine_probability = self.mine_probability
+        word_probability = self.word_probability
+        variables = []
+        for index in range(self.board.size * self.board.size):
+            mine = knowledge.mine[index]
+            word = knowledge.word[index]
+            if knowledge.revealed[index] or mine == 1 or (mine == 0 and word != UNKNOWN):
+                mine_probability[index] = float(mine == 1)
+                word_probability[index] = float(word == 1)
+            elif mine == 0:
+                # Safe, only the letter is unknown
+                mine_probability[index] = 0.0
+                word_probability[index] = p_word / (p_word + p_other)
+                variables.append(index)
+            elif word == 0:
+                mine_probability[index] = p_mine / (p_mine + p_other)
+                word_probability[index] = 0.0
+                variables.append(index)
+            else:
+                mine_probability[index] = p_mine
+                word_probability[index] = p_word
+                variables.append(index)
+
+        used = {}
+        self.chains = []
+        for cells, constraint_ids in self.components(variables):
+            key = (tuple(cells), tuple(constraint_ids),
+                   bytes(knowledge.mine[index] for index in cells), bytes(knowledge.word[index] for index in cells),
+                   tuple(len(knowledge.candidates[c]) if knowledge.candidates[c] is not None else -1 for c in constraint_ids))
+            result = self.cache.get(key)
+            if result is None:
+                result = self.solve_component(cells, constraint_ids, priors)
+            used[key] = result
+            kind, data = result
+            if kind == "sampled":
+                for chain in data:
+                    chain.set_priors(priors)
+                self.chains.append((cells, data))
+            else:
+                self.store(cells, self.marginals(data, len(cells), priors))
+        self.cache = used
+        self.refine()
+
+    def refine(self, time_budget=SAMPLE_TIME_BUDGET):
+
+        # Runs the chains of the sampled components a little longer, a few steps at a time in turn,
+        # and stores their estimates.
+        #
+        # Args:
+        #     time_budget (float): Seconds to spend at most (one chunk of steps is always made).
+
+        deadline = time.perf_counter() + time_budget
+        running = [chain for _, chains in self.chains for chain in chains if chain.steps < self.sample_steps]
+        running.sort(key=lambda chain: chain.steps)  # The chains behind go first
+        while running:
+            for chain in running:
+                chain.run(SAMPLE_STEP_CHUNK)
+                if time.perf_counter() > deadline:
+                    break
+            else:
+                running = [chain for chain in running if chain.steps < self.sample_steps]
+                continue
+            break
+        for cells, chains in self.chains:
+            kept = sum(chain.kept for chain in chains)
+            if kept == 0:
+                self.store(cells, chains[0].estimates())
+                continue
+            # Every chain weighs in by the number of steps it counted
+            mines = [0.0] * len(cells)
+            words = [0.0] * len(cells)
+            for chain in chains:
+                for position in range(len(cells)):
+                    mines[position] += chain.mine_counts[position]
+                    words[position] += chain.word_counts[position]
+            self.store(cells, ([count / kept for count in mines], [count / kept for count in words]))
+
+    def refining(self):
+
+        # Checks if the chain of a sampled component has not made sample_steps steps yet.
+        #
+        # Returns:
+        #     bool: True if refine() would still change the probabilities.
+
+        return any(chain.steps < self.sample_steps for _, chains in self.chains for chain in chains)
+
+    def store(self, cells, probabilities):
+        mines, words = probabilities
+        for position, index in enumerate(cells):
+            self.mine_probability[index] = mines[position]
+            self.word_probability[index] = words[position]
+
+    def components(self, variables):
+
+        # Splits the cells of unknown state that take part in a constraint into independent components.
+        #
+        # Args:
+        #     variables (list of int): The cells of unknown state.
+        #
+        # Returns:
+        #     list: (cells, constraint ids) of every component, both sorted.
+
+        knowledge = self.knowledge
+        is_variable = set(variables)
+        seen = set()
+        components = []
+        for start in variables:
+            if start in seen or not knowledge.watchers[start]:
+                continue
+            cells = []
+            constraint_ids = set()
+            stack = [start]
+            seen.add(start)
+            while stack:
+                index = stack.pop()
+                cells.append(index)
+                for constraint_id in knowledge.watchers[index]:
+                    if constraint_id in constraint_ids:
+                        continue
+                    constraint_ids.add(constraint_id)
+                    for cell in self.constraint_cells(constraint_id):
+                        if cell in is_variable and cell not in seen:
+                            seen.add(cell)
+                            stack.append(cell)
+            components.append((sorted(cells), sorted(constraint_ids)))
+        return components
+
+    def constraint_cells(self, constraint_id):
+        kind, cells, _ = self.knowledge.constraints[constraint_id]
+        if kind == MINE_CONSTRAINT:
+            return [cell for cell, _ in cells]
+        return cells
+
+    def solve_component(self, cells, constraint_ids, priors):
+
+        # Counts the assignments of a component that satisfy its constraints, or starts sampling them.
+        #
+        # Args:
+        #     cells (list of int): The cells of the component.
+        #     constraint_ids (list of int): The constraints linking them.
+        #     priors (tuple): p_mine, p_word, p_other, the weights of the chain of a large component.
+        #
+        # Returns:
+        #     tuple: ("exact", ({(mines, words, safes): [count, mine counts per cell, word or safe counts per cell]},
+        #                       positions of the cells that may be safe))
+        #            or ("sampled", list of _ComponentSearch running the chains of the component).
+
+        search = _ComponentSearch(self.knowledge, cells, constraint_ids)
+        if len(cells) <= EXACT_CELL_LIMIT:
+            try:
+                return "exact", search.enumerate(EXACT_NODE_BUDGET)
+            except _BudgetExceeded:
+                search.reset()
+        chains = [search]
+        while len(chains) < SAMPLE_CHAINS:
+            chains.append(_ComponentSearch(self.knowledge, cells, constraint_ids))
+        for chain in chains:
+            chain.start(priors, SAMPLE_NODE_BUDGET, random.Random(self.rng.random()))
+        return "sampled", chains
+
+    def marginals(self, data, cell_count, priors):
+
+        # Turns the counts of an exactly enumerated component into the mine and word letter probability
+        # of each of its cells.
+
+        counts, safe_positions = data
+        p_mine, p_word, p_other = priors
+        total = 0.0
+        mines = [0.0] * cell_count
+        words = [0.0] * cell_count
+        for (mine_count, word_count, safe_count), (count, mine_counts, word_counts) in counts.items():
+            other_count = cell_count - mine_count - word_count - safe_count
+            weight = p_mine ** mine_count * p_word ** word_count * p_other ** other_count * (p_word + p_other) ** safe_count
+            total += count * weight
+            for position in range(cell_count):
+                mines[position] += mine_counts[position] * weight
+                words[position] += word_counts[position] * weight
+        if total == 0:
+            return [0.0] * cell_count, [0.0] * cell_count  # Only when the hints contradict each other
+        share = p_word / (p_word + p_other)
+        for position in safe_positions:
+            words[position] *= share
+        return [value / total for value in mines], [value / total for value in words]
+
+
+class _ComponentSearch:
+
+    # Backtracking search over the assignments of one component, and the Gibbs sampling chain of a
+    # component too large to enumerate.
+
+    def __init__(self, knowledge, cells, constraint_ids):
+        self.cells = cells
+        position_of = {index: position for position, index in enumerate(cells)}
+
+        # For each cell, (constraint slot, bit) of the constraints it takes part in. Mine constraints keep the
+        # masks still allowed and the bits / mines assigned so far, letter constraints how many word letters
+        # are still needed and how many of their cells are unassigned.
+        self.kinds = []
+        self.masks = []
+        self.bits = []
+        self.mines = []
+        self.needed = []
+        self.unassigned = []
+        self.links = [[] for _ in cells]
+        for constraint_id in constraint_ids:
+            kind, constraint_cells, value = knowledge.constraints[constraint_id]
+            slot = len(self.kinds)
+            self.kinds.append(kind)
+            if kind == MINE_CONSTRAINT:
+                known_bits = 0
+                known_mines = 0
+                for cell, bit in constraint_cells:
+                    if cell in position_of and knowledge.mine[cell] == UNKNOWN:
+                        self.links[position_of[cell]].append((slot, bit))
+                    elif knowledge.mine[cell] != UNKNOWN:
+                        known_bits |= bit
+                        if knowledge.mine[cell] == 1:
+                            known_mines |= bit
+                self.masks.append(knowledge.candidates[constraint_id])
+                self.bits.append(known_bits)
+                self.mines.append(known_mines)
+                self.needed.append(0)
+                self.unassigned.append(0)
+            else:
+                needed = value
+                unassigned = 0
+                for cell in constraint_cells:
+                    if cell in position_of and knowledge.word[cell] == UNKNOWN:
+                        self.links[position_of[cell]].append((slot, 0))
+                        unassigned += 1
+                    elif knowledge.word[cell] == 1:
+                        needed -= 1
+                self.masks.append(None)
+                self.bits.append(0)
+                self.mines.append(0)
+                self.needed.append(needed)
+                self.unassigned.append(unassigned)
+        # The states each cell may still take. A cell in no letter constraint is only a mine or safe.
+        self.domains = []
+        self.safe_positions = []
+        for position, index in enumerate(cells):
+            mine = knowledge.mine[index]
+            word = knowledge.word[index]
+            domain = []
+            if mine != 0 and word != 1:
+                domain.append(IS_MINE)
+            if word == UNKNOWN and mine != 1 and all(self.kinds[slot] == MINE_CONSTRAINT for slot, _ in self.links[position]):
+                domain.append(IS_SAFE)
+                self.safe_positions.append(position)
+            else:
+                if word != 0 and mine != 1:
+                    domain.append(IS_WORD)
+                if mine != 1 and word != 1:
+                    domain.append(IS_OTHER)
+            self.domains.append(domain)
+        self.order = self.search_order()
+        self.nodes = 0
+        self.state = [IS_OTHER] * len(cells)
+        self.initial = (self.bits[:], self.mines[:], self.needed[:], self.unassigned[:])  # For reset()
+
+    def search_order(self):
+
+        # Orders the cells so that the cells of a constraint follow each other: the search goes from
+        # constraint to constraint, and each constraint is fully assigned, and checked exactly, early.
+        #
+        # Returns:
+        #     list of int: The positions of the cells, in search order.
+
+        members = [[] for _ in self.kinds]
+        for position, links in enumerate(self.links):
+            for slot, _ in links:
+                members[slot].append(position)
+        ordered = [False] * len(self.cells)
+        order = []
+        for start in range(len(self.cells)):
+            if ordered[start]:
+                continue
+            ordered[start] = True
+            order.append(start)
+            next_cell = len(order) - 1
+            while next_cell < len(order):
+                for slot, _ in self.links[order[next_cell]]:
+                    for position in members[slot]:
+                        if not ordered[position]:
+                            ordered[position] = True
+                            order.append(position)
+                next_cell += 1
+        return order
+
+    def assign(self, position, value):
+
+        # Assigns a state to a cell and checks its constraints. Returns False if one of them fails,
+        # in which case the assignment must still be undone with unassign().
+
+        ok = True
+        for slot, bit in self.links[position]:
+            if self.kinds[slot] == MINE_CONSTRAINT:
+                self.bits[slot] |= bit
+                if value == IS_MINE:
+                    self.mines[slot] |= bit
+                bits = self.bits[slot]
+                mines = self.mines[slot]
+                if ok and not any(mask & bits == mines for mask in self.masks[slot]):
+                    ok = False
+            else:
+                self.unassigned[slot] -= 1
+                if value == IS_WORD:
+                    self.needed[slot] -= 1
+                if ok and not 0 <= self.needed[slot] <= self.unassigned[slot]:
+                    ok = False
+        self.state[position] = value
+        return ok
+
+    def unassign(self, position, value):
+        for slot, bit in self.links[position]:
+            if self.kinds[slot] == MINE_CONSTRAINT:
+                self.bits[slot] &= ~bit
+                self.mines[slot] &= ~bit
+            else:
+                self.unassigned[slot] += 1
+                if value == IS_WORD:
+                    self.needed[slot] += 1
+
+    def enumerate(self, node_budget):
+
+        # Counts every satisfying assignment, grouped by its number of mines, word letters and safe cells.
+        # Raises _BudgetExceeded after node_budget search nodes.
+
+        counts = {}
+        cell_count = len(self.cells)
+        order = self.order
+        self.nodes = 0
+
+        def visit(step, totals):
+            self.nodes += 1
+            if self.nodes > node_budget:
+                raise _BudgetExceeded()
+            if step == cell_count:
+                entry = counts.get(totals)
+                if entry is None:
+                    entry = counts[totals] = [0, [0] * cell_count, [0] * cell_count]
+                entry[0] += 1
+                for cell_position, value in enumerate(self.state):
+                    if value == IS_MINE:
+                        entry[1][cell_position] += 1
+                    elif value == IS_WORD or value == IS_SAFE:
+                        entry[2][cell_position] += 1
+                return
+            mines, words, safes = totals
+            position = order[step]
+            for value in self.domains[position]:
+                if self.assign(position, value):
+                    visit(step + 1, (mines + (value == IS_MINE), words + (value == IS_WORD), safes + (value == IS_SAFE)))
+                self.unassign(position, value)
+
+        visit(0, (0, 0, 0))
+        return counts, self.safe_positions
+
+    def first_assignment(self, node_budget):
+
+        # Finds one satisfying assignment with a randomised search, trying the states of each cell in a random
+        # order weighted by their priors. The search keeps its own stack, as components can be longer than the
+        # recursion limit.
+        #
+        # Returns:
+        #     bool: True if an assignment was found (it is left in state), False if none was found in time.
+
+        cell_count = len(self.cells)
+        rng = self.rng
+        weights = self.weights
+
+        def shuffled(position):
+            domain = self.domains[position]
+            return sorted(domain, key=lambda value: rng.random() ** (1.0 / max(weights[value], 1e-9)), reverse=True)
+
+        # One [position, states left to try, state assigned or None] entry per cell of the search path
+        stack = [[self.order[0], shuffled(self.order[0]), None]] if cell_count else []
+        nodes = 0
+        while stack:
+            entry = stack[-1]
+            position, choices, assigned = entry
+            if assigned is not None:
+                self.unassign(position, assigned)  # Back from a failed state or an exhausted next cell
+                entry[2] = None
+            if not choices:
+                stack.pop()
+                continue
+            nodes += 1
+            if nodes > node_budget:
+                return False
+            value = choices.pop(0)
+            entry[2] = value
+            if self.assign(position, value):
+                if len(stack) == cell_count:
+                    return True
+                next_position = self.order[len(stack)]
+                stack.append([next_position, shuffled(next_position), None])
+        return cell_count == 0
+
+    def set_priors(self, priors):
+
+        # Sets the weights the chain samples with.
+
+        p_mine, p_word, p_other = priors
+        self.priors = priors
+        self.weights = (p_mine, p_word, p_other, p_word + p_other)
+        self.share = p_word / (p_word + p_other)
+
+    def start(self, priors, node_budget, rng):
+
+        # Starts the Gibbs sampling chain of a component too large to enumerate from one satisfying
+        # assignment. If none is found within node_budget search nodes, the chain is not run and the
+        # estimates stay the priors.
+        #
+        # Args:
+        #     priors (tuple): p_mine, p_word, p_other.
+        #     node_budget (int): Search nodes to spend on the first assignment.
+        #     rng (random.Random): The random numbers of the chain.
+
+        self.rng = rng
+        self.set_priors(priors)
+        cell_count = len(self.cells)
+        self.mine_counts = [0] * cell_count
+        self.word_counts = [0.0] * cell_count
+        self.kept = 0
+        self.blocks = [[] for _ in self.kinds]
+        for position, links in enumerate(self.links):
+            for slot, _ in links:
+                self.blocks[slot].append(position)
+        self.blocks = [block for block in self.blocks if block]
+        self.steps = 0
+        if not self.first_assignment(node_budget):
+            self.reset()
+            self.steps = math.inf  # Nothing to run
+
+    def run(self, steps):
+
+        # Makes Gibbs sampling steps: each step picks a constraint and draws new states for its cells among
+        # all the states that keep every constraint satisfied, in proportion to their weights. After the
+        # burn-in, the states of every step are counted.
+        #
+        # Args:
+        #     steps (int): The number of steps.
+
+        rng = self.rng
+        weights = self.weights
+        state = self.state
+        for _ in range(steps):
+            block = self.blocks[rng.randrange(len(self.blocks))]
+            for position in block:
+                self.unassign(position, state[position])
+            choices = []
+            choice_weights = []
+
+            def visit(depth, weight):
+                if depth == len(block):
+                    choices.append([state[position] for position in block])
+                    choice_weights.append(weight)
+                    return
+                position = block[depth]
+                for value in self.domains[position]:
+                    if self.assign(position, value):
+                        visit(depth + 1, weight * weights[value])
+                    self.unassign(position, value)
+
+            visit(0, 1.0)
+            # The states before the step are always among the choices
+            for position, value in zip(block, rng.choices(choices, choice_weights)[0]):
+                self.assign(position, value)
+            self.steps += 1
+            if self.steps > SAMPLE_BURN_IN:
+                self.kept += 1
+                for position, value in enumerate(state):
+                    if value == IS_MINE:
+                        self.mine_counts[position] += 1
+                    elif value == IS_WORD:
+                        self.word_counts[position] += 1
+                    elif value == IS_SAFE:
+                        self.word_counts[position] += self.share
+
+    def estimates(self):
+
+        # Gets the mine and word letter frequencies of each cell over the steps counted so far
+        # (the priors before any step was counted).
+        #
+        # Returns:
+        #     tuple: Mine frequencies and word letter frequencies of each cell.
+
+        cell_count = len(self.cells)
+        if self.kept == 0:
+            return [self.priors[IS_MINE]] * cell_count, [self.priors[IS_WORD]] * cell_count
+        return [count / self.kept for count in self.mine_counts], [count / self.kept for count in self.word_counts]
+
+    def reset(self):
+
+        # Undoes the assignments left by a finished or interrupted search.
+
+        bits, mines, needed, unassigned = self.initial
+        self.bits = bits[:]
+        self.mines = mines[:]
+        self.needed = needed[:]
+        self.unassigned = unassigned[:]
@@ -0,0 +1,222 @@
+# Bot players of the classic mode.
+#
+# A strategy looks at what the screen shows and picks the next action; play() applies the actions to a board
+# without a screen, through the same Board.reveal_cell() a mouse click uses, until the game ends. The board
+# keeps the score under the usual rules, so a bot's final score is the score a player making the same clicks
+# would get. util/tournament.py pits the strategies against each other over many seeded boards.
+#
+# Strategies never read the board directly: they get a VisibleState, which hides covered cells.
+# Adding a strategy takes a subclass of Strategy and an entry in STRATEGIES.
+
+import random
+from game.grid import COVERED, FLAGGED
+from game.solver import neighbour_table
+
+REVEAL = "reveal"
+FLAG = "flag"
+
+BOT_SAMPLE_STEPS = 200   # Gibbs steps of the assist chains of the solver bot, run to the end before every move
+MINE_RISK_WEIGHT = 3.0   # How many word letter chances the solver bot gives up to avoid one mine chance
+
+
+class VisibleState:
+
+    # What a player sees of a board.
+    # Attributes:
+    # -----------
+    # size : int
+    #     The size of the board.
+    # words : list of str
+    #     The words to find.
+    # found_words : set of str
+    #     The words found so far.
+    # score : int
+    #     The current score.
+    # mines_stepped : int
+    #     How many mines were stepped on.
+    #
+    # Methods:
+    # --------
+    # covered_cells():
+    #     Gets the indexes of the covered cells that are not flagged.
+    # is_covered(index):
+    #     Checks if a cell is covered.
+    # letter(index), letter_hint(index), mine_hint(index):
+    #     Get what a revealed cell shows (None for covered cells).
+    # assist():
+    #     Gets the mine and word letter probabilities of the covered cells.
+
+    def __init__(self, board):
+        self._board = board
+        self.size = board.size
+        self.words = board.selected_words
+        self.found_words = board.revealed_words
+        self.score = board.score
+        self.mines_stepped = board.mine_stepped_counter
+
+    def covered_cells(self):
+        cells = self._board.grid.cells
+        return [index for index in range(self.size * self.size) if cells[index] & COVERED and not cells[index] & FLAGGED]
+
+    def is_covered(self, index):
+        return bool(self._board.grid.cells[index] & COVERED)
+
+    def letter(self, index):
+        if self.is_covered(index):
+            return None
+        return self._board.grid.char(index)
+
+    def letter_hint(self, index):
+
+        # Gets the letter hint of a revealed cell: how many word letters its 3x3 area holds.
+
+        if self.is_covered(index):
+            return None
+        return self._board.grid.letter_counts[index]
+
+    def mine_hint(self, index):
+        if self.is_covered(index):
+            return None
+        return self._board.grid.mine_hint(index)
+
+    def assist(self):
+
+        # Gets the probability engine of the board, brought up to date with every sampling chain run to its end,
+        # so the probabilities only depend on the board and the moves made.
+        #
+        # Returns:
+        #     Assist: The engine, see game/assist.py.
+
+        assist = self._board.get_assist(BOT_SAMPLE_STEPS)
+        while assist.refining():
+            assist.refine()
+        return assist
+
+
+class Strategy:
+
+    # The base of the bot strategies.
+    # Attributes:
+    # -----------
+    # name : str
+    #     The name of the strategy in the tournament reports.
+    # rng : random.Random
+    #     The random numbers of the strategy, seeded per game.
+    #
+    # Methods:
+    # --------
+    # next_action(state):
+    #     Picks the next action.
+
+    name = "base"
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+
+    def next_action(self, state):
+
+        # Picks the next action from what the player sees.
+        #
+        # Args:
+        #     state (VisibleState): The visible state of the board.
+        #
+        # Returns:
+        #     tuple: (REVEAL or FLAG, row, col), or None to stop playing.
+
+        raise NotImplementedError
+
+
+class RandomStrategy(Strategy):
+
+    # Reveals a random covered cell.
+
+    name = "random"
+
+    def next_action(self, state):
+        covered = state.covered_cells()
+        if not covered:
+            return None
+        return (REVEAL,) + divmod(self.rng.choice(covered), state.size)
+
+
+class GreedyLetterStrategy(Strategy):
+
+    # Reveals the covered cell with the largest sum of letter hints among its revealed neighbours,
+    # so it follows the letters of the words without looking at the mine hints.
+    # Before anything is revealed, or when no covered cell touches a revealed one, it picks a random cell.
+
+    name = "greedy"
+
+    def next_action(self, state):
+        covered = state.covered_cells()
+        if not covered:
+            return None
+        neighbours = neighbour_table(state.size)
+        best = []
+        best_score = 0
+        for index in covered:
+            score = 0
+            for neighbour, _ in neighbours[index][0]:
+                hint = state.letter_hint(neighbour)
+                if hint:
+                    score += hint
+            if score > best_score:
+                best = [index]
+                best_score = score
+            elif score == best_score and score > 0:
+                best.append(index)
+        return (REVEAL,) + divmod(self.rng.choice(best or covered), state.size)
+
+
+class SolverStrategy(Strategy):
+
+    # Reveals the cell with the best trade of word letter chance against mine chance, from the
+    # probabilities of the assist engine (which holds everything the solver can deduce): cells known to be
+    # safe come first, the most likely word letters among them first.
+
+    name = "solver"
+
+    def next_action(self, state):
+        covered = state.covered_cells()
+        if not covered:
+            return None
+        assist = state.assist()
+        best = max(covered, key=lambda index: (
+            assist.mine_probability[index] == 0,
+            assist.word_probability[index] - MINE_RISK_WEIGHT * assist.mine_probability[index],
+        ))
+        return (REVEAL,) + divmod(best, state.size)
+
+
+STRATEGIES = {strategy.name: strategy for strategy in (RandomStrategy, GreedyLetterStrategy, SolverStrategy)}
+
+
+def play(board, strategy, max_moves=None):
+
+    # Plays a game on a board without a screen until all words are found, three mines are stepped on,
+    # the strategy stops or max_moves actions were made.
+    #
+    # Args:
+    #     board (Board): A board built without a screen, e.g. Board(None, None, seed=...).
+    #     strategy (Strategy): The bot.
+    #     max_moves (int, optional): The most actions to make (default: one per cell).
+    #
+    # Returns:
+    #     Board: The board at the end of the game, holding its score and state.
+
+    if max_moves is None:
+        max_moves = board.size * board.size
+    for _ in range(max_moves):
+        action = strategy.next_action(VisibleState(board))
+        if action is None:
+            break
+        kind, row, col = action
+        if not board.grid.cells[row * board.size + col] & COVERED:
+            continue  # Clicks on revealed cells do nothing in the game either
+        if kind == FLAG:
+            board.toggle_mark(row, col)
+            continue
+        board.reveal_cell(row, col)
+        if board.check_all_words_revealed() or board.check_if_mine_stepped_lost():
+            break
+    return board
@@ -0,0 +1,1670 @@
+# A module for the classic mode of The Puzzle Game.
+# This module contains the Board class, which represents the game board and handles the game logic,
+# user input, and game state updates shared by every classic difficulty.
+#
+# The difficulty modules (classicEasy.py, classicHard.py, classicExpert.py, classicCustom.py) subclass Board
+# and only name their difficulty profile. The values that balance the gameplay (board size, number of words
+# and mines, penalties, random click caps and bonus points) are read from data/difficulties.ini (see game/profiles.py).
+#
+# Boards larger than the screen are drawn through a viewport with a mini-map (see game/viewport.py).
+#
+# The board is played with the mouse or with a keyboard cursor: the arrow keys move it (the viewport follows),
+# Space / Enter reveal the cell under it and 'f' marks it. Revealing a revealed cell whose mines are all flagged
+# chords it: its other covered neighbours are revealed in one move, through the batched reveal of reveal_cells().
+# With the flood reveal switched on, revealing a cell with no mine and no word letter around it also reveals the
+# region of such cells around it and its border, as in classic Minesweeper (see flood_fill()).
+#
+# The assist engine (game/assist.py) estimates the mine and word letter chances of the covered cells,
+# shown as a heatmap over the board with the 'h' key.
+#
+# Every game records its seed and moves as a replay (util/replay.py), saved with the user's statistics.
+#
+# The game loop is a coroutine awaiting keys from the menu's event loop (see play() and util/aio.py). Finished
+# games are saved on a background I/O thread, and the board of the next game is dealt on a background thread
+# while the current one is played, so neither stalls the screen.
+#
+# No-guess boards are regenerated until the solver (game/solver.py) proves that every word can be found
+# without guessing a mine. Their seeds are prepared in the background by the board pool (game/pool.py).
+
+import asyncio
+import copy
+import curses
+import math
+import random
+import time
+from util import profiler
+from game.grid import Grid, COVERED, FLAGGED, QUESTIONED, MINE, EMPTY, DIRECTIONS
+from game.profiles import get_profile, stage_value
+from game.viewport import Viewport, MiniMap, WHEEL_UP, WHEEL_DOWN
+from game.solver import solve
+from game.assist import Assist, SAMPLE_STEPS
+from game.pool import get_pool
+from game.words import get_word_list
+from util.replay import ReplayRecorder, save_replay, REVEAL, MARK, CHORD
+from util import aio, leaderboard, snapshot, user_store
+
+# The mine and random click penalties are tuned for boards up to 12x12, larger boards are measured as if they were
+# this big
+MAX_PENALTY_CELLS = 144
+
+# Generation budget of a no-guess board: layouts tried and seconds spent before the last layout is kept unproven
+NO_GUESS_ATTEMPTS = 100
+NO_GUESS_TIME_BUDGET = 2.0
+
+# Milliseconds the game waits for a key before refining a heatmap that is still being sampled
+REFINE_INTERVAL = 30
+
+# Smallest terminal the game runs in, boards that do not fit are scrolled
+MIN_WINDOW_HEIGHT = 20
+MIN_WINDOW_WIDTH = 100
+
+# Scrolling keys and how many rows and columns they move the viewport (the keyboard cursor, during a game)
+SCROLL_KEYS = {
+    curses.KEY_UP: (-1, 0),
+    curses.KEY_DOWN: (1, 0),
+    curses.KEY_LEFT: (0, -1),
+    curses.KEY_RIGHT: (0, 1),
+}
+
+# Keys acting on the cell under the keyboard cursor
+OPEN_KEYS = (ord(' '), ord('\n'), ord('\r'), curses.KEY_ENTER)  # Reveals a covered cell, chords a revealed one
+MARK_KEY = ord('f')
+
+class Board:
+
+    # A class to represent the game board for The Puzzle Game.
+    # Attributes:
+    # -----------
+    # stdscr : curses.window
+    #     The standard screen window for displaying the game.
+    # user : User
+    #     The user playing the game. Can be None for boards without a screen (benchmarks, simulations).
+    # size : int, optional
+    #     The size of the game board (default is the size of the profile).
+    # profile : DifficultyProfile
+    #     The settings of the difficulty (default is the profile named by profile_name).
+    # seed : int, optional
+    #     Seed of the board generator. Boards built from the same seed are identical (default is None, a random board).
+    # rng : random.Random
+    #     The random generator used by fill_board().
+    # no_guess : bool
+    #     Whether the board is regenerated until the solver proves it can be won without guessing.
+    # fair : bool
+    #     For no-guess boards, whether the solver proved the board fair within the generation budget
+    #     (None for other boards, which are not checked).
+    # grid : Grid
+    #     Compact storage of the board: letters, mines, covered / flagged / questioned states and hints,
+    #     in flat arrays indexed by row * size + col (see game/grid.py).
+    # words : list of str
+    #     List of words loaded from file.
+    # word_complexity : dict
+    #     Dictionary mapping words to their complexity.
+    # selected_words : list of str
+    #     List of words selected to be placed on the board.
+    # revealed_words : set
+    #     Set of words that have been revealed.
+    # word_reveal_status : dict
+    #     Dictionary tracking the reveal status of each word, as lists of cell indexes.
+    # common_letters : str
+    #     String of common letters used to fill the board.
+    # exit_prompt : bool
+    #     Flag indicating whether the exit prompt is displayed.
+    # game_won : bool
+    #     Flag indicating whether the game is won.
+    # game_lose : bool
+    #     Flag indicating whether the game is lost.
+    # mine_lose : bool
+    #     Flag indicating whether the game is lost due to stepping on mines.
+    # move_count : int
+    #     Counter for the number of moves made.
+    # last_revealed : int
+    #     Index of the last revealed cell.
+    # current_word : str
+    #     The current word being revealed.
+    # score : int
+    #     The player's score.
+    # base_penalty_random : int
+    #     Base penalty for random clicks.
+    # random_click_counter : int
+    #     Counter for the number of random clicks.
+    # mine_stepped_counter : int
+    #     Counter for the number of mines stepped on.
+    # random_click_cap : int
+    #     Cap for the number of random clicks allowed.
+    # click_share : float
+    #     How much of a random click one click counts for: 1, or the share of MAX_PENALTY_CELLS cells in the
+    #     board on larger boards, so the clicks of a board are measured as if it had MAX_PENALTY_CELLS cells.
+    # user_stats : dict
+    #     Dictionary containing the user's statistics (see util/user_store.py).
+    # difficulty_label : str
+    #     The name the statistics and the leaderboard keep this difficulty and size under, e.g. "Custom-25".
+    # assist : Assist
+    #     The probability engine of the heatmap, created the first time it is needed (None before).
+    # show_heatmap : bool
+    #     Whether covered cells show their mine and word letter chances.
+    # viewport : Viewport
+    #     The part of the board shown on screen, for boards larger than the screen.
+    # minimap : MiniMap
+    #     The overview of the whole board shown next to a board larger than the screen.
+    # replay : ReplayRecorder
+    #     Records the moves of the game, saved as a replay with the user's statistics.
+    # next_board : concurrent.futures.Future
+    #     The board of the next game, dealt in the background while this one is played (None until play() starts it).
+    # saved_events : int
+    #     Bytes of replay events in the last snapshot saved by autosave() (0 while the game has none).
+    # cursor : int
+    #     Index of the cell under the keyboard cursor (None until an arrow key is pressed).
+    # flood : bool
+    #     Whether revealing a cell whose mine and letter hints are both blank floods its region (see flood_fill()).
+    #     A setting of the player, like the heatmap (default is False).
+    #
+    # Difficulty settings (copied from the profile):
+    # ----------------------------------------------
+    # profile_name : str
+    #     Class attribute, the difficulty profile used when no profile is given. Set by each difficulty.
+    # timed : bool
+    #     Class attribute, whether games have a time limit. Set by the timed mode (game/timedBoard.py).
+    # daily : bool
+    #     Class attribute, whether the board is the one of the daily challenge (game/dailyBoard.py).
+    # resumable : bool
+    #     Class attribute, whether a game left unfinished can be resumed from its snapshot (util/snapshot.py).
+    # word_count : int
+    #     Number of words placed on the board, at most the number of words that fit on it.
+    # fill_chance : float
+    #     Chance of an empty cell to be filled with a random letter.
+    # mine_count : int
+    #     Number of mines placed on the board.
+    # mine_base_penalty : int
+    #     Base of the dynamic penalty for stepping on a mine.
+    # random_click_penalties : dict
+    #     Words left -> base penalty of a random click.
+    # random_click_caps : dict
+    #     Words left -> (random click cap, how much the random click counter is reduced) once a word is revealed.
+    # word_bonus_points : dict
+    #     Words left -> bonus points per remaining allowed random click once a word is revealed.
+    #
+    # When more words are left than a stage table lists, the entry of the largest number of words left is used.
+    #
+    # Methods:
+    # --------
+    # load_words():
+    #     Loads words and their complexity from a file.
+    # load_user_stats():
+    #     Loads user statistics from a file.
+    # save_user_stats():
+    #     Saves user statistics to a file.
+    # fill_board():
+    #     Fills the game board with words, mines, and hints.
+    # generate_fair_board():
+    #     Fills the game board with layouts until the solver proves one fair.
+    # deal(profile, no_guess):
+    #     Builds a board without a screen or a user, to be played later.
+    # prepare_next_board():
+    #     Starts dealing the board of the next game in the background.
+    # start():
+    #     Starts the game on the board.
+    # autosave():
+    #     Saves the snapshot of the game after a move, or drops it once the game is over.
+    # adopt(board):
+    #     Takes over the game of a dealt board.
+    # copy():
+    #     Gets a copy of the board whose game is played apart from this one.
+    # new_game():
+    #     Starts a new board of the same difficulty.
+    # calculate_mine_hint(row, col):
+    #     Calculates the mine hint for a given cell.
+    # calculate_letter_hint(row, col):
+    #     Calculates the letter hint for a given cell.
+    # display_user_info():
+    #     Displays user information on the screen.
+    # get_assist(sample_steps):
+    #     Gets the up-to-date probability engine of the board.
+    # heatmap_cell(index):
+    #     Gets the heatmap text of a covered cell.
+    # draw_minimap(h, w):
+    #     Draws the overview of a board larger than the screen.
+    # handle_scroll(key, button_state):
+    #     Moves the viewport for scrolling keys, the mouse wheel and clicks on the mini-map.
+    # draw_board():
+    #     Draws the game board on the screen.
+    # lose_message():
+    #     Gets the reason shown when the game is lost.
+    # new_game_hint():
+    #     Gets the line that tells how to go on once the game is over.
+    # calculate_base_score(word):
+    #     Calculates the base score for a given word.
+    # calculate_clean_reveal_bonus(clean_reveal, word):
+    #     Calculates the bonus score for a clean reveal of a word.
+    # calculate_total_score(word, clean_reveal):
+    #     Calculates the total score for revealing a word.
+    # check_revealed_words():
+    #     Checks if any words have been fully revealed.
+    # check_if_mine_stepped_lost():
+    #     Checks if the game is lost due to stepping on too many mines.
+    # adjust_random_click_cap():
+    #     Adjusts the cap for the number of random clicks allowed.
+    # award_bonus_points():
+    #     Awards bonus points based on the number of words left and random clicks.
+    # penalty_multiplier(random_click_counter, cap_value):
+    #     Calculates the penalty multiplier for random clicks.
+    # get_word_cells(word):
+    #     Gets the indexes of the cells containing a given word.
+    # check_word_revealed(row, col, word, direction):
+    #     Checks if a word is fully revealed starting from a given cell.
+    # check_all_words_revealed():
+    #     Checks if all selected words have been revealed.
+    # reveal_cell(row, col):
+    #     Reveals a covered cell and applies the game rules to it.
+    # reveal_cells(indexes):
+    #     Applies the game rules to the cells revealed by one move, as one batch.
+    # flood_fill(starts):
+    #     Gets the cells a reveal opens with the flood reveal.
+    # chord_cells(index):
+    #     Gets the cells a chord on a revealed cell reveals.
+    # chord(row, col):
+    #     Reveals the unflagged neighbours of a revealed cell whose mines are all flagged.
+    # toggle_mark(row, col):
+    #     Cycles the flag / question mark of a covered cell.
+    # check_window_size(keys):
+    #     Checks if the terminal window size is sufficient for the game.
+    # update_stats(game_won, game_lose):
+    #     Updates the user's statistics based on the game result.
+    # key_timeout():
+    #     Gets how long the game loop waits for a key before idle() runs.
+    # idle():
+    #     Does the work that goes on between keys.
+    # move_cursor(d_row, d_col):
+    #     Moves the keyboard cursor, and the viewport with it.
+    # open_cell(row, col):
+    #     Reveals or chords a cell, as a click on it does.
+    # handle_click():
+    #     Handles a mouse event on the board.
+    # handle_key(key):
+    #     Applies one key press to the game.
+    # play(keys):
+    #     Runs the main game loop on the menu's event loop.
+    # run():
+    #     Runs the main game loop on an event loop of its own.
+
+    profile_name = "Easy"
+    timed = False
+    daily = False
+    resumable = True
+
+    def __init__(self, stdscr, user, size=None, seed=None, profile=None, no_guess=False):
+        self.stdscr = stdscr
+        self.user = user
+        if profile is None:
+            profile = get_profile(self.profile_name)
+        if size is not None and size != profile.size:
+            profile = profile.scaled_to(size)
+        self.profile = profile
+        self.size = profile.size
+        self.difficulty_label = leaderboard.difficulty_label(profile.name, self.size, self.timed)
+        self.word_count = profile.word_count
+        self.fill_chance = profile.fill_chance
+        self.mine_count = profile.mine_count
+        self.mine_base_penalty = profile.mine_base_penalty
+        self.random_click_penalties = profile.random_click_penalties
+        self.random_click_caps = profile.random_click_caps
+        self.word_bonus_points = profile.word_bonus_points
+        self.viewport = Viewport(self.size)
+        self.assist = None
+        self.show_heatmap = False
+        self.grid = Grid(self.size)
+        self.words, self.word_complexity = self.load_words()  # Load words and their complexity from file
+        self.selected_words = []
+        self.revealed_words = set()
+        self.word_reveal_status = {}  # Track the reveal status of each word
+        self.common_letters = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+        self.seed = seed
+        self.no_guess = no_guess
+        self.fair = None
+        if no_guess:
+            self.generate_fair_board()
+        else:
+            if seed is None:
+                self.seed = random.getrandbits(32)  # Every board has a seed, so its replay can rebuild it
+            self.rng = random.Random(self.seed)  # Boards built from the same seed are identical
+            self.fill_board()
+        self.exit_prompt = False
+        self.game_won = False
+        self.game_lose = False
+        self.mine_lose = False
+        self.move_count = 0  # Initialize move counter
+        self.last_revealed = None  # Track the last revealed cell
+        self.current_word = None  # Track the current word being revealed
+        self.score = 0  # Initialize score
+        self.base_penalty_random = 0
+        self.random_click_counter = 0
+        self.mine_stepped_counter = 0
+        self.random_click_cap = 5  # Initial cap for random clicks
+        self.click_share = min(1.0, MAX_PENALTY_CELLS / self.size ** 2)
+        self.user_stats = self.load_user_stats()
+        self.next_board = None
+        self.cursor = None
+        self.flood = False
+        self.start()
+
+    @profiler.timed("load_words")
+    def load_words(self):
+
+        # Gets the words and their complexities from './data/words.txt' (see game/words.py).
+        # The file is read by the first board only, every board shares the words and only reads them.
+        #
+        # Returns:
+        #     tuple: A tuple containing:
+        #         - list: A list of words.
+        #         - dict: A dictionary where keys are words and values are their complexities.
+
+        return get_word_list()
+
+    def load_user_stats(self):
+
+        # Gets the user's statistics: those of the User, read from the user store (see util/user_store.py)
+        # when the player logged in. Boards update them in place and save them in the background, so they are
+        # not read again for every board, and a save still being written is never read back.
+        #
+        # Returns:
+        #     dict: The user's statistics, with the overall FIELDS of util/user_store.py and the
+        #     per-difficulty aggregates under 'difficulties'. Boards without a user get an empty dict.
+
+        if self.user is None:
+            return {}
+        return self.user.stats
+
+    @profiler.timed("save_user_stats")
+    def save_user_stats(self):
+
+        # Saves the user's statistics to the user store (see util/user_store.py).
+
+        user_store.save_user(self.user.user_id, self.user_stats)
+
+    @profiler.timed("fill_board")
+    def fill_board(self):
+
+        # Fills the game board with words, mines, and hints.
+        # This method performs the following steps:
+        #
+        # 1. Resets the board and related variables.
+        # 2. Filters out words longer than the board size.
+        # 3. Randomly selects word_count words to place on the board (all of them if fewer words fit).
+        # 4. Initializes the reveal status for each selected word.
+        # 5. Randomly places the selected words on the board either horizontally or vertically.
+        # 6. Randomly fills some of the remaining empty cells with common letters.
+        # 7. Generates a list of all possible positions for placing mines.
+        # 8. Randomly places mine_count mines on the board.
+        # 9. Calculates mine hints for each cell.
+        # 10. Calculates letter hints for each cell.
+        #
+        # Attributes:
+        #     grid (Grid): Compact storage of the board, replaced by a fresh one.
+        #     selected_words (list): List of words selected to be placed on the board.
+        #     revealed_words (set): Set of words that have been revealed.
+        #     word_reveal_status (dict): Dictionary tracking the reveal status of each word.
+        #     move_count (int): Counter for the number of moves made.
+        #     last_revealed (int): Index of the last revealed cell.
+        #     current_word (str): The current word being revealed.
+        #     score (int): The player's score.
+
+        # Reset the board and related variables
+        size = self.size
+        self.grid = Grid(size)
+        self.minimap = MiniMap(self.grid)
+        letters = self.grid.letters
+        self.selected_words = []
+        self.revealed_words = set()
+        self.word_reveal_status = {}
+        self.move_count = 0
+        self.last_revealed = None
+        self.current_word = None
+        self.score = 0
+
+        # Filter out words longer than the board size
+        valid_words = [word for word in self.words if len(word) <= size]
+
+        # Randomly select the words to place on the board
+        self.selected_words = self.rng.sample(valid_words, min(self.word_count, len(valid_words)))
+
+        # Initialize the reveal status for each selected word
+        for word in self.selected_words:
+            self.word_reveal_status[word] = []
+
+        # Randomly place words on the board
+        placed_letters = set()
+        for word in self.selected_words:
+            placed = False
+            attempts = 0
+            while not placed:
+                attempts += 1
+                if attempts > 1000:
+                    # The words placed so far leave no room for this one, start over with a new layout
+                    return self.fill_board()
+                direction = self.rng.choice(['H', 'V'])  # H: Horizontal, V: Vertical
+                if direction == 'H':
+                    row = self.rng.randint(0, size - 1)
+                    col = self.rng.randint(0, size - len(word))
+                    step = 1
+                else:
+                    row = self.rng.randint(0, size - len(word))
+                    col = self.rng.randint(0, size - 1)
+                    step = size
+                start = row * size + col
+                cells = range(start, start + len(word) * step, step)
+                if all(letters[index] == EMPTY for index in cells):
+                    for index, letter in zip(cells, word):
+                        letters[index] = ord(letter)
+                        placed_letters.add(letter)
+                    placed = True
+
+        # Randomly fill some of the remaining empty cells with common letters,
+        # avoiding letters that are already placed in words
+        available_letters = [ord(letter) for letter in self.common_letters if letter not in placed_letters]
+        if available_letters:
+            for index in range(size * size):
+                if letters[index] == EMPTY and self.rng.random() < self.fill_chance:  # Chance to fill the cell
+                                                                                     # Reduce this value to increase the number of empty cells
+                    letters[index] = self.rng.choice(available_letters)  # Randomly choose a common letter
+
+        # Generate a list of all possible positions, mines are never placed on the border
+        possible_positions = [i * size + j for i in range(1, size - 1) for j in range(1, size - 1) if letters[i * size + j] == EMPTY]
+
+        # Randomly shuffle the list of possible positions
+        self.rng.shuffle(possible_positions)
+
+        # Ensure there are enough positions to place mines
+        num_mines = min(self.mine_count, len(possible_positions))
+
+        # Place mines in the first num_mines positions from the shuffled list
+        for index in possible_positions[:num_mines]:
+            self.grid.cells[index] |= MINE
+
+        # Calculate mine hints for each cell
+        with profiler.timer("calculate_mine_hint pass"):
+            self.grid.calculate_mine_masks()
+
+        # Calculate letter hints for each cell
+        self.grid.calculate_letter_counts(''.join(self.selected_words))
+
+    @profiler.timed("generate_fair_board")
+    def generate_fair_board(self, attempts=NO_GUESS_ATTEMPTS, time_budget=NO_GUESS_TIME_BUDGET):
+
+        # Fills the game board with layouts until the solver proves that all words can be found without
+        # guessing a mine, within a budget of layouts and seconds (NO_GUESS_ATTEMPTS and NO_GUESS_TIME_BUDGET
+        # by default).
+        #
+        # Every layout is built from a seed of its own, and the seed of the fair layout becomes the seed of
+        # the board, so a board rebuilt from that seed is fair on the first attempt (this is how the board
+        # pool hands out boards). If the budget runs out, the last layout is kept and fair is False.
+        #
+        # Args:
+        #     attempts (int): Layouts tried at most.
+        #     time_budget (float): Seconds spent at most, None for no limit: the kept layout then only depends
+        #         on the first seed, whatever the speed of the computer.
+        #
+        # Attributes:
+        #     seed (int): The seed of the kept layout.
+        #     fair (bool): Whether the kept layout was proven fair.
+
+        seeds = random.Random(self.seed)  # Picks the seeds of the layouts after the first one
+        candidate = self.seed if self.seed is not None else seeds.getrandbits(32)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else math.inf
+        for attempt in range(attempts):
+            self.seed = candidate
+            self.rng = random.Random(candidate)
+            self.fill_board()
+            self.fair = solve(self).fair
+            if self.fair or time.perf_counter() > deadline:
+                break
+            candidate = seeds.getrandbits(32)
+
+    def calculate_mine_hint(self, row, col):
+
+        # Calculate the hint for the mines around a given cell in the board.
+        # The hint is stored as a small number with one bit per direction holding a mine
+        # (see game/grid.py). It is turned into braille glyphs only when the board is drawn.
+        #
+        # Args:
+        #     row (int): The row index of the cell.
+        #     col (int): The column index of the cell.
+        #
+        # Returns:
+        #     int: The direction bits of the mines around the cell.
+
+        return self.grid.neighbour_mine_mask(row, col)
+
+    def calculate_letter_hint(self, row, col):
+
+        # Calculate the hint for a given cell in the puzzle game.
+        #
+        # This method counts how many cells of the surrounding 3x3 grid hold a
+        # character that appears in any of the selected words.
+        #
+        # Args:
+        #     row (int): The row index of the cell.
+        #     col (int): The column index of the cell.
+        #
+        # Returns:
+        #     int: The number of cells holding a letter of a selected word.
+
+        count = 0
+        for i in range(max(0, row - 1), min(self.size, row + 2)):
+            for j in range(max(0, col - 1), min(self.size, col + 2)):
+                # Check if the character is part of any selected word
+                if any(self.grid.char(i * self.size + j) in word for word in self.selected_words):
+                    count += 1
+        return count
+
+    def display_user_info(self):
+
+        # Displays the user's information in a separate window on the screen.
+        # 
+        # This method creates a new window using the curses library and displays
+        # the player's ID and their results on the difficulty being played. The window
+        # is positioned at the top right corner of the screen.
+        # 
+        # The displayed information includes:
+        # - Player ID
+        # - The difficulty (and board size for custom boards)
+        # - Highest Score on this difficulty
+        # - Number of Games Won on this difficulty
+        # - Win Rate on this difficulty (the percentage of games won out of games played)
+        # 
+        # The window is bordered and the text is formatted with some bold attributes.
+        # 
+        # Note:
+        #     This method assumes that `self.stdscr` is a valid curses window object,
+        #     `self.user` has an attribute `user_id`, and `self.user_stats` holds the
+        #     per-difficulty aggregates of util/user_store.py under 'difficulties'.
+        # 
+
+        h, w = self.stdscr.getmaxyx()
+        stats = self.user_stats.get('difficulties', {}).get(self.difficulty_label, user_store.new_difficulty_stats())
+        user_info_win = curses.newwin(7, 40, 1, w - 41)
+        user_info_win.border('|', '|', '-', '-', '+', '+', '+', '+')
+        user_info_win.addstr(1, 2, f"Player: ")
+        user_info_win.addstr(1, 12, f"{self.user.user_id}", curses.A_BOLD)
+        user_info_win.addstr(2, 2, f"Difficulty: {self.difficulty_label}")
+        user_info_win.addstr(3, 2, f"Highest Score: ")
+        best_score = stats['best_score'] if stats['best_score'] is not None else 'N/A'
+        user_info_win.addstr(3, 17, f"{best_score}", curses.A_BOLD)
+        user_info_win.addstr(4, 2, f"Games Won: ")
+        user_info_win.addstr(4, 13, f"{stats['wins']}", curses.A_BOLD)
+        user_info_win.addstr(5, 2, f"Win rate: ")
+        games_played = stats['games']
+        win_rate = (stats['wins'] / games_played * 100) if games_played > 0 else 0
+        user_info_win.addstr(5, 12, f"{win_rate:.2f}%", curses.A_BOLD)
+        user_info_win.refresh()
+
+    def get_assist(self, sample_steps=SAMPLE_STEPS):
+
+        # Gets the probability engine of the board, updated with the cells revealed since it was last used.
+        # It is created on first use, so games without the heatmap or a bot never pay for it.
+        #
+        # Args:
+        #     sample_steps (int): The sampling steps of the engine, if it is created now (see game/assist.py).
+        #
+        # Returns:
+        #     Assist: The probability engine.
+
+        if self.assist is None:
+            self.assist = Assist(self, sample_steps)
+        self.assist.update()
+        return self.assist
+
+    def heatmap_cell(self, index):
+
+        # Gets the heatmap text of a covered cell: the chance that it is a mine and the chance that it holds
+        # a word letter, each in tenths ('*' for certain).
+        #
+        # Args:
+        #     index (int): The index of the cell.
+        #
+        # Returns:
+        #     str: Three characters, e.g. '3▒7' for a 30% mine and 70% word letter chance.
+
+        def tenths(probability):
+            return '*' if probability >= 0.995 else str(min(9, int(probability * 10)))
+
+        return f"{tenths(self.assist.mine_probability[index])}▒{tenths(self.assist.word_probability[index])}"
+
+    def draw_minimap(self, h, w):
+
+        # Draws the overview of the whole board under the player window, with the shown part highlighted.
+        # Nothing is drawn when the whole board fits on the screen, when the game is over (the messages
+        # take that place) or when there is no room left.
+        #
+        # Args:
+        #     h (int): The height of the screen.
+        #     w (int): The width of the screen.
+
+        self.minimap.x = None
+        if not self.viewport.is_partial() or self.game_won or self.game_lose:
+            return
+        map_x = w - 41
+        map_y = 10
+        if self.minimap.layout(38, h - map_y - 4):
+            self.stdscr.addstr(map_y - 1, map_x, "Map:")
+            self.minimap.draw(self.stdscr, map_y, map_x, self.viewport)
+
+    def handle_scroll(self, key, button_state=0):
+
+        # Moves the viewport for the scrolling keys, the mouse wheel and clicks on the mini-map.
+        #
+        # Args:
+        #     key (int): The pressed key.
+        #     button_state (int): The mouse buttons, when key is curses.KEY_MOUSE.
+        #
+        # Returns:
+        #     bool: True if the input scrolled the board and needs nothing else.
+
+        if key in SCROLL_KEYS:
+            self.viewport.scroll(*SCROLL_KEYS[key])
+        elif key == curses.KEY_NPAGE:
+            self.viewport.page(1)
+        elif key == curses.KEY_PPAGE:
+            self.viewport.page(-1)
+        elif key == curses.KEY_HOME:
+            self.viewport.scroll(-self.size, -self.size)
+        elif key == curses.KEY_END:
+            self.viewport.scroll(self.size, self.size)
+        elif key != curses.KEY_MOUSE:
+            return False
+        elif button_state & WHEEL_UP:
+            self.viewport.scroll(-3, 0)
+        elif button_state & WHEEL_DOWN:
+            self.viewport.scroll(3, 0)
+        else:
+            return False
+        return True
+
+    @profiler.timed("draw_board")
+    def draw_board(self):
+
+        # Draws the game board and various game-related information on the screen.
+        # This method clears the screen and redraws the game board, hints, move counter,
+        # score, mine stepped counter, and any game messages (win/lose). It uses the 
+        # curses library to handle screen drawing.
+        #
+        # The board is drawn with cells that can be covered, flagged, questioned, or revealed.
+        # Only the cells inside the viewport are drawn, so drawing costs the same however large the board is.
+        # Boards larger than the screen also get a mini-map, which only recounts the cells changed since
+        # the last frame.
+        # The hints, move counter, score, and mine stepped counter are displayed on the left-hand side.
+        # If the game is won or lost, appropriate messages are displayed.
+        #
+        # Attributes:
+        #     self.stdscr (curses.window): The window object where the game is drawn.
+        #     self.size (int): The size of the game board.
+        #     self.viewport (Viewport): The part of the board shown on screen.
+        #     self.minimap (MiniMap): The overview of the whole board.
+        #     self.selected_words (list): List of words to be found in the game.
+        #     self.revealed_words (list): List of words that have been found.
+        #     self.mine_stepped_counter (int): Counter for the number of mines stepped on.
+        #     self.move_count (int): Counter for the number of moves made.
+        #     self.score (int): The current score of the player.
+        #     self.grid (Grid): The board: covered / flagged / questioned states, letters, mines and hints.
+        #                       Hints are turned into the displayed glyphs and digits here.
+        #     self.exit_prompt (bool): Flag indicating whether the exit prompt is shown.
+        #     self.game_won (bool): Flag indicating whether the game is won.
+        #     self.game_lose (bool): Flag indicating whether the game is lost.
+        #     self.mine_lose (bool): Flag indicating whether the game is lost due to stepping on mines.
+        #
+        # Returns:
+        #     None
+
+        self.stdscr.clear()
+        h, w = self.stdscr.getmaxyx()
+        viewport = self.viewport
+        viewport.fit(h, w)
+        rows, cols = viewport.rows, viewport.cols
+        start_x, start_y = viewport.start_x, viewport.start_y
+
+        # Draw hints on the left-hand side, as many words as fit above the counters
+        hint_start_y = start_y
+        shown_words = self.selected_words
+        max_words = max(1, h - hint_start_y - 11)
+        if len(shown_words) > max_words:
+            shown_words = shown_words[:max_words - 1]
+        self.stdscr.addstr(hint_start_y, 2, "Words left:")
+        for idx, word in enumerate(shown_words):
+            if word in self.revealed_words:
+                self.stdscr.addstr(hint_start_y + idx + 1, 2, word)
+            else:
+                hint = " ".join("_" * len(word))
+                self.stdscr.addstr(hint_start_y + idx + 1, 2, hint)
+        word_lines = len(shown_words)
+        if len(shown_words) < len(self.selected_words):
+            hidden_words = self.selected_words[len(shown_words):]
+            found = sum(1 for word in hidden_words if word in self.revealed_words)
+            self.stdscr.addstr(hint_start_y + word_lines + 1, 2, f"+{len(hidden_words)} more ({found} found)")
+            word_lines += 1
+
+        # Display mine stepped counter
+        self.stdscr.addstr(hint_start_y + word_lines + 5, 2, "Mine stepped:")
+        mine_display = ""
+        for i in range(3):
+            if i < self.mine_stepped_counter:
+                mine_display += "✱ "
+            else:
+                mine_display += "_ "
+        self.stdscr.addstr(hint_start_y + word_lines + 6, 2, mine_display.strip())
+
+        # Draw move counter below the hint section
+        self.stdscr.addstr(hint_start_y + word_lines + 2, 2, f"Moves: {self.move_count}")
+
+        # Draw score below the move counter
+        self.stdscr.addstr(hint_start_y + word_lines + 3, 2, f"Score: {self.score}")
+
+        if self.show_heatmap:
+            self.get_assist()
+
+        cells = self.grid.cells
+        for i in range(rows + 1):
+            for j in range(cols):
+                x = start_x + j * 4
+                y = start_y + i * 2
+                self.stdscr.addstr(y, x, '+---')
+                if j == cols - 1:
+                    self.stdscr.addstr(y, x + 4, '+')
+                if i < rows:
+                    index = (viewport.row + i) * self.size + viewport.col + j
+                    if cells[index] & COVERED:
+                        if cells[index] & FLAGGED:
+                            self.stdscr.addstr(y + 1, x, '|🚩▒')
+                        elif cells[index] & QUESTIONED:
+                            self.stdscr.addstr(y + 1, x, '|❔▒')
+                        elif self.show_heatmap:
+                            self.stdscr.addstr(y + 1, x, '|' + self.heatmap_cell(index))
+                        else:
+                            self.stdscr.addstr(y + 1, x, '|▒▒▒')
+                    else:
+                        mine_hint = self.grid.mine_hint(index)
+                        content = self.grid.char(index)
+                        if content == ' ':
+                            content = self.grid.letter_hint(index)
+                        cell_content = f'{mine_hint[0]}{content}{mine_hint[1]}'
+                        self.stdscr.addstr(y + 1, x, f'|{cell_content}')
+                    if index == self.cursor:
+                        self.stdscr.chgat(y + 1, x + 1, 3, curses.A_REVERSE)
+                    if j == cols - 1:
+                        self.stdscr.addstr(y + 1, x + 4, '|')
+
+        # Tell which part of a board larger than the screen is shown
+        if viewport.is_partial():
+            self.stdscr.addstr(h - 3, 2, f"Rows {viewport.row + 1}-{viewport.row + rows}, "
+                                         f"columns {viewport.col + 1}-{viewport.col + cols} of {self.size}")
+            self.stdscr.addstr(h - 2, 2, "* Arrows move, PgUp/PgDn and the wheel scroll")
+        self.draw_minimap(h, w)
+
+        if self.show_heatmap:
+            self.stdscr.addstr(h - 3, w - 50, "* Heatmap: mine ▒ word chance, in tenths")
+        else:
+            self.stdscr.addstr(h - 3, w - 50, "* Press 'h' for the heatmap")
+        if self.exit_prompt:
+            self.stdscr.addstr(h - 2, w - 50, "* Wanna quit? Press esc again to quit.")
+        else:
+            self.stdscr.addstr(h - 2, w - 50, "* Press 'esc' to quit")
+
+        # Draw the winning message if the game is won
+        if self.game_won and not self.game_lose:
+            win_msg_y = h // 2 - 2
+            self.stdscr.addstr(win_msg_y, w - 30, "Congratulations!")
+            self.stdscr.addstr(win_msg_y + 1, w - 30, "You found all the words!")
+            self.stdscr.addstr(win_msg_y + 3, w - 30, self.new_game_hint())
+
+        # Draw the losing message if the game is lost
+        if self.game_lose and not self.mine_lose:
+            lose_msg_y = h // 2 - 2
+            self.stdscr.addstr(lose_msg_y, w - 40, "Game Over!")
+            self.stdscr.addstr(lose_msg_y + 1, w - 40, self.lose_message())
+            self.stdscr.addstr(lose_msg_y + 3, w - 40, self.new_game_hint())
+
+        if self.mine_lose:
+            lose_msg_y = h // 2 - 2
+            self.stdscr.addstr(lose_msg_y, w - 40, "Game Over!")
+            self.stdscr.addstr(lose_msg_y + 1, w - 40, "Stepped on too many mines!")
+            self.stdscr.addstr(lose_msg_y + 3, w - 40, self.new_game_hint())
+
+        self.stdscr.refresh()
+
+    def lose_message(self):
+
+        # Gets the reason shown when the game is lost by its score (losing on mines has its own message).
+
+        return "Negative score? Better luck next time!"
+
+    def new_game_hint(self):
+        return "Press N for New Game"
+
+    def calculate_base_score(self, word):
+
+        # Calculate the base score for a given word.
+        # 
+        # The base score is determined by the length of the word and its complexity.
+        # The complexity of the word is retrieved from the `word_complexity` dictionary.
+        # If the word is not found in the dictionary, a default complexity of 1 is used.
+        # 
+        # Args:
+        #     word (str): The word for which to calculate the base score.
+        # 
+        # Returns:
+        #     int: The calculated base score for the word.
+
+        word_length = len(word)
+        word_complexity = self.word_complexity.get(word, 1)
+        base_score = word_length * word_complexity
+        return base_score
+
+    def calculate_clean_reveal_bonus(self, clean_reveal, word):
+
+        # Calculate the bonus score for a clean reveal of a word.
+        # 
+        # A clean reveal is when the word is revealed without any mistakes.
+        # The bonus score is calculated based on the length of the word and its complexity.
+        # 
+        # Args:
+        #     clean_reveal (bool): A flag indicating if the word was revealed cleanly.
+        #     word (str): The word that was revealed.
+        # 
+        # Returns:
+        #     int: The bonus score for the clean reveal.
+
+        bonus_score = 0
+        if clean_reveal:
+            word_length = len(word)
+            word_complexity = self.word_complexity.get(word, 1)
+            bonus_score = 10 + word_length * word_complexity  # Example bonus for clean reveal
+        return bonus_score
+
+    def calculate_total_score(self, word, clean_reveal):
+
+        # Calculate the total score for a given word based on its length, complexity, and whether it was revealed cleanly.
+        # 
+        # Args:
+        #     word (str): The word for which the score is being calculated.
+        #     clean_reveal (bool): A flag indicating if the word was revealed cleanly.
+        # 
+        # Returns:
+        #     int: The total score for the given word.
+
+        word_length = len(word)
+        word_complexity = self.word_complexity.get(word, 1)
+        base_score = word_length * word_complexity * 100  # Base score for each word
+        clean_bonus = 0
+        if clean_reveal:
+            clean_bonus = (word_length * word_complexity * 50)  # Clean reveal bonus
+        total_score = base_score + clean_bonus
+        return total_score
+
+    def check_revealed_words(self):
+
+        # Checks if any of the selected words have been completely revealed on the board.
+        #
+        # For each word in the selected words list, the method searches the board for the starting
+        # letter of the word. If the starting letter is found, it checks if the word is revealed either
+        # horizontally ('H') or vertically ('V'). If the word is revealed and not already in the revealed words
+        # set, it performs the following actions:
+        #
+        # - Verifies if the word is cleanly revealed (all cells of the word are in the word reveal status).
+        # - Adds the word to the revealed words set.
+        # - Resets the word reveal status for the word.
+        # - Resets the current word.
+        # - Increases the score based on the total score calculation for the word and whether it was cleanly revealed.
+        # - Adjusts the random click cap.
+        # - Awards bonus points.
+
+        letters = self.grid.letters
+        for word in self.selected_words:
+            if word in self.revealed_words:
+                continue
+            first_letter = ord(word[0])
+            index = letters.find(first_letter)
+            while index != -1:
+                i, j = divmod(index, self.size)
+                if self.check_word_revealed(i, j, word, 'H') or self.check_word_revealed(i, j, word, 'V'):
+                    clean_reveal = all(cell in self.word_reveal_status[word] for cell in self.get_word_cells(word))
+                    self.revealed_words.add(word)
+                    self.word_reveal_status[word] = []  # Reset word reveal status
+                    self.current_word = None  # Reset current word
+                    self.score += self.calculate_total_score(word, clean_reveal)
+                    self.adjust_random_click_cap()
+                    self.award_bonus_points()
+                    break
+                index = letters.find(first_letter, index + 1)
+
+    def check_if_mine_stepped_lost(self):
+
+        # Checks if the player has stepped on a mine three times and updates the game state accordingly.
+        # 
+        # If the player has stepped on a mine three times, the game is marked as lost, 
+        # the mine lose condition is set to True, and the game won condition is set to False.
+        # 
+        # Returns:
+        #     bool: True if the player has stepped on a mine three times, otherwise False.
+
+        if self.mine_stepped_counter == 3:
+            self.game_lose = True
+            self.mine_lose = True
+            self.game_won = False
+            return True
+
+    def adjust_random_click_cap(self):
+
+        # Adjusts the cap for random clicks based on the number of words left to be revealed.
+        #
+        # This method updates the `random_click_cap` and potentially the `random_click_counter`
+        # based on the number of words left to be revealed in the game. Each difficulty profile lists its
+        # stages in `random_click_caps`, e.g. for the easy mode:
+        #
+        # - Stage 1: When there are 3 words left, the random click cap is set to 10.
+        # - Stage 2: When there are 2 words left, the random click cap is reduced to 9, and the
+        #   random click counter is decreased by up to 5, but not below 0.
+        # - Stage 3: When there is 1 word left, the random click cap is reduced to 7, and the
+        #   random click counter is decreased by up to 3, but not below 0.
+
+        words_left = len(self.selected_words) - len(self.revealed_words)
+        stage = stage_value(self.random_click_caps, words_left)
+        if stage is not None:
+            cap, reduction = stage
+            self.random_click_cap = cap
+            reduction = round(reduction / self.click_share)  # In clicks of this board (see click_share)
+            self.random_click_counter = max(0, self.random_click_counter - reduction)
+
+    def award_bonus_points(self):
+
+        # Awards bonus points based on the number of words left to be revealed and the number of random clicks made.
+        #
+        # If the random click counter is within the cap, the points listed in `word_bonus_points` for the
+        # number of words left are multiplied by the remaining allowed clicks and added to the score.
+        # For the easy mode:
+        # - If 3 words are left and the random click counter is within the cap, 800 points multiplied by the remaining allowed clicks are added to the score.
+        # - If 2 words are left and the random click counter is within the cap, 1200 points multiplied by the remaining allowed clicks are added to the score.
+        # - If 1 word is left and the random click counter is within the cap, 1700 points multiplied by the remaining allowed clicks are added to the score.
+        #
+        # The remaining allowed clicks are calculated as the difference between the random click cap and the current random click counter, with a minimum multiplier of 1.
+        #
+        # Returns:
+        #     None
+
+        words_left = len(self.selected_words) - len(self.revealed_words)
+        bonus_points = stage_value(self.word_bonus_points, words_left)
+        random_clicks = self.random_click_counter * self.click_share  # Measured as on a 12x12 board
+        if bonus_points is not None and random_clicks <= self.random_click_cap:
+            self.score += int(bonus_points * max(1, (self.random_click_cap - random_clicks)))
+
+    def penalty_multiplier(self, random_click_counter, cap_value):
+
+        # Calculate the penalty multiplier based on the number of random clicks.
+        # The penalty multiplier is determined using an exponential function and a linear function
+        # depending on the value of random_click_counter relative to cap_value.
+        #
+        # Explanation of this formula can be found at https://github.com/NaughtyChas/Wordweeper/pull/17#issuecomment-2468165644
+        #
+        # Parameters:
+        # - random_click_counter (int): The number of random clicks made by the user.
+        # - cap_value (int): The threshold value for determining the penalty.
+        #
+        # Returns:
+        # - float: The calculated penalty multiplier.
+
+        k = 0.01
+        
+        if random_click_counter <= (cap_value - 2):
+            return (math.exp(k * (random_click_counter - cap_value)) - 0.6)
+        elif (cap_value - 2) < random_click_counter <= cap_value:
+            return (random_click_counter - (cap_value - 2)) / 2
+        else:
+            return math.exp(k * (random_click_counter - cap_value))
+
+
+    def get_word_cells(self, word):
+
+        # Find the cells on the board that contain the given word.
+        #
+        # This method searches the board for the starting letter of the word and
+        # checks if the word can be revealed horizontally ('H') or vertically ('V')
+        # from that position. If the word is found, it collects the indexes of
+        # the cells that contain the word.
+        #
+        # Args:
+        #     word (str): The word to search for on the board.
+        #
+        # Returns:
+        #     list of int: A list of the indexes (row * size + col) of the cells
+        #            that contain part of the word.
+
+        cells = []
+        letters = self.grid.letters
+        first_letter = ord(word[0])
+        index = letters.find(first_letter)
+        while index != -1:
+            i, j = divmod(index, self.size)
+            if self.check_word_revealed(i, j, word, 'H'):
+                cells.extend(range(index, index + len(word)))
+            elif self.check_word_revealed(i, j, word, 'V'):
+                cells.extend(range(index, index + len(word) * self.size, self.size))
+            index = letters.find(first_letter, index + 1)
+        return cells
+
+    def check_word_revealed(self, row, col, word, direction):
+
+        # Check if a word is fully revealed on the board in the specified direction.
+        #
+        # Args:
+        #     row (int): The starting row index of the word.
+        #     col (int): The starting column index of the word.
+        #     word (str): The word to check.
+        #     direction (str): The direction of the word ('H' for horizontal, 'V' for vertical).
+        #
+        # Returns:
+        #     bool: True if the word is fully revealed, False otherwise.
+
+        start = row * self.size + col
+        if direction == 'H':
+            if col + len(word) > self.size:
+                return False
+            step = 1
+        elif direction == 'V':
+            if row + len(word) > self.size:
+                return False
+            step = self.size
+        else:
+            return True
+        end = start + len(word) * step
+        if self.grid.letters[start:end:step] != word.encode():
+            return False
+        cells = self.grid.cells
+        for index in range(start, end, step):
+            if cells[index] & COVERED:
+                return False
+        return True
+
+    def check_all_words_revealed(self):
+
+        # Checks if all selected words have been revealed and updates the game state accordingly.
+        # If all revealed but the score is negative, game_lose is set to True and game_won is set to False.
+        # If all words are revealed with a positive score, game_won is set to True and game_lose is set to False.
+        # 
+        # Returns:
+        #     bool: True if all selected words are revealed, otherwise False.
+
+        all_revealed = all(word in self.revealed_words for word in self.selected_words)
+        if all_revealed and self.score < 0:
+            self.game_won = False
+            self.game_lose = True
+            return True
+        elif all_revealed:
+            self.game_won = True
+            self.game_lose = False
+            return True
+        return False
+
+    def reveal_cell(self, row, col):
+
+        # Reveals a covered cell and applies the game rules to it.
+        # This holds everything a left click on a covered cell does, apart from redrawing the screen,
+        # so the game can also be played without a screen (benchmarks, simulations).
+        #
+        # Args:
+        #     row (int): The row index of the cell.
+        #     col (int): The column index of the cell.
+
+        index = row * self.size + col
+        self.replay.record(REVEAL, index)
+        self.move_count += 1  # Increment move counter
+        if self.flood:
+            self.reveal_cells(self.flood_fill((index,)), 1)
+        else:
+            self.reveal_cells((index,))
+
+    def reveal_cells(self, indexes, clicked=None):
+
+        # Applies the game rules to the cells revealed by one move: the cell of a click, or the neighbours of
+        # a chord (see chord()). Every cell is scored as a click on it would be: mines cost a dynamic penalty
+        # and reset the word reveal status, other cells may count as random clicks. What is worth doing once
+        # per move is done once per batch: the penalties are added up and taken from the score once, the words
+        # completed are only looked for after the last cell, and the screen is redrawn once by the game loop.
+        # The cells a flood reveal opens past the clicked ones are no random clicks: they only count for the words.
+        #
+        # Args:
+        #     indexes (sequence of int): The covered cells to reveal, in order.
+        #     clicked (int, optional): How many of the first cells were clicked (default is all of them), the
+        #                              others were opened by the flood reveal (see flood_fill()).
+
+        grid = self.grid
+        cells = grid.cells
+        letters = grid.letters
+        letter_counts = grid.letter_counts
+        penalties = 0
+        safe_cells_revealed = False
+        for position, index in enumerate(indexes):
+            grid.reveal(index)
+            self.minimap.cell_changed(index)
+            if self.assist is not None:
+                self.assist.cell_revealed(index)
+
+            # Instead of write mine penalty into a function, I've wrote it here.
+            # This is because the penalty is only applied when a mine is revealed.
+            # The penalty is calculated based on the number of revealed cells and the total number of cells.
+            # The formula turns into a reward above about 15x15 cells, so larger boards are measured as if
+            # they were MAX_PENALTY_CELLS big, with the same share of cells revealed.
+            # You can find more explanation about the punishment algorithm at:
+            # https://github.com/NaughtyChas/Wordweeper/pull/17#issuecomment-2467928859
+
+            if cells[index] & MINE:
+                self.mine_stepped_counter += 1
+                revealed_cells = grid.revealed_cells
+                total_cells = self.size * self.size
+                if total_cells > MAX_PENALTY_CELLS:
+                    revealed_cells = revealed_cells * MAX_PENALTY_CELLS / total_cells
+                    total_cells = MAX_PENALTY_CELLS
+                base_penalty = self.mine_base_penalty
+                k = (220 - total_cells) / 3000
+                penalty = int((math.exp(k * (revealed_cells - 5)) - total_cells / 900) * base_penalty)
+                penalties += int(penalty)  # Dynamic penalty for revealing a mine
+                # Reset word reveal status for all words, in a new dict so the undo history of the practice mode
+                # can keep the old one (see game/practiceBoard.py)
+                self.word_reveal_status = {word: [] for word in self.selected_words}
+                self.current_word = None  # Reset current word
+            else:
+                safe_cells_revealed = True
+                self.last_revealed = index
+                # Check if the revealed cell is part of a selected word. Its letter hint is blank when no letter
+                # of the words is around it, itself included, so the words are not searched then.
+                letter = chr(letters[index])
+                is_part_of_word = False
+                if letter_counts[index]:
+                    for word in self.selected_words:
+                        if letter in word:
+                            is_part_of_word = True
+                            if self.current_word is None:
+                                self.current_word = word
+                            if self.current_word == word:
+                                self.word_reveal_status[word].append(index)
+                if clicked is not None and position >= clicked:
+                    continue  # Opened by the flood reveal
+
+                # Check if the revealed cell is part of a selected word,
+                # and apply the appropriate base penalty for random clicks.
+
+                if (not is_part_of_word) or (is_part_of_word and self.random_click_counter == 0):
+                    self.random_click_counter += 1
+                    words_left = len(self.selected_words) - len(self.revealed_words)
+                    self.base_penalty_random = stage_value(self.random_click_penalties, words_left, 0)  # Penalty for random clicks
+
+                # Larger boards take more clicks to clear: each counts for click_share of a click of a board of
+                # MAX_PENALTY_CELLS cells, in the multiplier and in the penalty itself
+                if self.random_click_cap is not None:
+                    penalty_multiplier_value = self.penalty_multiplier(self.random_click_counter * self.click_share,
+                                                                       self.random_click_cap)
+                    penalty_random = int(self.base_penalty_random * penalty_multiplier_value * self.click_share)
+                    penalties += penalty_random
+        self.score -= penalties
+        if safe_cells_revealed:
+            self.check_revealed_words()  # This will now only score for full word reveals
+
+    def flood_fill(self, starts):
+
+        # Gets the cells a reveal opens with the flood reveal: the cells revealed, then, from every one of them
+        # with no mine and blank mine and letter hints, its covered neighbours that are not marked, and so on.
+        # The region is walked breadth first over the flat cell indexes with a queue rather than recursion, so
+        # it opens a whole 100x100 board in one move, and is then revealed as one batch (see reveal_cells()).
+        #
+        # Args:
+        #     starts (sequence of int): The covered cells revealed by the move.
+        #
+        # Returns:
+        #     list of int: The cells to reveal, the given ones first, in the order they were reached.
+
+        grid = self.grid
+        cells = grid.cells
+        mine_masks = grid.mine_masks
+        letter_counts = grid.letter_counts
+        size = self.size
+        queued = bytearray(size * size)
+        order = list(starts)
+        for index in order:
+            queued[index] = 1
+        head = 0
+        while head < len(order):
+            index = order[head]
+            head += 1
+            if cells[index] & MINE or mine_masks[index] or letter_counts[index]:
+                continue  # The flood stops at the hints
+            row, col = divmod(index, size)
+            for dir_row, dir_col, _ in DIRECTIONS:
+                new_row = row + dir_row
+                new_col = col + dir_col
+                if 0 <= new_row < size and 0 <= new_col < size:
+                    neighbour = new_row * size + new_col
+                    if not queued[neighbour] and cells[neighbour] & (COVERED | FLAGGED | QUESTIONED) == COVERED:
+                        queued[neighbour] = 1
+                        order.append(neighbour)
+        return order
+
+    def chord_cells(self, index):
+
+        # Gets the cells a chord on a revealed cell reveals: its covered neighbours that are not flagged, once as
+        # many of its neighbours are flagged or stepped-on mines as there are mines around it.
+        #
+        # Args:
+        #     index (int): The index of the revealed cell.
+        #
+        # Returns:
+        #     list of int: The cells to reveal, empty when the chord does nothing.
+
+        cells = self.grid.cells
+        if cells[index] & COVERED:
+            return []
+        size = self.size
+        row, col = divmod(index, size)
+        mines = bin(self.grid.mine_masks[index]).count('1')
+        marked = 0
+        targets = []
+        for dir_row, dir_col, _ in DIRECTIONS:
+            new_row = row + dir_row
+            new_col = col + dir_col
+            if 0 <= new_row < size and 0 <= new_col < size:
+                neighbour = new_row * size + new_col
+                state = cells[neighbour]
+                if state & COVERED:
+                    if state & FLAGGED:
+                        marked += 1
+                    else:
+                        targets.append(neighbour)
+                elif state & MINE:
+                    marked += 1  # A mine stepped on
+        return targets if marked == mines else []
+
+    def chord(self, row, col):
+
+        # Reveals the unflagged neighbours of a revealed cell whose mines are all flagged (see chord_cells()),
+        # in one move recorded as a single replay event, through the batched reveal of reveal_cells(). With the
+        # flood reveal, blank neighbours flood their regions as a click on them would.
+        #
+        # Args:
+        #     row (int): The row index of the revealed cell.
+        #     col (int): The column index of the revealed cell.
+        #
+        # Returns:
+        #     bool: True if the chord revealed any cell.
+
+        index = row * self.size + col
+        targets = self.chord_cells(index)
+        if not targets:
+            return False
+        self.replay.record(CHORD, index)
+        self.move_count += 1
+        if self.flood:
+            self.reveal_cells(self.flood_fill(targets), len(targets))
+        else:
+            self.reveal_cells(targets)
+        return True
+
+    def toggle_mark(self, row, col):
+
+        # Cycles the mark of a covered cell: no mark -> flag -> question mark -> no mark.
+        #
+        # Args:
+        #     row (int): The row index of the cell.
+        #     col (int): The column index of the cell.
+
+        index = row * self.size + col
+        self.replay.record(MARK, index)
+        self.minimap.cell_changed(index)
+        cells = self.grid.cells
+        if cells[index] & FLAGGED:
+            cells[index] = (cells[index] & ~FLAGGED) | QUESTIONED
+        elif cells[index] & QUESTIONED:
+            cells[index] &= ~QUESTIONED
+        else:
+            cells[index] |= FLAGGED
+
+    async def check_window_size(self, keys):
+
+        # Checks if the terminal window size meets the minimum requirements.
+        # This method retrieves the current terminal window size and compares it
+        # against the minimum required dimensions (MIN_WINDOW_HEIGHT rows by MIN_WINDOW_WIDTH
+        # columns). Boards that do not fit are scrolled, so the minimum does not depend on the
+        # board size. If the terminal window is too small, it displays a message prompting the user to
+        # increase the window size and awaits a key before returning.
+        #
+        # Args:
+        #     keys (util.aio.KeyStream): The keys of the screen.
+        #
+        # Returns:
+        #     bool: True if the terminal window size meets the minimum requirements,
+        #           False otherwise.
+
+        h, w = self.stdscr.getmaxyx()
+        min_height = MIN_WINDOW_HEIGHT
+        min_width = MIN_WINDOW_WIDTH
+
+        if h < min_height or w < min_width:
+            size_prompt = curses.newwin(h, w, 0, 0)
+            size_prompt.clear()
+            message = "Terminal window is too small! Please increase the window size."
+            y = h // 2
+            x = (w - len(message)) // 2
+            size_prompt.addstr(y, x, message, curses.A_BOLD)
+            size_prompt.refresh()
+            await keys.get()  # Wait for user input
+            return False
+        return True
+
+    def update_stats(self, game_won, game_lose):
+
+        # Updates the user's game statistics.
+        # 
+        # This method adds the game to the overall statistics and to those of its difficulty (games, wins,
+        # best score, fewest moves, mines stepped on, words found). Finally, it saves the updated statistics,
+        # the replay of the game and the game's entry in the leaderboard, on the background I/O thread
+        # (see save_game()).
+        # 
+        # Args:
+        #     game_won (bool): Indicates if the game was won.
+        #     game_lose (bool): Indicates if the game was lost.
+
+        if self.user is None:
+            return  # Boards without a user (benchmarks, simulations) do not record stats
+        won = game_won and not game_lose
+        user_store.add_game(self.user_stats, self.difficulty_label, self.score, won,
+                            self.move_count, self.mine_stepped_counter, sorted(self.revealed_words), self.timed)
+        aio.run_io(save_game, self.user.user_id, copy.deepcopy(self.user_stats), self.replay.finish(self),
+                   self.difficulty_label, self.score, won, self.move_count)
+
+    @classmethod
+    def deal(cls, profile, no_guess=False):
+
+        # Builds a board without a screen or a user, to be played later (see adopt()). A no-guess board is
+        # taken from the board pool when one is ready, otherwise it is generated here.
+        #
+        # Args:
+        #     profile (DifficultyProfile): The settings of the board, at its board size.
+        #     no_guess (bool): Whether the board must be winnable without guessing.
+
+        seed = None
+        if no_guess:
+            seed = get_pool(cls, profile).take()
+        return cls(None, None, seed=seed, profile=profile, no_guess=no_guess)
+
+    def prepare_next_board(self):
+
+        # Starts dealing the board of the next game on the background thread (see util/aio.py), while
+        # this one is played.
+
+        self.next_board = aio.in_background(self.deal, self.profile, self.no_guess)
+
+    def start(self):
+
+        # Starts the game on the board: the replay recording (and its clock) starts here.
+
+        self.replay = ReplayRecorder()
+        self.saved_events = 0
+
+    def autosave(self):
+
+        # Saves the snapshot of a game in progress after each move, so it can be resumed once left, and drops it
+        # once the game is over (see util/snapshot.py). The snapshot is built here, in about 10 microseconds,
+        # and written on the I/O thread.
+
+        if self.user is None or not self.resumable or len(self.replay.event_data) == self.saved_events:
+            return
+        self.saved_events = len(self.replay.event_data)
+        if self.game_won or self.game_lose:
+            aio.run_io(snapshot.remove_snapshot, self.user.user_id)
+        else:
+            aio.run_io(snapshot.save_snapshot, self.user.user_id, snapshot.encode(self))
+
+    def adopt(self, board):
+
+        # Takes over the game of a board dealt without a screen or a user, keeping the screen, the user, the
+        # heatmap and flood reveal settings and the keyboard cursor of this one.
+        #
+        # Args:
+        #     board (Board): A board of the same class, from deal().
+
+        stdscr, user, show_heatmap, flood, cursor = self.stdscr, self.user, self.show_heatmap, self.flood, self.cursor
+        self.__dict__.update(board.__dict__)
+        self.stdscr, self.user, self.show_heatmap, self.flood, self.cursor = stdscr, user, show_heatmap, flood, cursor
+        self.user_stats = self.load_user_stats()
+        self.start()
+
+    def copy(self):
+
+        # Gets a copy of the board whose game is played apart from this one: the cells, the progress of the words
+        # and the replay are its own, the rest of the deal is shared, as it is only read once dealt. Copying takes
+        # microseconds, where dealing the seed again takes up to tens of milliseconds on the largest boards.
+        #
+        # Returns:
+        #     Board: The copy, of the same class, without a screen.
+
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board.stdscr = None
+        board.grid = self.grid.copy()
+        board.minimap = MiniMap(board.grid)
+        board.viewport = Viewport(self.size)
+        board.selected_words = self.selected_words[:]
+        board.revealed_words = set(self.revealed_words)
+        board.word_reveal_status = {word: cells[:] for word, cells in self.word_reveal_status.items()}
+        board.assist = None
+        board.next_board = None
+        board.user_stats = board.load_user_stats()
+        board.start()
+        return board
+
+    def new_game(self):
+
+        # Starts a new board of the same difficulty and size: the one dealt in the background while this game
+        # was played (see prepare_next_board()), or a new one when none was prepared.
+
+        if self.next_board is not None:
+            board = self.next_board.result()
+        else:
+            board = self.deal(self.profile, self.no_guess)
+        self.adopt(board)
+
+    def key_timeout(self):
+
+        # Gets how long run() waits for a key before calling idle().
+        # While the heatmap still has sampling to do, keys are only waited for briefly and it is refined in between.
+        #
+        # Returns:
+        #     int: Milliseconds, or -1 to wait until a key is pressed.
+
+        if self.show_heatmap and self.assist is not None and self.assist.refining():
+            return REFINE_INTERVAL
+        return -1
+
+    def idle(self):
+
+        # Runs when no key was pressed within key_timeout(): refines the heatmap and redraws it.
+
+        if self.show_heatmap and self.assist is not None and self.assist.refining():
+            self.assist.refine()
+            self.draw_board()
+
+    def move_cursor(self, d_row, d_col):
+
+        # Moves the keyboard cursor, keeping it on the board, and the viewport with it. The first move only
+        # shows the cursor, in the middle of the viewport.
+        #
+        # Args:
+        #     d_row (int): Rows to move down (negative moves up).
+        #     d_col (int): Columns to move right (negative moves left).
+
+        viewport = self.viewport
+        if self.cursor is None:
+            row, col = viewport.row + viewport.rows // 2, viewport.col + viewport.cols // 2
+        else:
+            row, col = divmod(self.cursor, self.size)
+            row = max(0, min(self.size - 1, row + d_row))
+            col = max(0, min(self.size - 1, col + d_col))
+        self.cursor = row * self.size + col
+        viewport.show(row, col)
+
+    def open_cell(self, row, col):
+
+        # Reveals a covered cell or chords a revealed one (see chord()), as a click on it does, and checks
+        # whether the game is won.
+
+        if self.grid.cells[row * self.size + col] & COVERED:
+            self.reveal_cell(row, col)
+        elif not self.chord(row, col):
+            return
+        if self.check_all_words_revealed():
+            self.game_won = True
+            self.update_stats(self.game_won, self.game_lose)
+
+    def handle_click(self):
+
+        # Handles a mouse event on the board: the wheel scrolls, a click on the mini-map jumps to that part of
+        # the board, Ctrl + Left click marks a covered cell, a left click on a revealed cell chords it and any
+        # other click reveals a covered cell. The keyboard cursor, once shown, follows the mouse.
+
+        _, mx, my, _, button_state = curses.getmouse()
+        cell = self.viewport.cell_at(mx, my)
+        map_cell = self.minimap.cell_at(mx, my)
+        if self.handle_scroll(curses.KEY_MOUSE, button_state):
+            pass  # Mouse wheel
+        elif map_cell is not None:
+            self.viewport.center_on(*map_cell)
+        elif cell is not None:
+            cell_y, cell_x = cell
+            if self.cursor is not None:
+                self.cursor = cell_y * self.size + cell_x
+            covered = self.grid.cells[cell_y * self.size + cell_x] & COVERED
+            if button_state & curses.BUTTON1_CLICKED and (button_state & curses.BUTTON_CTRL):  # Ctrl + Left click
+                if covered:
+                    self.toggle_mark(cell_y, cell_x)
+            elif covered or button_state & curses.BUTTON1_CLICKED:
+                self.open_cell(cell_y, cell_x)
+
+    def handle_key(self, key):
+
+        # Applies one key press (or mouse event) to the game.
+        # ESC asks for confirmation and then leaves (a game in progress with a snapshot is left to be resumed,
+        # see autosave()), 'n' starts a new game once this one is over, 'q' leaves a won game, 'h' switches the
+        # heatmap, the arrow keys move the keyboard cursor, the page keys and the mouse wheel scroll the board,
+        # mouse clicks reveal, chord and mark cells (see handle_click()), and so do Space / Enter and 'f' on the
+        # cell under the cursor.
+        #
+        # Args:
+        #     key (int): The key code.
+        #
+        # Returns:
+        #     bool: True when the player leaves the game.
+
+        if key == 27:  # ESC key
+            if self.exit_prompt:
+                if self.saved_events and not (self.game_won or self.game_lose):
+                    return True  # Recorded once it is resumed and finished
+                if not self.game_won:
+                    self.update_stats(self.game_won, self.game_lose)
+                return True
+            self.exit_prompt = True
+        elif key == ord('n') and (self.game_lose or self.game_won):
+            self.new_game()
+        elif key == ord('q') and self.game_won:
+            return True
+        elif key in SCROLL_KEYS:
+            self.move_cursor(*SCROLL_KEYS[key])
+        elif self.handle_scroll(key):
+            pass  # Scrolling keys
+        elif key == ord('h'):
+            self.show_heatmap = not self.show_heatmap
+        elif self.game_lose and not self.game_won:
+            pass  # The board is frozen once the game is lost
+        elif self.check_all_words_revealed() and not self.game_lose:
+            self.game_won = True
+        elif key == curses.KEY_MOUSE and not self.game_won:
+            self.handle_click()
+        elif key in OPEN_KEYS and self.cursor is not None and not self.game_won:
+            self.open_cell(*divmod(self.cursor, self.size))
+        elif key == MARK_KEY and self.cursor is not None and not self.game_won:
+            if self.grid.cells[self.cursor] & COVERED:
+                self.toggle_mark(*divmod(self.cursor, self.size))
+
+        # Check if the player has stepped on a mine three times,
+        # If so, the game is lost and the game will end.
+        self.check_if_mine_stepped_lost()
+        self.autosave()
+        return False
+
+    async def play(self, keys):
+
+        # Main game loop for the classic mode of the puzzle game, as a coroutine of the menu's event loop.
+        # This method checks the window size, awaits user input (keyboard and mouse) from the key stream,
+        # applies it through handle_key() and redraws the board. The loop continues until the user decides to
+        # exit the game by pressing the ESC key or 'q' key after winning.
+        #
+        # Keys are awaited with a timeout (see key_timeout()). When it runs out without a key, idle() does the
+        # work that goes on between keys (refining the heatmap, the clock of the timed mode) without busy-waiting.
+        # The board of the next game is dealt in the background meanwhile (see prepare_next_board()).
+        #
+        # Args:
+        #     keys (util.aio.KeyStream): The keys of the screen.
+        #
+        # Returns:
+        #     None
+
+        while True:
+            if not await self.check_window_size(keys):
+                continue
+
+            curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
+            self.draw_board()
+            while True:
+                if not await self.check_window_size(keys):
+                    break
+                if self.next_board is None:
+                    self.prepare_next_board()
+
+                self.display_user_info()
+                timeout = self.key_timeout()
+                key = await keys.get(None if timeout < 0 else timeout / 1000)
+                if key == -1:
+                    self.idle()
+                    continue
+                key_time = time.perf_counter()  # Input-to-repaint latency is measured from here
+                if key == ord('n') and (self.game_lose or self.game_won) and self.next_board is not None:
+                    await asyncio.wrap_future(self.next_board)  # Usually dealt long ago
+                if self.handle_key(key):
+                    curses.endwin()
+                    return
+                self.draw_board()
+                profiler.record("input_to_repaint", time.perf_counter() - key_time)
+
+    def run(self):
+
+        # Runs the game loop (see play()) on an event loop of its own, for boards played outside the menu.
+
+        async def main():
+            keys = aio.KeyStream(self.stdscr)
+            try:
+                await self.play(keys)
+            finally:
+                keys.close()
+        asyncio.run(main())
+
+
+@profiler.timed("save_game")
+def save_game(user_id, stats, replay, difficulty, score, won, moves):
+
+    # Saves a finished game: the user's statistics, the replay and the leaderboard entry. Runs on the
+    # background I/O thread (see util/aio.py), with copies of what it saves.
+    #
+    # Args:
+    #     user_id (str): The player.
+    #     stats (dict): The user's statistics, the game included.
+    #     replay (Replay): The replay of the game.
+    #     difficulty (str): The label of the difficulty, see util.leaderboard.difficulty_label().
+    #     score (int): The final score.
+    #     won (bool): Whether the game was won.
+    #     moves (int): The cells revealed.
+
+    user_store.save_user(user_id, stats)
+    save_replay(user_id, replay)
+    leaderboard.record_game(user_id, difficulty, score, won, moves)
@@ -0,0 +1,8 @@
+# A module for the classic custom mode of The Puzzle Game.
+# The game logic lives in the Board class of classicBoard.py. The custom mode is played at a board size
+# picked by the player; its profile in data/difficulties.ini scales the words and mines to that size.
+
+from game.classicBoard import Board as ClassicBoard
+
+class Board(ClassicBoard):
+    profile_name = "Custom"
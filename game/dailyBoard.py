@@ -0,0 +1,102 @@
+# A module for the daily challenge of The Puzzle Game.
+# Every player gets the same board on a given day, derived from the date alone: the date picks the first seed,
+# and the no-guess generation (Board.generate_fair_board()) goes from there to the first layout the solver proves
+# fair, with no time budget so every computer ends on the same seed. The seed is generated the first time a player
+# asks for the board of the day and cached in the leaderboard database (util/leaderboard.py), so the board is
+# only generated once per day, and every later game of the day rebuilds it from its seed.
+#
+# The daily challenge is played on the DAILY_DIFFICULTY profile and scored like any classic game, so it also
+# counts in the statistics and the leaderboard of that difficulty. The first game of each player on the board of a
+# day is also ranked on the daily leaderboard of that day; playing the board again does not change the ranking.
+
+import datetime
+import hashlib
+from game.classicBoard import Board
+from game.profiles import get_profile
+from util import aio, leaderboard
+
+DAILY_DIFFICULTY = "Hard"
+DAILY_ATTEMPTS = 1000  # Layouts tried for the board of a day before the last one is kept unproven
+
+
+def today():
+
+    # Gets the date of the daily challenge being played, in the local time zone, as YYYY-MM-DD.
+
+    return datetime.date.today().isoformat()
+
+
+def date_seed(date):
+
+    # Derives the first seed of the board of a day from the date alone. A hash of the date is used rather than
+    # Python's hash(), which changes from one run to the next.
+
+    return int.from_bytes(hashlib.sha256(f"wordweeper daily {date}".encode()).digest()[:4], 'big')
+
+
+def generate_daily_seed(date):
+
+    # Generates the board of a day: the first layout from the seed of the date that the solver proves fair.
+    #
+    # Returns:
+    #     int: The seed of the board.
+
+    board = Board(None, None, seed=date_seed(date), profile=get_profile(DAILY_DIFFICULTY))
+    board.generate_fair_board(DAILY_ATTEMPTS, None)  # From the seed of the date again
+    return board.seed
+
+
+class DailyBoard(Board):
+
+    # The board of the daily challenge of a day.
+    # Attributes:
+    # -----------
+    # date : str
+    #     The day of the board, as YYYY-MM-DD.
+    #
+    # Methods:
+    # --------
+    # for_date(stdscr, user, date):
+    #     Builds the board of a day, generating it if nobody played that day yet.
+
+    daily = True
+    resumable = False  # A game left is recorded, as it may be the one ranked for the day
+
+    def __init__(self, stdscr, user, date, seed):
+        # The seed is the one of the fair layout, which it is rebuilt from directly rather than generated again
+        # (see util/snapshot.py): an unproven seed would send every load into a generation of its own
+        Board.__init__(self, stdscr, user, seed=seed, profile=get_profile(DAILY_DIFFICULTY))
+        self.no_guess = True
+        self.date = date
+
+    @classmethod
+    def for_date(cls, stdscr, user, date=None):
+
+        # Builds the board of a day. Blocks on the database and, for the first player of the day, on the
+        # generation, so it is called on the background thread (see util/aio.py).
+        #
+        # Args:
+        #     stdscr (curses.window): The screen.
+        #     user (User): The player.
+        #     date (str, optional): The day, as YYYY-MM-DD (today by default).
+
+        date = date or today()
+        return cls(stdscr, user, date, leaderboard.daily_board_seed(date, generate_daily_seed))
+
+    def update_stats(self, game_won, game_lose):
+
+        # Records the game like any classic game (see Board.update_stats()), and in the daily ranking of its day.
+
+        Board.update_stats(self, game_won, game_lose)
+        if self.user is not None:
+            aio.run_io(leaderboard.record_daily, self.user.user_id, self.date, self.score,
+                       game_won and not game_lose, self.move_count)
+
+    def prepare_next_board(self):
+        pass  # There is one board a day
+
+    def new_game(self):
+        pass
+
+    def new_game_hint(self):
+        return "A new board comes tomorrow"
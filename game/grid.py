@@ -0,0 +1,336 @@
+# Compact storage of a game board.
+#
+# Instead of one list of lists per kind of information, a Grid keeps four flat bytearrays indexed by
+# row * size + col:
+#
+#     cells          State bits of each cell: COVERED, FLAGGED, QUESTIONED and MINE.
+#     letters        The letter of each cell as an ASCII byte, or a space for empty cells and mines.
+#     mine_masks     One bit per neighbouring direction that holds a mine (TOP, BOTTOM, ..., BOTTOM_RIGHT).
+#     letter_counts  How many cells of the 3x3 area around each cell hold a letter of a target word.
+#
+# Hints are stored as these small numbers and only turned into braille glyphs when the board is drawn,
+# through the MINE_HINT_GLYPHS table. A 12x12 board takes well under a kilobyte this way.
+
+# Cell state bits
+COVERED = 1
+FLAGGED = 2
+QUESTIONED = 4
+MINE = 8
+
+EMPTY = ord(' ')
+MINE_CHAR = '✱'
+
+# Direction bits of the mine masks
+TOP = 1
+BOTTOM = 2
+LEFT = 4
+RIGHT = 8
+TOP_LEFT = 16
+BOTTOM_LEFT = 32
+TOP_RIGHT = 64
+BOTTOM_RIGHT = 128
+
+# (row offset, column offset, bit) of each neighbouring direction
+DIRECTIONS = [
+    (-1, 0, TOP), (1, 0, BOTTOM), (0, -1, LEFT), (0, 1, RIGHT),
+    (-1, -1, TOP_LEFT), (1, -1, BOTTOM_LEFT), (-1, 1, TOP_RIGHT), (1, 1, BOTTOM_RIGHT),
+]
+
+
+def mine_hint_glyphs(top, bottom, left, right, top_left, bottom_left, top_right, bottom_right):
+
+    # Turn the mines around a cell into the two braille characters shown around its content.
+    # The dots of each character point to the directions holding mines. Several combinations of
+    # mines share a glyph, so the rules below decide which dots are shown.
+    #
+    # Args:
+    #     top, bottom, left, right, top_left, bottom_left, top_right, bottom_right (bool):
+    #         Whether the neighbouring cell in that direction holds a mine.
+    #
+    # Returns:
+    #     list: A list of two characters representing the hint for the cell.
+
+    hint = [' ', ' ']
+
+    # Special case: three mines in a same row
+    if top and top_left and top_right:
+        hint[0] = '⠁'
+        hint[1] = '⠈'  # Top, top-left, and top-right can be represented as ⠁⠈
+
+    if bottom and bottom_left and bottom_right:
+        hint[0] = '⡀'
+        hint[1] = '⢀'  # Bottom, bottom-left, and bottom-right can be represented as ⡀⢀
+
+    # Special case: three mines in a same column
+    if left and top_left and bottom_left:
+        hint[0] = '⡁'
+    if right and top_right and bottom_right:
+        hint[1] = '⢈'
+
+    # Special case: three mines on the same direction
+    if top and top_left and left:
+        hint[0] = '⠁'
+    if top and top_right and right:
+        hint[1] = '⠈'
+    if bottom and bottom_left and left:
+        hint[0] = '⡀'
+    if bottom and bottom_right and right:
+        hint[1] = '⢀'
+
+    # Special case: three mines forming < or > shape
+    if top and left and bottom:
+        hint[0] = '⡁'
+        # Top and left
+        if top and left:
+            hint[0] = '⠁'  # Top and left, use ⠁ for top
+        # Bottom and left
+        if bottom and left:
+            hint[0] = '⡀'  # Bottom and left, use ⡀
+
+    if top and right and bottom:
+        hint[1] = '⢈'
+        # Top and right
+        if top and right:
+            hint[1] = '⠈'  # Top and right, use ⠈ for right
+        # Right and bottom
+        if right and bottom:
+            hint[1] = '⢀'  # Right and bottom, use ⢀
+
+    # Bottom and bottom-left/bottom-right
+    if bottom and bottom_left:
+        hint[0] = '⡀'  # Bottom and bottom-left only needs one dot (⡀)
+    elif bottom and bottom_right:
+        hint[1] = '⢀'  # Bottom and bottom-right only needs one dot (⢀)
+
+    ### Special cases: two mines in same row or column
+    # Top and top-left/top-right
+    if top and top_left:
+        hint[0] = '⠁'  # Top and top-left only needs one dot (⠁)
+    elif top and top_right:
+        hint[1] = '⠈'  # Top and top-right only needs one dot (⠈)
+
+    ### Special cases: opposite directions
+    # Left and right
+    if left and right:
+        hint[0] = '⡀'
+        hint[1] = '⠈'  # Left and right can be represented as ⡀⠈
+
+    # Top and bottom
+    if top and bottom:
+        if hint[0] == ' ':
+            hint[0] = '⠁'
+        if hint[1] == ' ':
+            hint[1] = '⢀'  # Top and bottom can be represented as ⠁⢀
+
+    # Special case: two mines in the same row on corners
+    if top_left and top_right:
+        hint[0] = '⠁'
+        hint[1] = '⠈'  # Top-left and top-right can be represented as ⠁⠈
+
+    if bottom_left and bottom_right:
+        hint[0] = '⡀'
+        hint[1] = '⢀'  # Bottom-left and bottom-right can be represented as ⡀⢀
+
+    if left and top_left and hint[0] == ' ':
+        hint[0] = '⠁'  # Combine left and top-left as one dot (⠁)
+    elif left and bottom_left and hint[0] == ' ':
+        hint[0] = '⡀'  # Combine left and bottom-left as one dot (⡀)
+    elif top_left and bottom_left and hint[0] == ' ':
+        hint[0] = '⡁'  # Combine top-left and bottom-left as ⡁
+    else:
+        if left:
+            hint[0] = '⡀'
+        if top_left:
+            hint[0] = '⠁'
+        if bottom_left:
+            hint[0] = '⡀'
+
+    if right and top_right and hint[1] == ' ':
+        hint[1] = '⠈'  # Combine right and top-right as one dot (⠈)
+    elif right and bottom_right and hint[1] == ' ':
+        hint[1] = '⢀'  # Combine right and bottom-right as one dot (⢀)
+    elif top_right and bottom_right and hint[1] == ' ':
+        hint[1] = '⢈'  # Combine top-right and bottom-right as ⢈
+    else:
+        if right:
+            hint[1] = '⠈'
+        if top_right:
+            hint[1] = '⠈'
+        if bottom_right:
+            hint[1] = '⢀'
+
+    # If corner and top / bottom
+    if top_left and bottom and hint[0] != '⡁':
+        hint[0] = '⡁'
+    if top_right and bottom and hint[1] != '⢈':
+        hint[1] = '⢈'
+    if bottom_left and top and hint[0] != '⡁':
+        hint[0] = '⡁'
+    if bottom_right and top and hint[1] != '⢈':
+        hint[1] = '⢈'
+
+    # Updated `if top:` condition
+    if top:
+        if not (hint[0] in ['⠁', '⡁'] or hint[1] in ['⢈', '⠈']):
+            if hint[0] == ' ':
+                hint[0] = '⠁'
+            elif hint[1] == ' ':
+                hint[1] = '⠈'
+            elif hint[0] == '⡀':
+                hint[0] = '⡁'
+            elif hint[1] == '⢀':
+                hint[1] = '⢈'
+
+    if bottom:
+        if not (hint[0] in ['⡀', '⡁'] or hint[1] in ['⢈', '⢀']):
+            if hint[0] == ' ':
+                hint[0] = '⡀'
+            elif hint[1] == ' ':
+                hint[1] = '⢀'
+            elif hint[0] == '⠁':
+                hint[0] = '⡁'
+            elif hint[1] == '⠈':
+                hint[1] = '⢈'
+
+    return hint
+
+
+# The two glyphs of every possible mine mask, so drawing a hint is a single lookup
+MINE_HINT_GLYPHS = [
+    ''.join(mine_hint_glyphs(*(bool(mask & bit) for _, _, bit in DIRECTIONS)))
+    for mask in range(256)
+]
+
+# Translation table turning cell states into 1 for mines and 0 for everything else
+_MINE_BITS = bytes(1 if state & MINE else 0 for state in range(256))
+
+
+class Grid:
+
+    # Flat, bit-packed storage of a square game board.
+    # Attributes:
+    #     size (int): The number of rows (and columns) of the board.
+    #     cells (bytearray): State bits (COVERED, FLAGGED, QUESTIONED, MINE) of each cell.
+    #     letters (bytearray): ASCII letter of each cell, EMPTY for empty cells and mines.
+    #     mine_masks (bytearray): Direction bits of the neighbouring mines of each cell.
+    #     letter_counts (bytearray): Number of target word letters in the 3x3 area of each cell.
+    #     revealed_cells (int): Number of uncovered cells.
+    # Methods:
+    #     index(row, col): Returns the flat index of a cell.
+    #     char(index): Returns what the cell holds as a character: a letter, a space or the mine symbol.
+    #     copy(): Returns a grid with the same cells, changed apart from this one.
+    #     reveal(index): Uncovers a cell.
+    #     calculate_mine_masks(): Fills mine_masks from the placed mines.
+    #     neighbour_mine_mask(row, col): Returns the mine mask of a single cell.
+    #     calculate_letter_counts(word_letters): Fills letter_counts for the given target word letters.
+    #     mine_hint(index): Returns the two braille glyphs of a cell's mine hint.
+    #     letter_hint(index): Returns a cell's letter hint as displayed: a digit or a space.
+
+    __slots__ = ("size", "cells", "letters", "mine_masks", "letter_counts", "revealed_cells")
+
+    def __init__(self, size):
+        cell_count = size * size
+        self.size = size
+        self.cells = bytearray([COVERED]) * cell_count
+        self.letters = bytearray([EMPTY]) * cell_count
+        self.mine_masks = bytearray(cell_count)
+        self.letter_counts = bytearray(cell_count)
+        self.revealed_cells = 0
+
+    def index(self, row, col):
+        return row * self.size + col
+
+    def copy(self):
+        other = Grid.__new__(Grid)
+        other.size = self.size
+        other.cells = bytearray(self.cells)
+        other.letters = self.letters  # Never changed once the board is dealt
+        other.mine_masks = self.mine_masks
+        other.letter_counts = self.letter_counts
+        other.revealed_cells = self.revealed_cells
+        return other
+
+    def char(self, index):
+        if self.cells[index] & MINE:
+            return MINE_CHAR
+        return chr(self.letters[index])
+
+    def reveal(self, index):
+        if self.cells[index] & COVERED:
+            self.cells[index] &= ~COVERED
+            self.revealed_cells += 1
+
+    def calculate_mine_masks(self):
+
+        # Fills mine_masks from the placed mines. Only the neighbours of the mines are visited,
+        # so this costs O(number of mines) instead of checking 8 directions of every cell.
+
+        size = self.size
+        masks = self.mine_masks
+        masks[:] = bytes(size * size)
+        mines = self.cells.translate(_MINE_BITS)  # 1 for mines, 0 elsewhere
+        index = mines.find(1)
+        while index != -1:
+            row, col = divmod(index, size)
+            for dir_row, dir_col, bit in DIRECTIONS:
+                # The cell on the opposite side of the mine sees it in direction `bit`
+                new_row = row - dir_row
+                new_col = col - dir_col
+                if 0 <= new_row < size and 0 <= new_col < size:
+                    masks[new_row * size + new_col] |= bit
+            index = mines.find(1, index + 1)
+
+    def neighbour_mine_mask(self, row, col):
+
+        # Returns the direction bits of the mines around a single cell.
+
+        mask = 0
+        for dir_row, dir_col, bit in DIRECTIONS:
+            new_row = row + dir_row
+            new_col = col + dir_col
+            if 0 <= new_row < self.size and 0 <= new_col < self.size and self.cells[new_row * self.size + new_col] & MINE:
+                mask |= bit
+        return mask
+
+    def calculate_letter_counts(self, word_letters):
+
+        # Fills letter_counts: for each cell, how many cells of its 3x3 area (itself included)
+        # hold one of the given letters. The 3x3 sums are done as a row pass and a column pass.
+        #
+        # Args:
+        #     word_letters (str): The letters of the target words.
+
+        size = self.size
+        is_word_letter = bytearray(256)
+        for letter in set(word_letters):
+            is_word_letter[ord(letter)] = 1
+        flags = self.letters.translate(is_word_letter)
+
+        # Sum of the cell and its left and right neighbours
+        row_sums = bytearray(size * size)
+        for row_start in range(0, size * size, size):
+            for col in range(size):
+                index = row_start + col
+                total = flags[index]
+                if col > 0:
+                    total += flags[index - 1]
+                if col < size - 1:
+                    total += flags[index + 1]
+                row_sums[index] = total
+
+        # Sum of the row sums above, on and below each cell
+        counts = self.letter_counts
+        for index in range(size * size):
+            total = row_sums[index]
+            if index >= size:
+                total += row_sums[index - size]
+            if index < size * (size - 1):
+                total += row_sums[index + size]
+            counts[index] = total
+
+    def mine_hint(self, index):
+        return MINE_HINT_GLYPHS[self.mine_masks[index]]
+
+    def letter_hint(self, index):
+        count = self.letter_counts[index]
+        return str(count) if count > 0 else ' '
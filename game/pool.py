@@ -0,0 +1,117 @@
+# Background pool of no-guess boards.
+#
+# Proving a board fair can take several generation attempts (see Board.generate_fair_board()). A BoardPool
+# runs those attempts on a background thread and keeps the seeds of a few proven-fair boards ready, so
+# starting a no-guess game only rebuilds a board from a known seed and the player never waits on the retry loop.
+#
+# There is one pool per difficulty and board size, started by get_pool() the first time it is asked for. The pools
+# of the fixed-size difficulties run until the program exits. A custom size is rarely played twice, so the menu
+# stops its pools once its game is over (see stop_pools()).
+#
+# When a pool has no seed ready, the board is proven fair while the player waits (up to NO_GUESS_TIME_BUDGET
+# seconds, see game/classicBoard.py), on the worker thread: the menu shows that the board is being dealt meanwhile.
+
+import queue
+import threading
+
+POOL_CAPACITY = 3  # Proven-fair seeds kept ready per difficulty
+
+_pools = {}  # (board class, profile name, board size) -> BoardPool
+_pools_lock = threading.Lock()
+
+
+class BoardPool:
+
+    # Proven-fair seeds of one difficulty and board size, generated by a background thread.
+    # Attributes:
+    # -----------
+    # board_class : type
+    #     The Board class of the difficulty.
+    # profile : DifficultyProfile
+    #     The settings of the boards, at their board size.
+    # seeds : queue.Queue
+    #     The seeds of proven-fair boards ready to be played.
+    # stopped : threading.Event
+    #     Set to stop the background thread.
+    #
+    # Methods:
+    # --------
+    # start():
+    #     Starts the background thread.
+    # take():
+    #     Takes a ready seed, without waiting.
+    # stop():
+    #     Stops the background thread.
+
+    def __init__(self, board_class, profile, capacity=POOL_CAPACITY):
+        self.board_class = board_class
+        self.profile = profile
+        self.seeds = queue.Queue(maxsize=capacity)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.work, daemon=True, name=f"board-pool-{profile.name}-{profile.size}")
+
+    def start(self):
+        self.thread.start()
+
+    def work(self):
+
+        # Generates no-guess boards until the pool is stopped. Boards whose generation budget ran out
+        # before they were proven fair are dropped. The thread sleeps while the pool is full.
+
+        while not self.stopped.is_set():
+            board = self.board_class(None, None, profile=self.profile, no_guess=True)
+            if not board.fair:
+                continue
+            while not self.stopped.is_set():
+                try:
+                    self.seeds.put(board.seed, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def take(self):
+
+        # Takes the seed of a proven-fair board.
+        #
+        # Returns:
+        #     int: The seed, or None if no board is ready yet.
+
+        try:
+            return self.seeds.get_nowait()
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        self.stopped.set()
+
+
+def get_pool(board_class, profile):
+
+    # Gets the pool of a difficulty at the board size of the profile, starting it on first use.
+    #
+    # Args:
+    #     board_class (type): The Board class of the difficulty.
+    #     profile (DifficultyProfile): The settings of the boards.
+    #
+    # Returns:
+    #     BoardPool: The running pool.
+
+    key = (board_class, profile.name, profile.size)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = BoardPool(board_class, profile)
+            _pools[key].start()
+        return _pools[key]
+
+
+def stop_pools(profile):
+
+    # Stops and forgets the pools of a difficulty at the board size of the profile, whatever their Board class.
+    # The next game of that size starts a new pool.
+    #
+    # Args:
+    #     profile (DifficultyProfile): The settings of the boards.
+
+    with _pools_lock:
+        for key in [key for key in _pools if key[1:] == (profile.name, profile.size)]:
+            _pools.pop(key).stop()
@@ -0,0 +1,190 @@
+# A module for the practice mode of The Puzzle Game.
+# A practice game is a classic game of any difficulty whose moves can be taken back: 'u' undoes the last reveal,
+# chord or mark and 'r' redoes it, as far back and forth as the game goes, even after the game was lost.
+# Practice games are not recorded in the statistics, the replays or the leaderboard.
+#
+# The history is a stack of reversible delta records (Step) rather than copies of the board. A move changes one
+# cell (more for a chord or a flood reveal), a few counters, at most a couple of word reveal lists and the words
+# revealed, so a Step holds the old value of each of those: its size depends on what the move changed, not on the
+# board or on the length of the game. Undoing writes the old values back, in O(1) per step for a click. The word
+# reveal lists are shared with the board: a Step keeps the list a move appended to with its old length, and a
+# mine, which resets every list, swaps in a new dict (Board.reveal_cells()), so the Step keeps the old dict
+# itself. Redoing plays the move again through the game rules (util.replay.apply_event()), which gives the same
+# result since the rules involve no chance.
+
+from game.classicBoard import Board
+from util.replay import ACTION_KINDS, apply_event, read_varint
+
+UNDO_KEYS = (ord('u'), 26)  # 'u' and Ctrl+Z
+REDO_KEYS = (ord('r'), 25)  # 'r' and Ctrl+Y
+
+# The counters of the scoring rules and the result, restored as they were before a move
+STATE_FIELDS = ("score", "move_count", "mine_stepped_counter", "random_click_counter", "random_click_cap",
+                "base_penalty_random", "last_revealed", "current_word", "game_won", "game_lose", "mine_lose")
+
+
+class Step:
+
+    # The delta record of one move: what it changed, with the values from before it.
+    # Attributes:
+    # -----------
+    # action, index : int
+    #     The move (util.replay.REVEAL, MARK or CHORD) and its cell.
+    # cells : tuple
+    #     (index, state bits before the move) of every cell the move changed.
+    # revealed_cells : int
+    #     The number of revealed cells before the move.
+    # events : int
+    #     Bytes of replay events before the move.
+    # state : tuple
+    #     The STATE_FIELDS before the move.
+    # words_found : tuple of str
+    #     The words the move revealed.
+    # status : dict
+    #     The word reveal dict before the move, if the move replaced it (None otherwise).
+    # lists : tuple
+    #     (word, list, length) of the word reveal lists the move changed: the list the word had before the move,
+    #     and its length then.
+
+    __slots__ = ("action", "index", "cells", "revealed_cells", "events", "state", "words_found", "status", "lists")
+
+
+class PracticeBoard(Board):
+
+    # A classic board whose moves can be undone and redone.
+    # Attributes:
+    # -----------
+    # undo_steps : list of Step
+    #     The moves made, the last one last.
+    # redo_moves : list of tuple
+    #     The (action, index) of the moves undone, the last one undone last. A new move clears them.
+    # last_cells : tuple
+    #     (index, state bits) of the cells changed by the last move, from before it.
+    #
+    # Methods:
+    # --------
+    # begin_move():
+    #     Notes what a move may change, before it is made.
+    # end_move(before):
+    #     Records the Step of the move just made, if a move was made.
+    # undo():
+    #     Takes back the last move.
+    # redo():
+    #     Makes the last move undone again.
+
+    resumable = False  # The history is not saved
+
+    def start(self):
+        Board.start(self)
+        self.undo_steps = []
+        self.redo_moves = []
+
+    def update_stats(self, game_won, game_lose):
+        pass  # Practice games are not recorded
+
+    def begin_move(self):
+
+        # Notes what a move may change, before it is made: the board state and the word reveal lists with their
+        # lengths. Only what the move changed is kept, by end_move().
+
+        status = self.word_reveal_status
+        return (len(self.replay.event_data), self.grid.revealed_cells, set(self.revealed_words),
+                tuple(getattr(self, field) for field in STATE_FIELDS), status,
+                [(word, lst, len(lst)) for word, lst in status.items()])
+
+    def end_move(self, before):
+
+        # Records the Step of the move made since begin_move(), read back from the replay event it recorded.
+        #
+        # Returns:
+        #     bool: Whether a move was made.
+
+        events, revealed_cells, revealed_words, state, status, lists = before
+        if len(self.replay.event_data) == events:
+            return False
+        _, pos = read_varint(self.replay.event_data, events)  # Ticks since the previous move
+        event, _ = read_varint(self.replay.event_data, pos)
+        step = Step()
+        step.action = event % ACTION_KINDS
+        step.index = event // ACTION_KINDS
+        step.cells = self.last_cells
+        step.revealed_cells = revealed_cells
+        step.events = events
+        step.state = state
+        step.words_found = tuple(self.revealed_words - revealed_words)
+        step.status = status if self.word_reveal_status is not status else None
+        # The lists of the old dict may have changed too, before a mine of a chord replaced it
+        step.lists = tuple((word, lst, length) for word, lst, length in lists
+                           if status[word] is not lst or len(lst) != length)
+        self.undo_steps.append(step)
+        return True
+
+    def reveal_cells(self, indexes, clicked=None):
+        cells = self.grid.cells
+        self.last_cells = tuple((index, cells[index]) for index in indexes)
+        Board.reveal_cells(self, indexes, clicked)
+
+    def toggle_mark(self, row, col):
+        index = row * self.size + col
+        self.last_cells = ((index, self.grid.cells[index]),)
+        Board.toggle_mark(self, row, col)
+
+    def undo(self):
+
+        # Takes back the last move: writes back what its Step kept.
+
+        if not self.undo_steps:
+            return
+        step = self.undo_steps.pop()
+        for index, state in step.cells:
+            self.grid.cells[index] = state
+            self.minimap.cell_changed(index)
+        self.grid.revealed_cells = step.revealed_cells
+        self.assist = None  # Rebuilt from the board when the heatmap is shown again
+        for field, value in zip(STATE_FIELDS, step.state):
+            setattr(self, field, value)
+        self.revealed_words.difference_update(step.words_found)
+        if step.status is not None:
+            self.word_reveal_status = step.status
+        for word, lst, length in step.lists:
+            del lst[length:]
+            self.word_reveal_status[word] = lst
+        del self.replay.event_data[step.events:]
+        self.redo_moves.append((step.action, step.index))
+
+    def redo(self):
+
+        # Makes the last move undone again, through the game rules.
+
+        if not self.redo_moves:
+            return
+        action, index = self.redo_moves.pop()
+        before = self.begin_move()
+        apply_event(self, action, *divmod(index, self.size))
+        self.end_move(before)
+
+    def handle_key(self, key):
+
+        # Applies a key (see Board.handle_key()): 'u' / Ctrl+Z undo and 'r' / Ctrl+Y redo, any other move is
+        # recorded in the history and clears the moves undone.
+
+        if key in UNDO_KEYS:
+            self.undo()
+            return False
+        if key in REDO_KEYS:
+            self.redo()
+            return False
+        before = self.begin_move()
+        leave = Board.handle_key(self, key)
+        if self.end_move(before):
+            self.redo_moves.clear()
+        return leave
+
+    def new_game_hint(self):
+        return "Press U to undo, N for new"
+
+    def draw_board(self):
+        Board.draw_board(self)
+        h, w = self.stdscr.getmaxyx()
+        self.stdscr.addstr(h - 4, w - 50, f"* 'u' undo ({len(self.undo_steps)}), 'r' redo ({len(self.redo_moves)})")
+        self.stdscr.refresh()
@@ -0,0 +1,211 @@
+# Difficulty profiles of the classic mode.
+#
+# The values that balance each difficulty (board size, number of words and mines, penalties, random click caps
+# and bonus points) are read from ./data/difficulties.ini, which documents every key. The Board class of
+# classicBoard.py takes its settings from a DifficultyProfile instead of literals in the code.
+#
+# A profile marked "scaled" (the Custom difficulty) is played at a size picked by the player: its number of
+# words follows the number of rows and its number of mines follows the number of inner cells.
+
+import configparser
+
+PROFILE_FILE = './data/difficulties.ini'
+
+_profiles = None  # Profiles by name, read from PROFILE_FILE on first use
+
+
+def parse_stage_table(text):
+
+    # Parses a stage table of the profile file, such as "3:700, 2:1100, 1:1500".
+    #
+    # Args:
+    #     text (str): Comma-separated "words left:value" pairs.
+    #
+    # Returns:
+    #     dict: Words left -> value.
+
+    table = {}
+    for entry in text.split(','):
+        if entry.strip():
+            words_left, value = entry.split(':')
+            table[int(words_left)] = int(value)
+    return table
+
+
+def stage_value(table, words_left, default=None):
+
+    # Looks up the entry of a stage table for the given number of words left.
+    # When more words are left than the table lists, the entry of the largest number of words left is used,
+    # so a board with many words does not need one entry per word.
+    #
+    # Args:
+    #     table (dict): Words left -> value.
+    #     words_left (int): The number of words not revealed yet.
+    #     default: Returned when the table has no entry for words_left.
+    #
+    # Returns:
+    #     The entry for words_left, or default.
+
+    if words_left in table:
+        return table[words_left]
+    if table and words_left > max(table):
+        return table[max(table)]
+    return default
+
+
+class DifficultyProfile:
+
+    # The settings of one difficulty.
+    # Attributes:
+    # -----------
+    # name : str
+    #     The name of the difficulty, which is its section in the profile file.
+    # size : int
+    #     Board size (rows and columns).
+    # word_count : int
+    #     Number of words placed on the board.
+    # mine_count : int
+    #     Number of mines placed on the board.
+    # fill_chance : float
+    #     Chance of an empty cell to be filled with a random letter.
+    # mine_base_penalty : int
+    #     Base of the dynamic penalty for stepping on a mine.
+    # random_click_penalties : dict
+    #     Words left -> base penalty of a random click.
+    # random_click_caps : dict
+    #     Words left -> (random click cap, how much the random click counter is reduced) once a word is revealed.
+    # word_bonus_points : dict
+    #     Words left -> bonus points per remaining allowed random click once a word is revealed.
+    # scaled : bool
+    #     Whether the number of words and mines follows the board size.
+    # min_size, max_size : int
+    #     The board sizes the player can pick for a scaled profile.
+    # words_per_row : float
+    #     Words per row of the board, for a scaled profile.
+    # mine_density : float
+    #     Mines per inner (non-border) cell of the board, for a scaled profile.
+    # time_limit : int
+    #     Seconds a game of the timed mode lasts.
+    # time_bonus : int
+    #     Points per whole second left when a game of the timed mode is won.
+    #
+    # Methods:
+    # --------
+    # from_section(section):
+    #     Builds a profile from a section of the profile file.
+    # scaled_to(size):
+    #     Returns the profile played at another board size.
+
+    def __init__(self, name, size, word_count, mine_count, fill_chance, mine_base_penalty,
+                 random_click_penalties, random_click_caps, word_bonus_points,
+                 scaled=False, min_size=None, max_size=None, words_per_row=0.0, mine_density=0.0,
+                 time_limit=0, time_bonus=0):
+        self.name = name
+        self.size = size
+        self.word_count = word_count
+        self.mine_count = mine_count
+        self.fill_chance = fill_chance
+        self.mine_base_penalty = mine_base_penalty
+        self.random_click_penalties = random_click_penalties
+        self.random_click_caps = random_click_caps
+        self.word_bonus_points = word_bonus_points
+        self.scaled = scaled
+        self.min_size = min_size if min_size is not None else size
+        self.max_size = max_size if max_size is not None else size
+        self.words_per_row = words_per_row
+        self.mine_density = mine_density
+        self.time_limit = time_limit
+        self.time_bonus = time_bonus
+
+    @classmethod
+    def from_section(cls, section):
+
+        # Builds a profile from a section of the profile file.
+        #
+        # Args:
+        #     section (configparser.SectionProxy): The section of the difficulty.
+        #
+        # Returns:
+        #     DifficultyProfile: The profile, already scaled to its size if it is a scaled profile.
+
+        caps = parse_stage_table(section['random_click_caps'])
+        refunds = parse_stage_table(section.get('random_click_refunds', ''))
+        profile = cls(
+            section.name,
+            size=section.getint('size'),
+            word_count=section.getint('words', 0),
+            mine_count=section.getint('mines', 0),
+            fill_chance=section.getfloat('fill_chance'),
+            mine_base_penalty=section.getint('mine_base_penalty'),
+            random_click_penalties=parse_stage_table(section['random_click_penalties']),
+            random_click_caps={words_left: (cap, refunds.get(words_left, 0)) for words_left, cap in caps.items()},
+            word_bonus_points=parse_stage_table(section['word_bonus_points']),
+            scaled=section.getboolean('scaled', False),
+            min_size=section.getint('min_size', None),
+            max_size=section.getint('max_size', None),
+            words_per_row=section.getfloat('words_per_row', 0.0),
+            mine_density=section.getfloat('mine_density', 0.0),
+            time_limit=section.getint('time_limit', 0),
+            time_bonus=section.getint('time_bonus', 0),
+        )
+        if profile.scaled:
+            profile = profile.scaled_to(profile.size)
+        return profile
+
+    def scaled_to(self, size):
+
+        # Returns the profile played at another board size.
+        # A scaled profile places its words and mines, and sets the time limit of the timed mode, in proportion
+        # to the board; the other profiles keep their own numbers, as boards of a fixed difficulty always did.
+        #
+        # Args:
+        #     size (int): The board size.
+        #
+        # Returns:
+        #     DifficultyProfile: A new profile, this one is left unchanged.
+
+        word_count = self.word_count
+        mine_count = self.mine_count
+        time_limit = self.time_limit
+        if self.scaled:
+            word_count = max(1, round(size * self.words_per_row))
+            mine_count = round(max(0, size - 2) ** 2 * self.mine_density)
+            time_limit = round(self.time_limit * size ** 2 / self.size ** 2)
+        return DifficultyProfile(
+            self.name, size, word_count, mine_count, self.fill_chance, self.mine_base_penalty,
+            self.random_click_penalties, self.random_click_caps, self.word_bonus_points,
+            self.scaled, self.min_size, self.max_size, self.words_per_row, self.mine_density,
+            time_limit, self.time_bonus,
+        )
+
+
+def load_profiles(path=PROFILE_FILE):
+
+    # Reads every difficulty profile from a profile file.
+    #
+    # Args:
+    #     path (str): The profile file.
+    #
+    # Returns:
+    #     dict: Difficulty name -> DifficultyProfile, in the order of the file.
+
+    parser = configparser.ConfigParser()
+    with open(path, 'r') as file:
+        parser.read_file(file)
+    return {name: DifficultyProfile.from_section(parser[name]) for name in parser.sections()}
+
+
+def get_profile(name):
+
+    # Returns the profile of a difficulty. The profile file is read once and kept.
+    #
+    # Args:
+    #     name (str): The difficulty, e.g. "Easy" or "Custom".
+    #
+    # Returns:
+    #     DifficultyProfile: The profile of the difficulty.
+
+    global _profiles
+    if _profiles is None:
+        _profiles = load_profiles()
+    return _profiles[name]
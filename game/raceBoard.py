@@ -0,0 +1,308 @@
+# A module for the race mode of The Puzzle Game: the network side of the curses front end.
+# Players race on copies of the same seeded board, hosted by a race server (util/race_server.py), and the first
+# one to find all the words with a positive score wins.
+#
+# A race board is built from the seed the server sends (see util/race_protocol.py), like any board. A click
+# does not reveal the cell at once: the move is sent to the server, which plays it on its own copy of the
+# player's board and sends it back to every player as a delta, and the cell is revealed when the delta of
+# the move comes back. A chord travels as one move, like a reveal. Marks are shown at once, and sent to the
+# server as well, whose copy of the board needs them to chord the same cells. The server's score is the one
+# that counts. The deltas of the other players update the race standings, shown where the player's statistics
+# are shown in the other modes.
+#
+# The deltas are read by a task of the menu's event loop next to the game loop (see Board.play()), so the board
+# is redrawn as soon as a move comes back, without waiting for a key.
+#
+# Race games are not added to the statistics, the replays or the leaderboard of the player.
+
+import asyncio
+import curses
+from game.classicBoard import Board
+from game.grid import COVERED
+from game.profiles import get_profile
+from util.race_protocol import (DEFAULT_HOST, DEFAULT_PORT, JOIN, MOVE, LOBBY, START, DELTA, LEFT, END, ERROR,
+                                ProtocolError, encode, read_message)
+from util.replay import ACTION_KINDS, REVEAL, MARK, CHORD, FLAG_WON, FLAG_LOST
+
+
+class RaceBoard(Board):
+
+    # A board raced against other players through a race server.
+    # Attributes:
+    # -----------
+    # reader, writer : asyncio.StreamReader, asyncio.StreamWriter
+    #     The connection to the server.
+    # room : str
+    #     The room of the race ("" for a quick match).
+    # slot : int
+    #     The player's slot in the race.
+    # names : list of str
+    #     The names of the players, by slot.
+    # scores, words_found, statuses : list of int
+    #     The score, the words found and the FLAG_WON / FLAG_LOST status of every player, from their deltas.
+    # left : set of int
+    #     The slots of the players who left the race.
+    # winner : int
+    #     The slot of the winner once the race is over (-1 if nobody won, None while it goes on).
+    # disconnected : str
+    #     Why the connection to the server was lost (None while it is up).
+    # listener : asyncio.Task
+    #     The task reading the messages of the server while the race is played.
+    #
+    # Methods:
+    # --------
+    # join(stdscr, user, keys, host, port, room, difficulty, players, size):
+    #     Joins a race and waits for it to start.
+    # listen():
+    #     Reads the messages of the server until the connection closes.
+    # handle_message(message):
+    #     Applies a message of the server.
+    # send_move(index, action):
+    #     Sends a move of the player to the server.
+    # apply_own_move(event, score, status):
+    #     Reveals the cells of a move the server has played.
+
+    resumable = False  # The race goes on without the player
+
+    def __init__(self, stdscr, user, reader, writer, room, start):
+        _, seed, difficulty, size, slot, names = start
+        profile = get_profile(difficulty)
+        if size != profile.size:
+            profile = profile.scaled_to(size)
+        Board.__init__(self, stdscr, user, seed=seed, profile=profile)
+        self.reader = reader
+        self.writer = writer
+        self.room = room
+        self.slot = slot
+        self.names = names
+        self.scores = [0] * len(names)
+        self.words_found = [0] * len(names)
+        self.statuses = [0] * len(names)
+        self.left = set()
+        self.winner = None
+        self.disconnected = None
+        self.listener = None
+
+    @classmethod
+    async def join(cls, stdscr, user, keys, host=DEFAULT_HOST, port=DEFAULT_PORT, room="", difficulty="Easy",
+                   players=2, size=0):
+
+        # Connects to a race server, joins a room and shows the players joining it, until the race starts.
+        #
+        # Args:
+        #     stdscr (curses.window): The screen.
+        #     user (User): The player, whose ID is the name the other players see.
+        #     keys (util.aio.KeyStream): The keys of the screen; ESC leaves the room.
+        #     host, port: The address of the server.
+        #     room (str): The room to join ("" for the quick match of the difficulty).
+        #     difficulty (str): The difficulty of the race, if the room is created by this player.
+        #     players (int): The number of players the race starts with, if the room is created by this player.
+        #     size (int): The board size, for scaled difficulties (0 for the size of the difficulty).
+        #
+        # Returns:
+        #     RaceBoard: The board of the race, or None if the player left the room or the server refused.
+
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as error:
+            await show_message(stdscr, keys, f"Cannot reach the race server at {host}:{port} ({error.strerror}).")
+            return None
+        writer.write(encode(JOIN, room, user.user_id, difficulty, players, size))
+        key_task = asyncio.ensure_future(keys.get())
+        message_task = asyncio.ensure_future(read_message(reader))
+        joined, capacity = 0, players
+        board = None
+        error = None
+        try:
+            while board is None and error is None:
+                draw_lobby(stdscr, room, difficulty, joined, capacity)
+                done, _ = await asyncio.wait({key_task, message_task}, return_when=asyncio.FIRST_COMPLETED)
+                if key_task in done:
+                    if key_task.result() == 27:  # ESC key
+                        break
+                    key_task = asyncio.ensure_future(keys.get())
+                if message_task in done:
+                    try:
+                        message = message_task.result()
+                    except (ProtocolError, ConnectionError):
+                        message = None
+                    if message is None:
+                        error = "The race server closed the connection."
+                    elif message[0] == ERROR:
+                        error = message[1]
+                    elif message[0] == START:
+                        board = cls(stdscr, user, reader, writer, room, message)
+                    else:
+                        if message[0] == LOBBY:
+                            joined, capacity = message[1], message[2]
+                        message_task = asyncio.ensure_future(read_message(reader))
+        finally:
+            # The next reader of the keys starts once this one has stopped
+            key_task.cancel()
+            message_task.cancel()
+            await asyncio.gather(key_task, message_task, return_exceptions=True)
+        if board is None:
+            writer.close()
+            if error is not None:
+                await show_message(stdscr, keys, error)
+        return board
+
+    def update_stats(self, game_won, game_lose):
+        pass  # Races are not recorded
+
+    def prepare_next_board(self):
+        pass  # A race is played on one board
+
+    def new_game(self):
+        pass
+
+    def new_game_hint(self):
+        return "Press ESC to leave the race"
+
+    def send_move(self, index, action):
+        if self.winner is None and self.disconnected is None:
+            self.writer.write(encode(MOVE, index * ACTION_KINDS + action))
+
+    def reveal_cell(self, row, col):
+
+        # Sends a reveal to the server instead of revealing the cell: the cell is revealed when the server
+        # sends the move back (see apply_own_move()).
+
+        self.send_move(row * self.size + col, REVEAL)
+
+    def chord(self, row, col):
+
+        # Sends the chord to the server as one move, when it opens any cell (see Board.chord_cells()). Nothing
+        # is revealed here until the server sends the move back.
+
+        index = row * self.size + col
+        if self.chord_cells(index):
+            self.send_move(index, CHORD)
+        return False
+
+    def toggle_mark(self, row, col):
+
+        # Marks the cell at once, and sends the mark to the server, which plays the chords on its own copy of
+        # the board and its marks. The other players are not told.
+
+        Board.toggle_mark(self, row, col)
+        self.send_move(row * self.size + col, MARK)
+
+    def apply_own_move(self, event, score, status):
+
+        # Reveals the cells of a move of the player once the server has played it, through the game rules of
+        # Board.reveal_cell() and Board.chord(), and takes the server's score and result. The moves come back in
+        # the order they were sent, so the board is the server's copy when a chord is played again here.
+
+        index, action = divmod(event, ACTION_KINDS)
+        row, col = divmod(index, self.size)
+        if action == CHORD:
+            Board.chord(self, row, col)
+        elif self.grid.cells[index] & COVERED:
+            Board.reveal_cell(self, row, col)
+        self.score = score
+        self.game_won = bool(status & FLAG_WON)
+        self.game_lose = bool(status & FLAG_LOST)
+        self.mine_lose = self.game_lose and self.mine_stepped_counter >= 3
+
+    def handle_message(self, message):
+        kind = message[0]
+        if kind == DELTA:
+            _, slot, event, score, words, status = message
+            self.scores[slot] = score
+            self.words_found[slot] = words
+            self.statuses[slot] = status
+            if slot == self.slot:
+                self.apply_own_move(event, score, status)
+        elif kind == LEFT:
+            self.left.add(message[1])
+        elif kind == END:
+            self.winner = message[1] - 1
+        elif kind == ERROR:
+            self.disconnected = message[1]
+
+    async def listen(self):
+
+        # Reads the messages of the server and redraws the board after each, until the connection closes.
+
+        try:
+            while True:
+                message = await read_message(self.reader)
+                if message is None:
+                    break
+                self.handle_message(message)
+                self.draw_board()
+        except (ProtocolError, ConnectionError):
+            pass
+        if self.disconnected is None and self.winner is None:
+            self.disconnected = "The race server closed the connection."
+        self.draw_board()
+
+    async def play(self, keys):
+
+        # Plays the race (see Board.play()), with the messages of the server read meanwhile.
+
+        self.listener = asyncio.ensure_future(self.listen())
+        try:
+            await Board.play(self, keys)
+        finally:
+            self.listener.cancel()
+            self.writer.close()
+
+    def draw_board(self):
+        Board.draw_board(self)
+        self.display_user_info()  # Moves of the other players change the standings between two keys
+
+    def display_user_info(self):
+
+        # Shows the race standings where the other modes show the player's statistics: the score, the words
+        # found and the status of every player, and the winner once the race is over.
+
+        h, w = self.stdscr.getmaxyx()
+        standings_win = curses.newwin(len(self.names) + 3, 40, 1, w - 41)
+        standings_win.border('|', '|', '-', '-', '+', '+', '+', '+')
+        if self.disconnected is not None:
+            title = self.disconnected
+        elif self.winner is None:
+            title = f"Race in room {self.room}" if self.room else "Quick match race"
+        elif self.winner < 0:
+            title = "Race over: nobody won"
+        elif self.winner == self.slot:
+            title = "You won the race!"
+        else:
+            title = f"{self.names[self.winner]} won the race"
+        standings_win.addstr(1, 2, title[:36], curses.A_BOLD)
+        for slot, name in enumerate(self.names):
+            if slot in self.left:
+                status = "left"
+            elif self.statuses[slot] & FLAG_WON:
+                status = "done"
+            elif self.statuses[slot] & FLAG_LOST:
+                status = "out"
+            else:
+                status = ""
+            line = f"{name[:16]:<17}{self.scores[slot]:>7} {self.words_found[slot]}/{len(self.selected_words)} {status}"
+            standings_win.addstr(slot + 2, 2, line[:36], curses.A_BOLD if slot == self.slot else curses.A_NORMAL)
+        standings_win.refresh()
+
+
+def draw_lobby(stdscr, room, difficulty, joined, capacity):
+
+    # Shows the players joining a room while the race waits for them.
+
+    stdscr.clear()
+    where = f"room {room}" if room else f"the {difficulty} quick match"
+    stdscr.addstr(13, 10, f"Waiting for players in {where}: {joined} of {capacity} joined")
+    stdscr.addstr(14, 10, "The race starts once everybody is in. Press ESC to leave.")
+    stdscr.refresh()
+
+
+async def show_message(stdscr, keys, message):
+
+    # Shows why a race could not be joined, until a key is pressed.
+
+    stdscr.clear()
+    stdscr.addstr(13, 10, message)
+    stdscr.addstr(14, 10, "Press any key to continue.")
+    stdscr.refresh()
+    await keys.get()
@@ -0,0 +1,447 @@
+# Solver of classic boards.
+#
+# The solver plays a board the way a careful player would: it only clicks cells it can prove are not mines,
+# using nothing but what the screen shows. It answers whether all the words of a board can be found without
+# ever guessing, and gives a short sequence of safe clicks that finds them.
+#
+# What the player knows is kept in a Knowledge object:
+#
+#     - Border cells never hold mines, so they are safe from the start.
+#     - Every revealed cell shows the braille mine hint of its neighbours. The glyphs are lossy, so a pair of
+#       glyphs allows a set of neighbour mine masks (GLYPH_MASKS): a mine constraint.
+#     - Every revealed empty cell shows how many cells of its 3x3 area hold a letter of the words: a letter
+#       constraint. A cell holding a word letter is never a mine.
+#     - A revealed letter is read as known to be, or not to be, a letter of the words. Filler letters never
+#       share a letter with the words, so this only assumes the player recognises the letters of the words.
+#
+# Constraint propagation narrows the masks each mine constraint still allows and fixes every cell that is
+# the same in all of them, and fills letter constraints that have no freedom left. When propagation gets
+# stuck, a bounded search assumes a value for a cell and propagates: if that leads to a contradiction,
+# the cell has the other value. Knowledge is also meant to be reused by anything reasoning about a board.
+
+from game.grid import DIRECTIONS, MINE_HINT_GLYPHS, MINE, EMPTY
+
+UNKNOWN = 2
+
+# Kinds of constraints
+MINE_CONSTRAINT = 0
+LETTER_CONSTRAINT = 1
+
+# How many assumptions deep the search goes before giving up on a cell
+SEARCH_DEPTH = 1
+
+# The mine masks that are drawn as each pair of glyphs
+GLYPH_MASKS = {}
+for _mask, _glyphs in enumerate(MINE_HINT_GLYPHS):
+    GLYPH_MASKS.setdefault(_glyphs, []).append(_mask)
+
+_neighbour_tables = {}  # Board size -> neighbour table, built on first use
+
+
+def neighbour_table(size):
+
+    # Gets the neighbours of every cell of a board of the given size.
+    #
+    # Args:
+    #     size (int): The board size.
+    #
+    # Returns:
+    #     list: For each cell index, a tuple of:
+    #         - tuple: (index, direction bit) of every neighbour on the board.
+    #         - int: The direction bits pointing off the board.
+    #         - tuple: The indexes of the 3x3 area of the cell, itself included.
+
+    if size not in _neighbour_tables:
+        table = []
+        for row in range(size):
+            for col in range(size):
+                neighbours = []
+                off_board = 0
+                for dir_row, dir_col, bit in DIRECTIONS:
+                    new_row = row + dir_row
+                    new_col = col + dir_col
+                    if 0 <= new_row < size and 0 <= new_col < size:
+                        neighbours.append((new_row * size + new_col, bit))
+                    else:
+                        off_board |= bit
+                area = tuple(i * size + j
+                             for i in range(max(0, row - 1), min(size, row + 2))
+                             for j in range(max(0, col - 1), min(size, col + 2)))
+                table.append((tuple(neighbours), off_board, area))
+        _neighbour_tables[size] = table
+    return _neighbour_tables[size]
+
+
+def word_letter_table(words):
+
+    # Builds a translation table marking the letters of the given words.
+    #
+    # Args:
+    #     words (list of str): The words of the board.
+    #
+    # Returns:
+    #     bytes: 1 at the ASCII code of every letter of the words, 0 elsewhere.
+
+    table = bytearray(256)
+    for letter in set(''.join(words)):
+        table[ord(letter)] = 1
+    return bytes(table)
+
+
+class Knowledge:
+
+    # What a player knows about a board, and the constraints that link it.
+    # Attributes:
+    # -----------
+    # size : int
+    #     The board size.
+    # mine : bytearray
+    #     For each cell: 1 if it is known to be a mine, 0 if it is known to be safe, UNKNOWN otherwise.
+    # word : bytearray
+    #     For each cell: 1 if it is known to hold a word letter, 0 if it is known not to, UNKNOWN otherwise.
+    # revealed : bytearray
+    #     1 for every revealed cell.
+    # constraints : list
+    #     (kind, cells, value) of every constraint. A mine constraint lists (index, direction bit) of the
+    #     neighbours, a letter constraint the indexes of the 3x3 area and the letter count as value.
+    # candidates : list
+    #     For each mine constraint, the neighbour mine masks it still allows (None for letter constraints).
+    # watchers : list
+    #     For each cell, the constraints it takes part in.
+    # safe : set
+    #     Covered cells proven safe.
+    # consistent : bool
+    #     False once the knowledge contradicts itself (only happens under a wrong assumption).
+    #
+    # Methods:
+    # --------
+    # copy():
+    #     Returns an independent copy, used to try assumptions.
+    # set_mine(index, value), set_word(index, value):
+    #     Records a fact about a cell.
+    # observe(grid, index, is_word_letter):
+    #     Reveals a cell of a grid and adds the constraints its hints give.
+    # propagate():
+    #     Applies the constraints until nothing changes.
+    # frontier():
+    #     Gets the covered cells of unknown state that take part in a constraint.
+    # refutes(index, value, depth):
+    #     Checks if assuming a value for a cell leads to a contradiction.
+    # search(cells, depth):
+    #     Settles the cells whose assumed values lead to contradictions.
+
+    def __init__(self, size, border_safe=True):
+        cell_count = size * size
+        self.size = size
+        self.table = neighbour_table(size)
+        self.mine = bytearray([UNKNOWN]) * cell_count
+        self.word = bytearray([UNKNOWN]) * cell_count
+        self.revealed = bytearray(cell_count)
+        self.constraints = []
+        self.candidates = []
+        self.watchers = [[] for _ in range(cell_count)]
+        self.queue = set()
+        self.safe = set()
+        self.consistent = True
+        if border_safe:
+            # Mines are never placed on the border
+            for index in range(cell_count):
+                row, col = divmod(index, size)
+                if row in (0, size - 1) or col in (0, size - 1):
+                    self.set_mine(index, 0)
+
+    def copy(self):
+        other = Knowledge.__new__(Knowledge)
+        other.size = self.size
+        other.table = self.table
+        other.mine = self.mine[:]
+        other.word = self.word[:]
+        other.revealed = self.revealed  # Not changed while trying assumptions
+        other.constraints = self.constraints
+        other.candidates = self.candidates[:]  # Narrowed lists are replaced, never changed in place
+        other.watchers = self.watchers
+        other.queue = set(self.queue)
+        other.safe = set(self.safe)
+        other.consistent = self.consistent
+        return other
+
+    def set_mine(self, index, value):
+
+        # Records whether a cell is a mine. A mine never holds a word letter.
+        # Recording the opposite of a known fact makes the knowledge inconsistent.
+
+        current = self.mine[index]
+        if current == value:
+            return
+        if current != UNKNOWN:
+            self.consistent = False
+            return
+        self.mine[index] = value
+        self.queue.update(self.watchers[index])
+        if value:
+            self.set_word(index, 0)
+        elif not self.revealed[index]:
+            self.safe.add(index)
+
+    def set_word(self, index, value):
+
+        # Records whether a cell holds a word letter. A cell holding a word letter is never a mine.
+
+        current = self.word[index]
+        if current == value:
+            return
+        if current != UNKNOWN:
+            self.consistent = False
+            return
+        self.word[index] = value
+        self.queue.update(self.watchers[index])
+        if value:
+            self.set_mine(index, 0)
+
+    def add_constraint(self, kind, cells, value, candidates=None):
+        constraint_id = len(self.constraints)
+        self.constraints.append((kind, cells, value))
+        self.candidates.append(candidates)
+        for cell in cells:
+            self.watchers[cell[0] if kind == MINE_CONSTRAINT else cell].append(constraint_id)
+        self.queue.add(constraint_id)
+
+    def observe(self, grid, index, is_word_letter):
+
+        # Reveals a cell and adds what its hints tell: a mine constraint from the glyphs of its mine hint
+        # and, for an empty cell, a letter constraint from its letter count. A mine the player stepped on
+        # shows the mine symbol instead of a letter count, but still shows its mine hint.
+        #
+        # Args:
+        #     grid (Grid): The board the cell is read from. Only what the screen shows is read.
+        #     index (int): The index of the cell.
+        #     is_word_letter (bytes): word_letter_table() of the words of the board.
+
+        neighbours, off_board, area = self.table[index]
+        self.revealed[index] = 1
+        self.safe.discard(index)
+        stepped_on = grid.cells[index] & MINE
+        self.set_mine(index, 1 if stepped_on else 0)
+        letter = grid.letters[index]
+        self.set_word(index, is_word_letter[letter])
+        masks = [mask for mask in GLYPH_MASKS[grid.mine_hint(index)] if not mask & off_board]
+        self.add_constraint(MINE_CONSTRAINT, neighbours, None, masks)
+        if letter == EMPTY and not stepped_on:  # Empty cells show their letter count
+            self.add_constraint(LETTER_CONSTRAINT, area, grid.letter_counts[index])
+
+    def propagate(self):
+
+        # Applies the queued constraints until nothing changes.
+        #
+        # Returns:
+        #     bool: False if the knowledge contradicts itself.
+
+        queue = self.queue
+        mine = self.mine
+        word = self.word
+        while queue and self.consistent:
+            constraint_id = queue.pop()
+            kind, cells, value = self.constraints[constraint_id]
+            if kind == MINE_CONSTRAINT:
+                known_bits = 0
+                known_mines = 0
+                unknown = []
+                for cell, bit in cells:
+                    state = mine[cell]
+                    if state == UNKNOWN:
+                        unknown.append((cell, bit))
+                    else:
+                        known_bits |= bit
+                        if state:
+                            known_mines |= bit
+                candidates = [mask for mask in self.candidates[constraint_id] if mask & known_bits == known_mines]
+                if not candidates:
+                    self.consistent = False
+                    break
+                self.candidates[constraint_id] = candidates
+                if unknown:
+                    always = 255
+                    ever = 0
+                    for mask in candidates:
+                        always &= mask
+                        ever |= mask
+                    for cell, bit in unknown:
+                        if always & bit:
+                            self.set_mine(cell, 1)
+                        elif not ever & bit:
+                            self.set_mine(cell, 0)
+            else:
+                unknown = []
+                needed = value
+                for cell in cells:
+                    state = word[cell]
+                    if state == UNKNOWN:
+                        unknown.append(cell)
+                    elif state:
+                        needed -= 1
+                if needed < 0 or needed > len(unknown):
+                    self.consistent = False
+                    break
+                if unknown and (needed == 0 or needed == len(unknown)):
+                    for cell in unknown:
+                        self.set_word(cell, 1 if needed else 0)
+        return self.consistent
+
+    def frontier(self):
+
+        # Gets the covered cells whose mine state is unknown and that take part in a constraint,
+        # the only cells a search can settle.
+
+        return [index for index in range(self.size * self.size)
+                if self.mine[index] == UNKNOWN and self.watchers[index]]
+
+    def refutes(self, index, value, depth=SEARCH_DEPTH):
+
+        # Checks if assuming a mine state for a cell contradicts the knowledge.
+        #
+        # Args:
+        #     index (int): The index of the cell.
+        #     value (int): 1 to assume a mine, 0 to assume a safe cell.
+        #     depth (int): Assumptions left. Above 1, the assumption is also searched further.
+        #
+        # Returns:
+        #     bool: True if the assumption leads to a contradiction.
+
+        trial = self.copy()
+        trial.set_mine(index, value)
+        if not trial.propagate():
+            return True
+        if depth > 1:
+            trial.search(trial.frontier(), depth - 1)
+        return not trial.consistent
+
+    def search(self, cells, depth=SEARCH_DEPTH):
+
+        # Settles every cell of the list whose assumed state leads to a contradiction, and propagates.
+        #
+        # Args:
+        #     cells (list of int): The cells to try.
+        #     depth (int): How many assumptions deep to search.
+        #
+        # Returns:
+        #     bool: True if any cell was settled.
+
+        settled = False
+        for index in cells:
+            if self.mine[index] != UNKNOWN:
+                continue
+            if self.refutes(index, 1, depth):
+                self.set_mine(index, 0)
+            elif self.refutes(index, 0, depth):
+                self.set_mine(index, 1)
+            else:
+                continue
+            settled = True
+            if not self.propagate():
+                break
+        return settled
+
+
+class SolveResult:
+
+    # The outcome of solve().
+    # Attributes:
+    # -----------
+    # fair : bool
+    #     True if every word can be found without guessing.
+    # clicks : list of tuple
+    #     (row, col) of the safe clicks made, in order. When the board is unfair, the clicks made before
+    #     the solver got stuck.
+    # knowledge : Knowledge
+    #     What was known at the end.
+
+    def __init__(self, fair, clicks, knowledge):
+        self.fair = fair
+        self.clicks = clicks
+        self.knowledge = knowledge
+
+
+def solve(board, search_depth=SEARCH_DEPTH):
+
+    # Plays a board from the start, clicking only cells proven safe, until all words are revealed.
+    #
+    # The clicks are picked greedily to keep the sequence short: a word cell proven safe is clicked first,
+    # since every word cell has to be revealed anyway. Otherwise the search tries to prove a remaining word
+    # cell safe, and if it cannot, the safe cell with the most unknown neighbours is clicked for its hints.
+    # Only when no safe cell is left at all does the search run over the whole frontier.
+    #
+    # Args:
+    #     board (Board): A generated board. Its covered / revealed states are not changed.
+    #     search_depth (int): How many assumptions deep the search goes.
+    #
+    # Returns:
+    #     SolveResult: Whether the board is fair, and the clicks.
+
+    grid = board.grid
+    size = grid.size
+    is_word_letter = word_letter_table(board.selected_words)
+    word_flags = grid.letters.translate(is_word_letter)
+    remaining = set()
+    index = word_flags.find(1)
+    while index != -1:
+        remaining.add(index)
+        index = word_flags.find(1, index + 1)
+
+    knowledge = Knowledge(size)
+    clicks = []
+    while remaining:
+        index = _pick_click(knowledge, remaining, search_depth)
+        if index is None:
+            return SolveResult(False, clicks, knowledge)
+        knowledge.observe(grid, index, is_word_letter)
+        knowledge.propagate()
+        remaining.discard(index)
+        clicks.append(divmod(index, size))
+    return SolveResult(True, clicks, knowledge)
+
+
+def _pick_click(knowledge, remaining, search_depth):
+
+    # Picks the next safe cell to click, see solve(). Returns None if no cell can be proven safe.
+
+    safe_words = knowledge.safe & remaining
+    if not safe_words:
+        targets = [index for index in remaining if knowledge.mine[index] == UNKNOWN and knowledge.watchers[index]]
+        if targets and knowledge.search(targets, search_depth):
+            safe_words = knowledge.safe & remaining
+    if safe_words:
+        return min(safe_words)
+    if not knowledge.safe:
+        knowledge.search(knowledge.frontier(), search_depth)
+        if not knowledge.safe:
+            return None
+        safe_words = knowledge.safe & remaining
+        if safe_words:
+            return min(safe_words)
+
+    # Click the safe cell nearest to the word cells still unknown, since its hints are the most likely
+    # to tell about them. Among the nearest ones, the cell with the most unknown neighbours is clicked.
+    mine = knowledge.mine
+    table = knowledge.table
+    safe = knowledge.safe
+    layer = [index for index in remaining if mine[index] == UNKNOWN]
+    seen = set(layer)
+    while layer:
+        found = [index for index in layer if index in safe]
+        if found:
+            return max(sorted(found), key=lambda index: sum(1 for cell, _ in table[index][0] if mine[cell] == UNKNOWN))
+        next_layer = []
+        for index in layer:
+            for cell, _ in table[index][0]:
+                if cell not in seen:
+                    seen.add(cell)
+                    next_layer.append(cell)
+        layer = next_layer
+    return min(safe)
+
+
+def is_fair(board, search_depth=SEARCH_DEPTH):
+
+    # Checks if every word of a board can be found without guessing.
+
+    return solve(board, search_depth).fair
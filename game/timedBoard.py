@@ -0,0 +1,197 @@
+# A module for the timed mode of The Puzzle Game.
+# The timed mode plays any classic difficulty against the clock: a game lasts the time_limit of its profile
+# (data/difficulties.ini) and is lost when the time runs out, and a won game scores time_bonus points per whole
+# second left on top of its classic score.
+#
+# The clock is driven by a fixed-rate tick scheduler inside the game loop of Board.play(), without a thread and
+# without busy-waiting: the next key is awaited with a timeout until the next tick is due (see key_timeout()),
+# so the event loop sleeps until either a key comes or the clock has to move. Tick deadlines are counted from the
+# start of the game, so the clock does not drift however long keys take to handle, and ticks missed while the
+# game was busy are skipped rather than caught up. A tick only repaints the one-line window of the clock
+# (noutrefresh() + doupdate()), never the board.
+#
+# The time bonus is counted from the replay tick of the winning move (util/replay.py), so replays of timed games
+# score the same when they are played again.
+
+import curses
+import math
+import time
+from game.classicBoard import Board
+from util.replay import TICK_SECONDS
+
+TICK_RATE = 10  # Clock ticks per second
+CLOCK_WARNING = 10  # Seconds left from which the clock is highlighted
+
+
+class TimedBoard(Board):
+
+    # A board of any classic difficulty played against the clock.
+    # Attributes:
+    # -----------
+    # time_limit : int
+    #     Seconds the game lasts (from the profile).
+    # time_bonus : int
+    #     Points per whole second left when the game is won (from the profile).
+    # time_up : bool
+    #     Whether the game was lost because the time ran out.
+    # next_tick : float
+    #     perf_counter() when the next clock tick is due.
+    # stopped_at : float
+    #     Seconds played when the game ended (None while the clock runs).
+    # bonus_awarded : int
+    #     The time bonus added to the score (None until the game is won).
+    # clock_win : curses.window
+    #     The one-line window the clock is drawn in, above the player window.
+    #
+    # Methods:
+    # --------
+    # start():
+    #     Starts the game and its clock.
+    # elapsed():
+    #     Gets the seconds played.
+    # clock_running():
+    #     Checks if the clock still runs, stopping it once the game is over.
+    # check_time():
+    #     Ends the game when the time has run out.
+    # bonus_points(tick):
+    #     Gets the time bonus of a game won at a replay tick.
+    # tick():
+    #     Moves the clock to its next tick and repaints it.
+    # draw_clock():
+    #     Draws the clock in its own window.
+
+    timed = True
+    resumable = False  # The clock would stop while the game is left
+
+    def __init__(self, stdscr, user, size=None, seed=None, profile=None, no_guess=False):
+        Board.__init__(self, stdscr, user, size, seed, profile, no_guess)
+        self.time_limit = self.profile.time_limit
+        self.time_bonus = self.profile.time_bonus
+
+    def start(self):
+
+        # Starts the game (see Board.start()) and its clock, with the replay recording.
+
+        Board.start(self)
+        self.time_up = False
+        self.stopped_at = None
+        self.bonus_awarded = None
+        self.next_tick = self.replay.start_time + 1 / TICK_RATE
+        self.clock_win = None
+
+    def elapsed(self):
+        if self.stopped_at is not None:
+            return self.stopped_at
+        return time.perf_counter() - self.replay.start_time
+
+    def clock_running(self):
+
+        # Checks if the clock still runs. The clock stops at the time the game was won or lost.
+
+        if self.stopped_at is None and (self.game_won or self.game_lose):
+            self.stopped_at = min(self.elapsed(), self.time_limit)
+        return self.stopped_at is None
+
+    def check_time(self):
+
+        # Ends the game as lost when the time has run out.
+        #
+        # Returns:
+        #     bool: True if the time ran out just now.
+
+        if self.clock_running() and self.elapsed() >= self.time_limit:
+            self.stopped_at = self.time_limit
+            self.time_up = True
+            self.game_lose = True
+            self.game_won = False
+            return True
+        return False
+
+    def bonus_points(self, tick):
+
+        # Gets the time bonus of a game won at a replay tick: time_bonus points per whole second left.
+
+        return max(0, int(self.time_limit - tick * TICK_SECONDS)) * self.time_bonus
+
+    def check_all_words_revealed(self):
+
+        # Checks if all selected words have been revealed (see Board.check_all_words_revealed()). The first
+        # time they are, the time bonus of the winning move is added to the score before the result is decided,
+        # so the bonus can lift a negative score to a win.
+
+        if self.bonus_awarded is None and not self.game_lose and \
+                all(word in self.revealed_words for word in self.selected_words):
+            self.bonus_awarded = self.bonus_points(self.replay.last_tick)
+            self.score += self.bonus_awarded
+        return Board.check_all_words_revealed(self)
+
+    def lose_message(self):
+        if self.time_up:
+            return "Time is up!"
+        return Board.lose_message(self)
+
+    def key_timeout(self):
+
+        # Waits for keys until the next clock tick at most (see Board.key_timeout()).
+
+        timeout = Board.key_timeout(self)
+        if not self.clock_running():
+            return timeout
+        until_tick = max(0, math.ceil((self.next_tick - time.perf_counter()) * 1000))
+        return until_tick if timeout < 0 else min(timeout, until_tick)
+
+    def idle(self):
+        if self.clock_running() and time.perf_counter() >= self.next_tick:
+            self.tick()
+        Board.idle(self)
+
+    def handle_key(self, key):
+
+        # Applies a key (see Board.handle_key()). A key pressed after the time ran out, before the tick that
+        # would have noticed it, finds the game already lost.
+
+        self.check_time()
+        return Board.handle_key(self, key)
+
+    def tick(self):
+
+        # Moves the clock to its next tick on the fixed grid counted from the start of the game, skipping the
+        # ticks that were missed, and repaints it. The whole board is only redrawn when the time runs out.
+
+        interval = 1 / TICK_RATE
+        missed = int((time.perf_counter() - self.next_tick) / interval)
+        self.next_tick += (missed + 1) * interval
+        if self.check_time():
+            self.draw_board()
+        else:
+            self.draw_clock()
+            curses.doupdate()
+
+    def draw_board(self):
+        Board.draw_board(self)
+        self.draw_clock()
+        curses.doupdate()
+
+    def draw_clock(self):
+
+        # Draws the time left (or the time bonus of a won game) in the clock window, which is only copied to
+        # the screen by the next curses.doupdate().
+
+        h, w = self.stdscr.getmaxyx()
+        if self.clock_win is None or self.clock_win.getbegyx() != (0, w - 41):
+            self.clock_win = curses.newwin(1, 40, 0, w - 41)
+        running = self.clock_running()
+        left = max(0.0, self.time_limit - self.elapsed())
+        minutes, seconds = divmod(left, 60)
+        attribute = curses.A_BOLD
+        if self.bonus_awarded is not None and self.game_won:
+            text = f"Time: {int(minutes)}:{seconds:04.1f}  bonus +{self.bonus_awarded}"
+        elif self.time_up:
+            text = "Time: 0:00.0  time is up!"
+        else:
+            text = f"Time: {int(minutes)}:{seconds:04.1f}  +{self.time_bonus} per second left"
+            if running and left < CLOCK_WARNING:
+                attribute |= curses.A_REVERSE
+        self.clock_win.erase()
+        self.clock_win.addstr(0, 2, text[:37], attribute)
+        self.clock_win.noutrefresh()
@@ -0,0 +1,294 @@
+# Viewport and mini-map of boards larger than the terminal.
+#
+# The Viewport is the window of the board drawn on screen: the first row and column shown, how many rows
+# and columns fit, and where the drawn board starts on the screen. draw_board() only draws the cells inside
+# it, so drawing costs the same on a 100x100 board as on a board the size of the screen.
+#
+# The MiniMap is an overview of the whole board, one character per block of cells, with the part inside the
+# viewport highlighted. It keeps the state of every block and only recounts the blocks whose cells changed
+# since it was last drawn, so it does not scan the whole board on every frame either.
+
+import curses
+import math
+from game.grid import COVERED, FLAGGED
+
+# Columns kept free on each side of the board for the word list and the player window
+BOARD_SIDE_MARGIN = 42
+
+# Mouse wheel events. Older curses builds do not name the wheel-down button, 0x200000 is its ncurses value.
+WHEEL_UP = curses.BUTTON4_PRESSED
+WHEEL_DOWN = getattr(curses, 'BUTTON5_PRESSED', 0x200000)
+
+# Mini-map characters: covered block, partly revealed block, revealed block, block holding a flag
+MAP_COVERED = '▓'
+MAP_PARTLY = '░'
+MAP_REVEALED = '·'
+MAP_FLAGGED = '!'
+
+
+class Viewport:
+
+    # The part of a board shown on screen.
+    # Attributes:
+    # -----------
+    # size : int
+    #     The size of the board.
+    # row, col : int
+    #     The first row and column shown.
+    # rows, cols : int
+    #     How many rows and columns fit on the screen.
+    # start_x, start_y : int
+    #     The screen position of the top-left corner of the drawn board, which is centered on the screen.
+    #
+    # Methods:
+    # --------
+    # fit(h, w):
+    #     Sizes the viewport to a screen of h rows and w columns.
+    # scroll(d_row, d_col):
+    #     Moves the viewport, keeping it inside the board.
+    # page(d_pages):
+    #     Moves the viewport up or down by whole screens.
+    # center_on(row, col):
+    #     Moves the viewport so that a cell is in its middle.
+    # show(row, col):
+    #     Moves the viewport as little as needed for a cell to be shown.
+    # cell_at(x, y):
+    #     Gets the board cell under a screen position.
+    # is_partial():
+    #     Checks if part of the board is off screen.
+
+    def __init__(self, size):
+        self.size = size
+        self.row = 0
+        self.col = 0
+        self.rows = size
+        self.cols = size
+        self.start_x = 0
+        self.start_y = 0
+
+    def fit(self, h, w):
+
+        # Sizes the viewport to the screen. Every cell takes 4 columns and 2 rows, BOARD_SIDE_MARGIN columns
+        # stay free on both sides and the last rows stay free for the messages below the board.
+        #
+        # Args:
+        #     h (int): The height of the screen.
+        #     w (int): The width of the screen.
+
+        self.rows = max(1, min(self.size, (h - 1) // 2))
+        self.cols = max(1, min(self.size, (w - 2 * BOARD_SIDE_MARGIN - 1) // 4))
+        self.start_x = (w - (self.cols * 4 + 1)) // 2
+        self.start_y = (h - (self.rows * 2 + 1)) // 2
+        self.scroll(0, 0)  # The viewport may reach past the board after the screen has grown
+
+    def scroll(self, d_row, d_col):
+
+        # Moves the viewport, keeping it inside the board.
+        #
+        # Args:
+        #     d_row (int): Rows to move down (negative moves up).
+        #     d_col (int): Columns to move right (negative moves left).
+
+        self.row = max(0, min(self.size - self.rows, self.row + d_row))
+        self.col = max(0, min(self.size - self.cols, self.col + d_col))
+
+    def page(self, d_pages):
+
+        # Moves the viewport down (or up, for a negative d_pages) by whole screens,
+        # keeping one row of the previous screen in sight.
+        #
+        # Args:
+        #     d_pages (int): Screens to move down.
+
+        self.scroll(d_pages * max(1, self.rows - 1), 0)
+
+    def center_on(self, row, col):
+
+        # Moves the viewport so that a cell is in its middle, as far as the board allows.
+        #
+        # Args:
+        #     row (int): The row of the cell.
+        #     col (int): The column of the cell.
+
+        self.scroll(row - self.rows // 2 - self.row, col - self.cols // 2 - self.col)
+
+    def show(self, row, col):
+
+        # Moves the viewport as little as needed for a cell to be shown, e.g. to follow the keyboard cursor.
+        #
+        # Args:
+        #     row (int): The row of the cell.
+        #     col (int): The column of the cell.
+
+        d_row = min(0, row - self.row) + max(0, row - (self.row + self.rows - 1))
+        d_col = min(0, col - self.col) + max(0, col - (self.col + self.cols - 1))
+        self.scroll(d_row, d_col)
+
+    def cell_at(self, x, y):
+
+        # Gets the board cell under a screen position.
+        #
+        # Args:
+        #     x (int): The screen column.
+        #     y (int): The screen row.
+        #
+        # Returns:
+        #     tuple: The row and column of the cell, or None if the position is not on a shown cell.
+
+        if self.start_y <= y < self.start_y + self.rows * 2 and self.start_x <= x < self.start_x + self.cols * 4:
+            return (y - self.start_y) // 2 + self.row, (x - self.start_x) // 4 + self.col
+        return None
+
+    def is_partial(self):
+
+        # Checks if part of the board is off screen.
+        #
+        # Returns:
+        #     bool: True if the viewport does not show the whole board.
+
+        return self.rows < self.size or self.cols < self.size
+
+
+class MiniMap:
+
+    # An overview of the whole board, one character per block of block x block cells.
+    # Attributes:
+    # -----------
+    # grid : Grid
+    #     The board shown.
+    # block : int
+    #     The number of rows and columns of cells behind one character.
+    # map_size : int
+    #     The number of rows and columns of characters.
+    # glyphs : list of str
+    #     The character of every block, row by row.
+    # dirty : set
+    #     The blocks whose cells changed since they were last counted.
+    # x, y : int
+    #     The screen position of the mini-map when it was last drawn (None if it was not drawn).
+    #
+    # Methods:
+    # --------
+    # layout(max_w, max_h):
+    #     Picks the block size so the mini-map fits in max_w columns and max_h rows.
+    # cell_changed(index):
+    #     Marks the block holding a cell to be recounted.
+    # draw(stdscr, y, x, viewport):
+    #     Draws the mini-map with the viewport highlighted.
+    # cell_at(x, y):
+    #     Gets the board cell in the middle of the block under a screen position.
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.block = 0
+        self.map_size = 0
+        self.glyphs = []
+        self.dirty = set()
+        self.x = None
+        self.y = None
+
+    def layout(self, max_w, max_h):
+
+        # Picks the block size so the mini-map fits in max_w columns and max_h rows.
+        # Every block is recounted when the block size changes.
+        #
+        # Args:
+        #     max_w (int): The available columns.
+        #     max_h (int): The available rows.
+        #
+        # Returns:
+        #     bool: False if there is no room for a mini-map.
+
+        if max_w < 3 or max_h < 3:
+            return False
+        block = math.ceil(self.grid.size / min(max_w, max_h))
+        if block != self.block:
+            self.block = block
+            self.map_size = math.ceil(self.grid.size / block)
+            self.glyphs = [MAP_COVERED] * (self.map_size * self.map_size)
+            self.dirty = set(range(self.map_size * self.map_size))
+        return True
+
+    def cell_changed(self, index):
+
+        # Marks the block holding a cell to be recounted before the next draw.
+        #
+        # Args:
+        #     index (int): The index of the cell (row * size + col).
+
+        if self.block:
+            row, col = divmod(index, self.grid.size)
+            self.dirty.add((row // self.block) * self.map_size + col // self.block)
+
+    def count_block(self, block_index):
+
+        # Recounts the cells of one block and stores its character.
+        #
+        # Args:
+        #     block_index (int): The index of the block (block row * map_size + block column).
+
+        size = self.grid.size
+        cells = self.grid.cells
+        block_row, block_col = divmod(block_index, self.map_size)
+        first_col = block_col * self.block
+        last_col = min(size, first_col + self.block)
+        covered = flagged = total = 0
+        for row in range(block_row * self.block, min(size, (block_row + 1) * self.block)):
+            for state in cells[row * size + first_col:row * size + last_col]:
+                total += 1
+                if state & COVERED:
+                    covered += 1
+                    if state & FLAGGED:
+                        flagged += 1
+        if flagged:
+            glyph = MAP_FLAGGED
+        elif covered == total:
+            glyph = MAP_COVERED
+        elif covered:
+            glyph = MAP_PARTLY
+        else:
+            glyph = MAP_REVEALED
+        self.glyphs[block_index] = glyph
+
+    def draw(self, stdscr, y, x, viewport):
+
+        # Draws the mini-map, highlighting the blocks inside the viewport.
+        #
+        # Args:
+        #     stdscr (curses.window): The window to draw on.
+        #     y (int): The screen row of the top of the mini-map.
+        #     x (int): The screen column of the left of the mini-map.
+        #     viewport (Viewport): The part of the board shown on screen.
+
+        for block_index in self.dirty:
+            self.count_block(block_index)
+        self.dirty.clear()
+        self.x = x
+        self.y = y
+        first_row = viewport.row // self.block
+        last_row = (viewport.row + viewport.rows - 1) // self.block
+        first_col = viewport.col // self.block
+        last_col = (viewport.col + viewport.cols - 1) // self.block
+        for map_row in range(self.map_size):
+            line = ''.join(self.glyphs[map_row * self.map_size:(map_row + 1) * self.map_size])
+            stdscr.addstr(y + map_row, x, line)
+            if first_row <= map_row <= last_row:
+                stdscr.addstr(y + map_row, x + first_col, line[first_col:last_col + 1], curses.A_REVERSE)
+
+    def cell_at(self, x, y):
+
+        # Gets the board cell in the middle of the block under a screen position.
+        #
+        # Args:
+        #     x (int): The screen column.
+        #     y (int): The screen row.
+        #
+        # Returns:
+        #     tuple: The row and column of the cell, or None if the position is not on the mini-map.
+
+        if self.x is None or not (self.y <= y < self.y + self.map_size and self.x <= x < self.x + self.map_size):
+            return None
+        size = self.grid.size
+        row = min(size - 1, (y - self.y) * self.block + self.block // 2)
+        col = min(size - 1, (x - self.x) * self.block + self.block // 2)
+        return row, col
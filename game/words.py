@@ -0,0 +1,54 @@
+# The word list of the boards: ./data/words.txt, one "word,complexity" line per word.
+#
+# The file is read once per process and shared by every board, which only reads it. The menu prepares it on a
+# background thread at startup (see prepare_word_list()), so the first board does not wait for the file.
+
+import threading
+from util import diffcalc
+
+WORDS_PATH = './data/words.txt'
+
+_word_list = None  # (words, complexities), read on first use
+_lock = threading.Lock()  # Boards are also built by background threads
+
+
+def read_word_list(path=WORDS_PATH):
+
+    # Reads words and their complexities from a file.
+    #
+    # Args:
+    #     path (str): The word file, each line a word and its complexity separated by a comma.
+    #
+    # Returns:
+    #     tuple: A tuple containing:
+    #         - list: A list of words.
+    #         - dict: A dictionary where keys are words and values are their complexities.
+
+    words = []
+    word_complexity = {}
+    with open(path, 'r') as file:
+        for line in file:
+            word, complexity = line.strip().split(',')
+            words.append(word)
+            word_complexity[word] = int(complexity)
+    return words, word_complexity
+
+
+def get_word_list():
+
+    # Gets the words and their complexities, reading the word file the first time.
+
+    global _word_list
+    with _lock:
+        if _word_list is None:
+            _word_list = read_word_list()
+        return _word_list
+
+
+def prepare_word_list():
+
+    # Fills in the missing word complexities (see util/diffcalc.py) and reads the word list. The menu runs
+    # this in the background before the first game.
+
+    diffcalc.update_words_file()
+    return get_word_list()
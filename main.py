@@ -1,14 +1,41 @@
+import time
+_launch_time = time.perf_counter()  # Taken before anything else is imported, used by --startup-time
+
 import curses
+import sys
 from menu import Menu
+from util import profiler
 
 # Game launcher
+#
+# Command line options:
+#     --startup-time    Draw the first menu frame, quit, and print the time it took to get there.
+#     --profile [PATH]  Record timings of board generation, drawing, saving and input handling,
+#                       and write their histograms to PATH (default ./profile_report.txt) on exit.
+#                       Setting the WORDWEEPER_PROFILE environment variable to a path does the same.
 
-def main(stdscr):
+def main(stdscr, startup_probe=False):
     # The main function that initializes and runs the menu for the puzzle game.
     # Args:
     #     stdscr: The standard screen object provided by the curses library.
-    menu = Menu(stdscr)
+    #     startup_probe (bool): If True, the menu returns right after its first frame is drawn.
+    # Returns:
+    #     float: The perf_counter() timestamp of the first drawn frame when probing, otherwise None.
+    menu = Menu(stdscr, startup_probe=startup_probe)
     menu.run()
+    return menu.first_frame_time
 
 if __name__ == "__main__":
-    curses.wrapper(main)
\ No newline at end of file
+    args = sys.argv[1:]
+    if "--profile" in args:
+        index = args.index("--profile")
+        if index + 1 < len(args) and not args[index + 1].startswith("--"):
+            profiler.enable(args[index + 1])
+        else:
+            profiler.enable()
+    if "--startup-time" in args:
+        first_frame_time = curses.wrapper(main, True)
+        # Printed after curses.wrapper has restored the terminal, otherwise the text would be wiped out
+        print(f"Time to first frame: {(first_frame_time - _launch_time) * 1000:.2f} ms")
+    else:
+        curses.wrapper(main)
@@ -4,75 +4,149 @@
 #     Menu: Represents the main menu interface for the puzzle game.
 # Functions:
 #     __init__(self, stdscr): Initializes the menu with the given stdscr object.
-#     load_users(self): Loads user data from a file and returns a list of User objects.
 #     check_window_size(self): Checks if the terminal window size meets the minimum requirements.
 #     print_menu(self, menu): Prints the given menu to the screen.
 #     handle_enter(self): Handles the Enter key being pressed while navigating the menu.
 #     start_game(self): Handles game starting logic.
+#     login(self): Lets the player pick their user from a searchable list, or register.
+#     load_users(self): Reads the user IDs on the I/O thread, if they have not been read yet.
 #     start_game_with_difficulty(self, difficulty): Starts a new game with the given difficulty.
+#     start_daily(self): Starts the daily challenge, the same board for every player today.
+#     resume_game(self): Resumes the game the current user left unfinished.
+#     refresh_user_menu(self): Shows "Resume game" in the user menu while there is a game to resume.
+#     prompt_board_size(self, profile): Asks the user for the board size of the custom difficulty.
+#     toggle_no_guess(self): Switches no-guess boards on or off.
+#     toggle_timed(self): Switches the timed mode on or off.
+#     toggle_practice(self): Switches the practice mode on or off.
+#     toggle_flood(self): Switches the flood reveal of blank regions on or off.
+#     start_race(self, difficulty): Joins a race of the given difficulty on the race server.
+#     cycle_race_players(self): Changes the number of players of the races this player creates.
+#     set_race_room(self): Asks for the room of the next race.
+#     set_race_server(self): Asks for the address of the race server.
+#     prompt_text(self, prompt, text): Asks the user for a line of text.
+#     show_matching_users(self, user_id): Shows the existing user IDs starting with the one being registered.
 #     register(self): Opens a registration prompt to the user.
 #     view_statistics(self): Shows the statistics of all users and allows the user to select a user to view their statistics.
-#     run(self): Runs the main loop of the menu interface.
+#     watch_replays(self): Lists the recorded games of the current user and plays the chosen one back.
+#     view_leaderboard(self): Shows the best players of every difficulty.
+#     run(self): Draws the first frame, then runs main_loop() under an asyncio event loop.
+#     main_loop(self): The main loop of the menu interface, as a coroutine.
+#     exit_game(self): Waits for the games still being saved and exits.
 # Attributes:
 #     stdscr: The curses window object.
 #     current_row: The current row of the menu.
 #     current_menu: The current menu being displayed.
 #     current_user: The current user logged in.
-#     users: A list of User objects.
+#     no_guess: Whether games are played on boards proven winnable without guessing.
+#     timed: Whether games are played against the clock (see game/timedBoard.py).
+#     practice: Whether moves can be undone, in games not recorded (see game/practiceBoard.py).
+#     flood: Whether revealing a blank cell reveals its blank region (see Board.flood_fill()).
+#     race_players, race_room, race_server: The settings of the next race (see game/raceBoard.py).
+#     users: The index of the user IDs (see util/user_index.py).
+#     keys: The keys of the screen as an async stream (see util/aio.py).
+#     words_ready: The word list being loaded in the background (see game/words.py).
 #     menus: A dictionary of menu items, keyed by menu name.
 #     descriptions: A dictionary of descriptions for each menu item.
 #     ascii_art: A list of strings that form the ASCII art for the menu.
 
+#
+# Only what the first frame needs is imported at module level. The game boards, the word complexity
+# calculator and the statistics screen are imported when they are first used, and the user IDs are read
+# when a list of users is first shown, so the menu comes up fast. asyncio is imported once the first frame
+# is drawn: the menu and the games then run on its event loop, and slow work runs in the background
+# (see util/aio.py).
+
 import curses
-import os
 import re
-from util import diffcalc
-from game.classicEasy import Board as EasyBoard
-from game.classicHard import Board as HardBoard
-from game.classicExpert import Board as ExpertBoard
+import time
 from util.user import User
-from util.user_statistics import UserStatistics
+from util.user_index import get_user_index
+from util.list_view import BACKSPACE_KEYS
+
+MATCHES_SHOWN = 5  # Existing user IDs shown while a new one is typed
+MIN_WINDOW_HEIGHT = 20
+MIN_WINDOW_WIDTH = 100
 
 
 class Menu:
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, startup_probe=False):
         
         # Initialize the menu with the given stdscr object.
         #
         # Args:
         #     stdscr: A curses window object
+        #     startup_probe: If True, run() returns as soon as the first frame is drawn (used by main.py --startup-time)
         #
         # Attributes:
         #     stdscr: The curses window object
         #     current_row: The current row of the menu
         #     current_menu: The current menu being displayed
         #     current_user: The current user logged in
-        #     users: A list of User objects
+        #     no_guess: Whether games are played on boards proven winnable without guessing
+        #     timed: Whether games are played against the clock (see game/timedBoard.py)
+        #     practice: Whether moves can be undone, in games not recorded (see game/practiceBoard.py)
+        #     flood: Whether revealing a blank cell reveals its blank region (see Board.flood_fill())
+        #     race_players: The number of players of the races this player creates
+        #     race_room: The room of the next race ("" for a quick match)
+        #     race_server: The (host, port) of the race server (None for one on this computer)
+        #     users: The index of the user IDs (see util/user_index.py)
+        #     keys: The keys of the screen as an async stream, created by main_loop()
+        #     words_ready: The word list being loaded in the background, started by main_loop()
         #     menus: A dictionary of menu items, keyed by menu name
         #     descriptions: A dictionary of descriptions for each menu item
         #     ascii_art: A list of strings that form the ASCII art for the menu
+        #     first_frame_time: perf_counter() timestamp of the first drawn frame, only set when probing
 
         self.stdscr = stdscr
+        self.startup_probe = startup_probe
+        self.first_frame_time = None
         self.current_row = 0
         self.current_menu = "main"
         self.current_user = None
-        self.users = self.load_users()
+        self.no_guess = False
+        self.timed = False
+        self.practice = False
+        self.flood = False
+        self.race_players = 2
+        self.race_room = ""
+        self.race_server = None
+        self.users = get_user_index()  # Read from the user store when first needed
+        self.keys = None
+        self.words_ready = None
         self.menus = {
-            "main": ["Start Game", "View Statistics", "Exit Game"],
+            "main": ["Start Game", "View Statistics", "Leaderboard", "Exit Game"],
             "start_game": [],
-            "user_menu": ["Start Game", "View Statistics", "Logout", "Exit Game"],
-            "classic_mode": ["Easy", "Hard", "Expert", "Back"]
+            "user_menu": ["Start Game", "Race", "Replays", "View Statistics", "Leaderboard", "Logout", "Exit Game"],
+            "classic_mode": ["Easy", "Hard", "Expert", "Custom", "Daily challenge", "No-guess boards: Off",
+                             "Timed mode: Off", "Practice mode: Off",
+                             "Flood reveal: Off", "Back"],
+            "race": ["Easy", "Hard", "Expert", "Custom", "Players: 2", "Room: quick match", "Server: this computer",
+                     "Back"]
         }
         self.descriptions = {
             "Start Game": "* Play some Wordweeper!",
             "View Statistics": "* Check data and statistics",
+            "Replays": "* Watch your past games again",
+            "Race": "* Race other players to the same words",
+            "Room: quick match": "* Press Enter to race in a room of your own, or in a friend's",
+            "Server: this computer": "* Press Enter to race on another computer's race server",
+            "Leaderboard": "* See the best players of every difficulty",
             "Exit Game": "* Exit the game",
             "Classic Mode": "* Play the classic mode",
             "Back": "* Go back to the previous menu",
             "Easy": "* Easy difficulty",
             "Hard": "* Hard difficulty",
             "Expert": "* Expert difficulty",
-            "New player? Click here to register!": "* Register a new player",
+            "Custom": "* Pick your own board size",
+            "Daily challenge": "* Everybody plays the same board today, your first game is ranked",
+            "No-guess boards: Off": "* Press Enter to only get boards winnable without guessing",
+            "No-guess boards: On": "* Every board is winnable without guessing",
+            "Timed mode: Off": "* Press Enter to play against the clock, with a bonus for the time left",
+            "Timed mode: On": "* Beat the clock: every second left when you win scores a bonus",
+            "Practice mode: Off": "* Press Enter to take moves back, in games that are not recorded",
+            "Practice mode: On": "* 'u' undoes a move and 'r' redoes it, games are not recorded",
+            "Flood reveal: Off": "* Press Enter to open whole blank regions in one click, as in Minesweeper",
+            "Flood reveal: On": "* A cell without hints opens its blank region and the hints around it",
             "Click here or press 'Enter' to register!": "* Register a new player",
             "Logout": "* Log out of your account"
         }
@@ -87,45 +161,21 @@ class Menu:
             "                                              |_|                "
         ]
 
-    def load_users(self):
-
-    # Loads user data from a file and returns a list of User objects.
-    #
-    # This function checks if the 'user.txt' file exists in the './data/' directory.
-    # If the file exists, it reads user data from the file, where each line represents
-    # a user and contains 11 comma-separated fields. It creates a User object for each
-    # line with the correct number of fields and appends it to a list.
-    # 
-    # Returns:
-    #     list: A list of User objects created from the data in 'user.txt'.
-
-        users = []
-        if os.path.exists('./data/user.txt'):
-            with open('./data/user.txt', 'r') as file:
-                for line in file:
-                    data = line.strip().split(',')
-                    if len(data) == 11:  # Ensure the correct number of fields
-                        user = User(data[0], int(data[1]), int(data[2]), int(data[3]), data[4], int(data[5]), int(data[6]), int(data[7]), float(data[8]), int(data[9]), int(data[10]))
-                        users.append(user)
-        return users
-
-    def check_window_size(self):
+    async def check_window_size(self):
 
     # Checks if the terminal window size meets the minimum requirements.
     #
     # This function retrieves the current dimensions of the terminal window and
-    # compares them against a predefined minimum height and width. If the window
+    # compares them against the minimum height and width (MIN_WINDOW_HEIGHT, MIN_WINDOW_WIDTH). If the window
     # is too small, a message is displayed prompting the user to increase the
-    # window size. The function waits for user input before returning.
+    # window size. The function awaits a key before returning.
     #
     # Returns:
     #     bool: True if the window size is adequate, False otherwise.
 
         h, w = self.stdscr.getmaxyx()
-        min_height = 25
-        min_width = 142
 
-        if h < min_height or w < min_width:
+        if h < MIN_WINDOW_HEIGHT or w < MIN_WINDOW_WIDTH:
             size_prompt = curses.newwin(h, w, 0, 0)
             size_prompt.clear()
             message = "Terminal window is too small! Please increase the window size."
@@ -133,7 +183,7 @@ class Menu:
             x = (w - len(message)) // 2
             size_prompt.addstr(y, x, message, curses.A_BOLD)
             size_prompt.refresh()
-            size_prompt.getch()  # Wait for user input
+            await self.keys.get()  # Wait for user input
             return False
         return True
 
@@ -169,7 +219,7 @@ class Menu:
             self.stdscr.addstr(0, w - len(login_message) - 2, login_message)
         self.stdscr.refresh()
 
-    def handle_enter(self):
+    async def handle_enter(self):
 
         # Handles the Enter key being pressed while navigating the menu.
         #
@@ -178,159 +228,553 @@ class Menu:
         menu = self.menus[self.current_menu]
         if self.current_menu == "main":
             if menu[self.current_row] == "Start Game":
-                diffcalc.update_words_file() # Calculate word complexity when starting the game
-                self.start_game()
+                await self.start_game()
+                if self.current_menu == "user_menu":
+                    await self.refresh_user_menu()
             elif menu[self.current_row] == "View Statistics":
-                self.view_statistics()
+                await self.view_statistics()
+            elif menu[self.current_row] == "Leaderboard":
+                await self.view_leaderboard()
             elif menu[self.current_row] == "Exit Game":
-                exit()
+                self.exit_game()
         elif self.current_menu == "start_game":
-            if menu[self.current_row] == "New player? Click here to register!" or menu[self.current_row] == "Click here or press 'Enter' to register!":
+            if menu[self.current_row] == "Click here or press 'Enter' to register!":
                 self.current_menu = "register"
-                self.register()
-            elif self.current_row < len(self.users):
-                self.current_user = self.users[self.current_row]
-                self.current_menu = "user_menu"
-                self.current_row = 0
+                await self.register()
         elif self.current_menu == "register":
-            self.register()
+            await self.register()
         elif self.current_menu == "user_menu":
-            if menu[self.current_row] == "Start Game":
+            if menu[self.current_row] == "Resume game":
+                await self.resume_game()
+            elif menu[self.current_row] == "Start Game":
                 self.current_menu = "classic_mode"
                 self.current_row = 0
+            elif menu[self.current_row] == "Race":
+                self.current_menu = "race"
+                self.current_row = 0
+            elif menu[self.current_row] == "Replays":
+                await self.watch_replays()
             elif menu[self.current_row] == "View Statistics":
-                self.view_statistics()
+                await self.view_statistics()
+            elif menu[self.current_row] == "Leaderboard":
+                await self.view_leaderboard()
             elif menu[self.current_row] == "Logout":
                 self.current_user = None
                 self.current_menu = "main"
                 self.current_row = 0
             elif menu[self.current_row] == "Exit Game":
-                exit()
+                self.exit_game()
         elif self.current_menu == "classic_mode":
             if menu[self.current_row] == "Easy":
-                self.start_game_with_difficulty("Easy")
+                await self.start_game_with_difficulty("Easy")
             elif menu[self.current_row] == "Hard":
-                self.start_game_with_difficulty("Hard")
+                await self.start_game_with_difficulty("Hard")
             elif menu[self.current_row] == "Expert":
-                self.start_game_with_difficulty("Expert")
+                await self.start_game_with_difficulty("Expert")
+            elif menu[self.current_row] == "Custom":
+                await self.start_game_with_difficulty("Custom")
+            elif menu[self.current_row] == "Daily challenge":
+                await self.start_daily()
+            elif menu[self.current_row].startswith("No-guess boards"):
+                self.toggle_no_guess()
+            elif menu[self.current_row].startswith("Timed mode"):
+                self.toggle_timed()
+            elif menu[self.current_row].startswith("Practice mode"):
+                self.toggle_practice()
+            elif menu[self.current_row].startswith("Flood reveal"):
+                self.toggle_flood()
             elif menu[self.current_row] == "Back":
                 self.current_menu = "user_menu"
                 self.current_row = 0
+        elif self.current_menu == "race":
+            if menu[self.current_row] in ("Easy", "Hard", "Expert", "Custom"):
+                await self.start_race(menu[self.current_row])
+            elif menu[self.current_row].startswith("Players"):
+                self.cycle_race_players()
+            elif menu[self.current_row].startswith("Room"):
+                await self.set_race_room()
+            elif menu[self.current_row].startswith("Server"):
+                await self.set_race_server()
+            elif menu[self.current_row] == "Back":
+                self.current_menu = "user_menu"
+                self.current_row = self.menus["user_menu"].index("Race")
 
-    def start_game(self):
+    async def start_game(self):
 
         # Handle game starting logic
         #
         # If the user is not logged in, shows the user selection menu. If the user is logged in, shows the classic mode selection menu.
 
         if self.current_user is None:
+            await self.load_users()
             if not self.users:
                 self.menus["start_game"] = ["Click here or press 'Enter' to register!"]
+                self.current_menu = "start_game"
             else:
-                self.menus["start_game"] = [user.user_id for user in self.users] + ["New player? Click here to register!"]
-            self.current_menu = "start_game"
+                await self.login()
         else:
             self.current_menu = "classic_mode"
         self.current_row = 0
 
-    def start_game_with_difficulty(self, difficulty):
+    async def load_users(self):
+
+        # Reads the user IDs (see util/user_index.py) on the I/O thread, which every read and write of the user
+        # file goes through, so the loop never waits on the file and no save of a user runs meanwhile.
+
+        import asyncio
+        from util import aio
+        if not self.users.loaded:
+            await asyncio.wrap_future(aio.run_io(self.users.load))
+
+    async def login(self):
+
+        # Lets the player pick their user from a scrolling list, filtered by typing (see util/list_view.py),
+        # or press Tab to register a new player. Only the rows on screen are drawn, so the list stays fast
+        # with thousands of users. The user is read on the I/O thread, after the games of this user still
+        # being saved there.
+
+        import asyncio
+        from util.list_view import ListView
+        from util import aio
+        view = ListView(self.stdscr, self.users, title="Who is playing?",
+                        help_text="Type to search, Enter to log in, Tab to register a new player, ESC to go back.",
+                        actions={9: "register"})  # Tab
+        action, user_id = await view.run(self.keys)
+        if action == "pick":
+            user = await asyncio.wrap_future(aio.run_io(User.load_from_file, user_id))
+            self.current_user = user or User(user_id)
+            self.current_menu = "user_menu"
+        elif action == "register":
+            self.current_menu = "register"
+            await self.register()
+        else:
+            self.current_menu = "main"
+        self.current_row = 0
+
+    async def start_game_with_difficulty(self, difficulty):
 
         # Starts a new game with the given difficulty.
         # 
-        # param difficulty: The difficulty of the game. Can be "Easy", "Hard", or "Expert".
+        # param difficulty: The difficulty of the game. Can be "Easy", "Hard", "Expert" or "Custom".
         # type difficulty: str
-
+        #
+        # The board size, words and mines of each difficulty come from its profile in data/difficulties.ini.
+        # The custom difficulty asks for the board size first. With no-guess boards switched on, the board
+        # is proven winnable without guessing (see toggle_no_guess()), and with the timed mode switched on the game
+        # is played against the clock (see toggle_timed()), unless the practice mode, where moves can be undone,
+        # is switched on (see toggle_practice()). Either way, blank regions flood with the flood reveal switched on
+        # (see toggle_flood()). The board is dealt in the background once the word list has been loaded, and the
+        # game runs on the menu's event loop. A no-guess board whose pool has no seed ready is proven fair while
+        # the player waits, with a message on screen, and the pools of a custom size are stopped once its game is
+        # over (see game/pool.py).
+
+        # Only the module of the chosen difficulty is imported
         if difficulty == "Easy":
-            board = EasyBoard(self.stdscr, self.current_user, size=7)
+            from game.classicEasy import Board
         elif difficulty == "Hard":
-            board = HardBoard(self.stdscr, self.current_user, size=10)
+            from game.classicHard import Board
         elif difficulty == "Expert":
-            # Assuming Expert mode uses HardBoard with a larger size
-            board = ExpertBoard(self.stdscr, self.current_user, size=12)
-        board.run()
+            from game.classicExpert import Board
+        elif difficulty == "Custom":
+            from game.classicCustom import Board
+        from game.profiles import get_profile
+        profile = get_profile(Board.profile_name)
+        if profile.scaled:
+            size = await self.prompt_board_size(profile)
+            if size is None:
+                return
+            profile = profile.scaled_to(size)
+
+        # No-guess boards come from the background pool when one is ready
+        seed = None
+        if self.no_guess:
+            from game.pool import get_pool
+            seed = get_pool(Board, profile).take()
+            if seed is None:
+                self.stdscr.clear()
+                self.stdscr.addstr(13, 10, "Dealing a no-guess board, proving it can be won without guessing...")
+                self.stdscr.refresh()
+        if self.practice:
+            from game.practiceBoard import PracticeBoard as Board
+        elif self.timed:
+            from game.timedBoard import TimedBoard as Board
+        import asyncio
+        from util import aio
+        await asyncio.wrap_future(self.words_ready)
+        board = await asyncio.wrap_future(aio.in_background(
+            Board, self.stdscr, self.current_user, seed=seed, profile=profile, no_guess=self.no_guess))
+        board.flood = self.flood
+        await board.play(self.keys)
+        if self.no_guess and profile.scaled:
+            from game.pool import stop_pools
+            if board.next_board is not None:
+                board.next_board.cancel()  # A deal not started yet would start the pool again
+            stop_pools(profile)
+        await self.refresh_user_menu()
+
+    async def start_daily(self):
+
+        # Starts the daily challenge (see game/dailyBoard.py): the board of today, the same for every player,
+        # generated by the first player of the day and read from its cache afterwards. It is a classic game of
+        # its own difficulty whatever the no-guess and timed settings.
+
+        from game.dailyBoard import DailyBoard
+        import asyncio
+        from util import aio
+        await asyncio.wrap_future(self.words_ready)
+        board = await asyncio.wrap_future(aio.in_background(DailyBoard.for_date, self.stdscr, self.current_user))
+        await board.play(self.keys)
+
+    async def resume_game(self):
+
+        # Resumes the game the current user left unfinished, from its snapshot (see util/snapshot.py). The
+        # snapshot is read on the I/O thread, after the writes still queued there, so it is the latest one.
+
+        import asyncio
+        from util import aio, snapshot
+        await asyncio.wrap_future(self.words_ready)
+        user_id = self.current_user.user_id
+        data = await asyncio.wrap_future(aio.run_io(snapshot.load_snapshot, user_id))
+        board = None
+        if data is not None:
+            try:
+                board = await asyncio.wrap_future(aio.in_background(snapshot.restore, data, self.stdscr,
+                                                                    self.current_user))
+            except ValueError:
+                aio.run_io(snapshot.remove_snapshot, user_id)  # Damaged, or from another version of the format
+        if board is not None:
+            await board.play(self.keys)
+        await self.refresh_user_menu()
+
+    async def refresh_user_menu(self):
+
+        # Puts "Resume game" at the top of the user menu while the current user has a game left unfinished,
+        # described by its snapshot. The snapshot is read on the I/O thread, after the writes queued there.
+
+        import asyncio
+        from util import aio, snapshot
+        data = await asyncio.wrap_future(aio.run_io(snapshot.load_snapshot, self.current_user.user_id))
+        description = snapshot.describe(data) if data is not None else None
+        items = [item for item in self.menus["user_menu"] if item != "Resume game"]
+        if description is not None:
+            items.insert(0, "Resume game")
+            self.descriptions["Resume game"] = f"* Go on with your game: {description}"
+        self.menus["user_menu"] = items
+
+    def toggle_no_guess(self):
+
+        # Switches no-guess boards on or off. Switching them on starts filling the board pools of the
+        # fixed-size difficulties in the background, while the player is still choosing one.
+
+        self.no_guess = not self.no_guess
+        label = "No-guess boards: On" if self.no_guess else "No-guess boards: Off"
+        self.menus["classic_mode"][self.current_row] = label
+        if self.no_guess:
+            from game.classicEasy import Board as EasyBoard
+            from game.classicHard import Board as HardBoard
+            from game.classicExpert import Board as ExpertBoard
+            from game.pool import get_pool
+            from game.profiles import get_profile
+            for board_class in (EasyBoard, HardBoard, ExpertBoard):
+                get_pool(board_class, get_profile(board_class.profile_name))
+
+    def toggle_timed(self):
+
+        # Switches the timed mode on or off: every difficulty is then played against the clock.
+
+        self.timed = not self.timed
+        label = "Timed mode: On" if self.timed else "Timed mode: Off"
+        self.menus["classic_mode"][self.current_row] = label
+
+    def toggle_practice(self):
+
+        # Switches the practice mode on or off: games can then be played back and forth, and are not recorded.
+        # It goes before the timed mode, as a clock makes no sense when moves can be taken back.
+
+        self.practice = not self.practice
+        label = "Practice mode: On" if self.practice else "Practice mode: Off"
+        self.menus["classic_mode"][self.current_row] = label
+
+    def toggle_flood(self):
+
+        # Switches the flood reveal on or off: revealing a cell with blank hints then reveals its blank region
+        # and the hints around it. The daily challenge is always played without it, so its ranking stays fair.
+
+        self.flood = not self.flood
+        label = "Flood reveal: On" if self.flood else "Flood reveal: Off"
+        self.menus["classic_mode"][self.current_row] = label
+
+    async def start_race(self, difficulty):
+
+        # Joins a race of the given difficulty on the race server (see util/race_server.py): the quick match of
+        # the difficulty, or the room set with set_race_room(). A player who creates a room also sets its number
+        # of players and, for the custom difficulty, its board size. The race is played on the menu's event loop.
+
+        from game.profiles import get_profile
+        from game.raceBoard import RaceBoard
+        from util.race_protocol import DEFAULT_HOST, DEFAULT_PORT
+        size = 0
+        profile = get_profile(difficulty)
+        if profile.scaled:
+            size = await self.prompt_board_size(profile)
+            if size is None:
+                return
+        host, port = self.race_server or (DEFAULT_HOST, DEFAULT_PORT)
+        import asyncio
+        await asyncio.wrap_future(self.words_ready)
+        board = await RaceBoard.join(self.stdscr, self.current_user, self.keys, host, port, self.race_room,
+                                     difficulty, self.race_players, size)
+        if board is not None:
+            await board.play(self.keys)
+
+    def cycle_race_players(self):
+
+        # Changes the number of players of the races this player creates: 2, 3, 4 and back to 2.
+
+        self.race_players = self.race_players + 1 if self.race_players < 4 else 2
+        self.menus["race"][self.current_row] = f"Players: {self.race_players}"
+
+    async def set_race_room(self):
+
+        # Asks for the room of the next race: players who type the same room race together, an empty room
+        # joins the quick match.
+
+        room = await self.prompt_text("Room to race in (Enter for the quick match, ESC to cancel): ", self.race_room)
+        if room is None:
+            return
+        self.race_room = room.strip()[:32]
+        self.menus["race"][self.current_row] = f"Room: {self.race_room}" if self.race_room else "Room: quick match"
+
+    async def set_race_server(self):
+
+        # Asks for the address of the race server, as host:port (empty for the one on this computer).
+
+        current = "" if self.race_server is None else f"{self.race_server[0]}:{self.race_server[1]}"
+        while True:
+            address = await self.prompt_text("Race server as host:port (Enter for this computer, ESC to cancel): ", current)
+            if address is None:
+                return
+            address = address.strip()
+            if not address:
+                self.race_server = None
+                break
+            host, _, port = address.rpartition(':')
+            if host and port.isdigit():
+                self.race_server = (host, int(port))
+                break
+            self.stdscr.addstr(14, 10, "Type the address as host:port, e.g. 192.168.1.20:8765. Press any key to re-enter it.")
+            await self.keys.get()
+            current = address
+        label = "Server: this computer" if self.race_server is None else f"Server: {address}"
+        self.menus["race"][self.current_row] = label
+
+    async def prompt_text(self, prompt, text=""):
+
+        # Asks the user for a line of text.
+        #
+        # Args:
+        #     prompt (str): The question, shown before the text.
+        #     text (str): The text the answer starts from.
+        #
+        # Returns:
+        #     str: The text entered, or None if the user pressed ESC.
+
+        while True:
+            self.stdscr.clear()
+            self.stdscr.addstr(13, 10, prompt + text)
+            self.stdscr.refresh()
+            key = await self.keys.get()
+            if key == 27:  # ESC key
+                return None
+            elif key in [10, 13]:  # Enter key
+                return text
+            elif key in BACKSPACE_KEYS:
+                text = text[:-1]
+            elif 32 <= key < 127:
+                text += chr(key)
+
+    async def prompt_board_size(self, profile):
+
+        # Asks the user for the board size of the custom difficulty, until a size the profile allows is entered.
+        #
+        # Args:
+        #     profile (DifficultyProfile): The custom profile, which holds the smallest and largest board size.
+        #
+        # Returns:
+        #     int: The board size, or None if the user pressed ESC.
 
-    def register(self):
+        prompt = f"Enter board size ({profile.min_size}-{profile.max_size}, press ESC to cancel): "
+        while True:
+            text = await self.prompt_text(prompt)
+            if text is None:
+                return None
+            if not text.isdigit() or not profile.min_size <= int(text) <= profile.max_size:
+                self.stdscr.addstr(14, 10, f"The size must be a number from {profile.min_size} to {profile.max_size}. Press any key to re-enter the size.")
+                await self.keys.get()
+                continue
+            return int(text)
+
+    def show_matching_users(self, user_id):
+
+        # Shows under the registration prompt whether the ID being typed is taken, or else the first
+        # existing IDs starting with it, looked up in the user index as the player types.
+
+        self.stdscr.move(15, 10)
+        self.stdscr.clrtoeol()
+        if not user_id:
+            return
+        if user_id in self.users:
+            self.stdscr.addstr(15, 10, "This user ID is taken.", curses.A_BOLD)
+            return
+        start, end = self.users.prefix_range(user_id)
+        if end > start:
+            shown = [self.users[index] for index in range(start, min(end, start + MATCHES_SHOWN))]
+            more = f" and {end - start - len(shown)} more" if end - start > len(shown) else ""
+            self.stdscr.addstr(15, 10, f"Existing players: {', '.join(shown)}{more}", curses.A_DIM)
+
+    async def register(self):
 
         # Opens a registration prompt to the user. The user can enter a username,
         # and the function will validate the username and register the user if
         # the username is valid. The function will continue to prompt the user
-        # until a valid username is entered.
+        # until a valid username is entered. While the username is typed, the
+        # existing usernames starting with it are shown (see show_matching_users()).
         # 
         # return: None
 
+        await self.load_users()
         while True:
             self.stdscr.clear()
             self.stdscr.addstr(13, 10, "Enter user ID (Press ESC to cancel): ")
             curses.echo()
             user_id = ""
             while True:
-                key = self.stdscr.getch()
+                key = await self.keys.get()
                 if key == 27:  # ESC key
                     self.current_menu = "main"
                     self.current_row = 0
                     return
                 elif key in [10, 13]:  # Enter key
                     break
-                else:
+                elif key in BACKSPACE_KEYS:
+                    user_id = user_id[:-1]
+                elif 32 <= key < 127:
                     user_id += chr(key)
-                    self.stdscr.addstr(13, 10 + len("Enter user ID (Press ESC to cancel): "), user_id)
-                    self.stdscr.refresh()
+                else:
+                    continue
+                self.stdscr.move(13, 10 + len("Enter user ID (Press ESC to cancel): "))
+                self.stdscr.clrtoeol()
+                self.stdscr.addstr(13, 10 + len("Enter user ID (Press ESC to cancel): "), user_id)
+                self.show_matching_users(user_id)
+                self.stdscr.refresh()
             curses.noecho()
 
             # Validate username
             if len(user_id) > 16:
                 self.stdscr.addstr(14, 10, "Username cannot be longer than 16 characters. Press any key to re-enter username.")
-                self.stdscr.getch()
+                await self.keys.get()
                 continue
             if not re.match(r'^[A-Za-z0-9 _-]+$', user_id):
                 self.stdscr.addstr(14, 10, "Username can only contain letters, numbers, spaces, underscores, and hyphens. Press any key to re-enter username.")
-                self.stdscr.getch()
+                await self.keys.get()
                 continue
             if user_id[0] == ' ' or user_id[-1] == ' ':
                 self.stdscr.addstr(14, 10, "Username cannot start or end with a space. Press any key to re-enter username.")
-                self.stdscr.getch()
+                await self.keys.get()
                 continue
             if not re.match(r'^[A-Za-z0-9 _-]+$', user_id):
                 self.stdscr.addstr(14, 10, "Username can only contain letters, numbers, spaces, underscores, and hyphens. Press any key to re-enter username.")
-                self.stdscr.getch()
+                await self.keys.get()
                 continue
 
-            if User.load_from_file(user_id):
+            if user_id in self.users:
                 self.stdscr.addstr(14, 10, "User ID already exists. Press any key to re-enter username.")
-                self.stdscr.getch()
+                await self.keys.get()
                 continue
             else:
+                from util import aio
                 user = User(user_id)
-                user.save_to_file()
-                self.users.append(user)
+                aio.run_io(user.save_to_file)
+                self.users.add(user_id)
                 self.stdscr.addstr(14, 10, "Registration successful. Press any key to continue.")
-                self.stdscr.getch()
+                await self.keys.get()
                 break
         self.current_menu = "main"
         self.current_row = 0
 
-    def view_statistics(self):
+    async def view_statistics(self):
 
         # Shows the statistics of all users and allows the user to select a user to view their statistics.
         # 
         # :return: None
 
-        stats = UserStatistics(self.stdscr)
-        stats.display()
+        from util.user_statistics import UserStatistics
+        stats = UserStatistics(self.stdscr, self.keys)
+        await stats.display()
         self.current_menu = "main"
         self.current_row = 0
 
+    async def view_leaderboard(self):
+
+        # Shows the best players of every difficulty, then comes back to the current menu. The rankings are
+        # read on the I/O thread (see Leaderboard.display()).
+
+        from util.leaderboard import Leaderboard
+        user_id = self.current_user.user_id if self.current_user is not None else None
+        await Leaderboard(self.stdscr, user_id).display(self.keys)
+        self.stdscr.clear()
+
+    async def watch_replays(self):
+
+        # Lists the recorded games of the current user and plays the chosen one back,
+        # until the user leaves the list with ESC. The replays are read on the I/O thread, after the games
+        # still being saved there.
+
+        import asyncio
+        from util.replay import ReplayViewer, choose_replay, load_replays
+        from util import aio
+        replays = await asyncio.wrap_future(aio.run_io(load_replays, self.current_user.user_id))
+        while True:
+            replay = await choose_replay(self.stdscr, self.keys, replays)
+            if replay is None:
+                break
+            await ReplayViewer(self.stdscr, replay).run(self.keys)
+        self.stdscr.clear()
+
     def run(self):
 
-        # Runs the main loop of the menu interface.
-        # This method initializes the curses settings, handles user input, and updates the menu display accordingly.
-        # It supports navigation through the menu using arrow keys, mouse clicks, and the Enter key to select options.
-        # The ESC key is used to navigate back to the main menu or exit the application.
+        # Runs the menu interface.
+        # This method initializes the curses settings and draws the first frame, then imports asyncio and runs
+        # main_loop() on its event loop until the game is left.
         # The method performs the following actions:
         # - Disables the cursor.
         # - Initializes color pairs for the menu display.
         # - Sets up mouse event handling.
-        # - Continuously checks for user input and updates the menu state.
+        # - Draws the first frame.
+        # When startup_probe is set, it returns right after the first frame has been drawn.
+        # Returns:
+        #     None
+
+        curses.curs_set(0)
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_BLACK, curses.COLOR_WHITE)
+        curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
+        h, w = self.stdscr.getmaxyx()
+        if h >= MIN_WINDOW_HEIGHT and w >= MIN_WINDOW_WIDTH:
+            self.print_menu(self.menus[self.current_menu])  # Otherwise main_loop() asks for a larger window
+        if self.startup_probe:
+            self.first_frame_time = time.perf_counter()
+            return
+        import asyncio
+        asyncio.run(self.main_loop())
+
+    async def main_loop(self):
+
+        # The main loop of the menu interface, as a coroutine.
+        # It handles user input, read as an async stream of keys, and updates the menu display accordingly.
+        # It supports navigation through the menu using arrow keys, mouse clicks, and the Enter key to select options.
+        # The ESC key is used to navigate back to the main menu or exit the application.
+        # The word list is loaded in the background meanwhile (see game/words.py).
         # Key bindings:
         # - Up arrow: Move the selection up.
         # - Down arrow: Move the selection down.
@@ -340,30 +784,33 @@ class Menu:
         # Returns:
         #     None
 
-        curses.curs_set(0)
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_BLACK, curses.COLOR_WHITE)
-        curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
+        from game.words import prepare_word_list
+        from util import aio
+        self.words_ready = aio.in_background(prepare_word_list)
+        self.keys = aio.KeyStream(self.stdscr)
         while True:
-            if not self.check_window_size():
+            if not await self.check_window_size():
                 continue
             self.print_menu(self.menus[self.current_menu])
-            key = self.stdscr.getch()
+            key = await self.keys.get()
             if key == curses.KEY_UP and self.current_row > 0:
                 self.current_row -= 1
             elif key == curses.KEY_DOWN and self.current_row < len(self.menus[self.current_menu]) - 1:
                 self.current_row += 1
             elif key == curses.KEY_ENTER or key in [10, 13]:
-                self.handle_enter()
+                await self.handle_enter()
             elif key == 27:  # ESC key
                 if self.current_menu == "main":
-                    exit()
+                    self.exit_game()
                 elif self.current_menu == "start_game" or self.current_menu == "register":
                     self.current_menu = "main"
                     self.current_row = 0
                 elif self.current_menu == "user_menu":
                     self.current_menu = "main"
                     self.current_row = 0
+                elif self.current_menu == "race":
+                    self.current_menu = "user_menu"
+                    self.current_row = self.menus["user_menu"].index("Race")
             elif key == curses.KEY_MOUSE:
                 _, mx, my, _, _ = curses.getmouse()
                 h, w = self.stdscr.getmaxyx()
@@ -375,8 +822,16 @@ class Menu:
                     y = menu_start_y + idx
                     if y == my:
                         self.current_row = idx
-                        self.handle_enter()
+                        await self.handle_enter()
                         break
 
+    def exit_game(self):
+
+        # Waits for the games still being saved in the background, then exits.
+
+        from util import aio
+        aio.flush()
+        exit()
+
 if __name__ == "__main__":
     curses.wrapper(Menu)
\ No newline at end of file
@@ -0,0 +1,118 @@
+# The asyncio side of the curses front end.
+#
+# The menu and the game loop (Menu.main_loop(), Board.play()) run as coroutines on one asyncio event loop and
+# read the keyboard as an async stream (KeyStream): instead of blocking in getch(), they await the next key, so
+# the loop wakes on whichever comes first, a key or a deadline (the clock of the timed mode, the heatmap refinement).
+#
+# Slow work never runs on the loop's thread:
+#     run_io(func, *args)           Queues a write (statistics, replays, the leaderboard) on the I/O thread, which
+#                                   runs the writes one at a time in the order they were queued, so an older save
+#                                   of a user never lands after a newer one.
+#     in_background(func, *args)    Runs other slow work (building boards, loading the word list) on the worker
+#                                   thread.
+# Both return a concurrent.futures.Future, which coroutines await with asyncio.wrap_future(). Screens that read what
+# the writes write read it through run_io() as well, so the read runs after the writes queued before it, off the
+# loop's thread. flush() waits for every queued write, and raises the error of a write that failed; the menu calls
+# it before exiting.
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordweeper-io")
+_worker_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordweeper-worker")
+_pending = []  # Queued writes not checked by flush() yet
+
+
+def run_io(func, *args):
+
+    # Queues a write on the I/O thread.
+    #
+    # Returns:
+    #     concurrent.futures.Future: The result of func(*args).
+
+    _pending[:] = [future for future in _pending if not future.done() or future.exception() is not None]
+    future = _io_executor.submit(func, *args)
+    _pending.append(future)
+    return future
+
+
+def in_background(func, *args, **kwargs):
+
+    # Runs slow work on the worker thread.
+    #
+    # Returns:
+    #     concurrent.futures.Future: The result of func(*args, **kwargs).
+
+    return _worker_executor.submit(func, *args, **kwargs)
+
+
+def flush():
+
+    # Waits until every queued write has run.
+    #
+    # Raises:
+    #     Exception: The error of a write that failed, once.
+
+    while _pending:
+        _pending.pop(0).result()
+
+
+class KeyStream:
+
+    # The keys of a curses screen as an async stream.
+    # The event loop watches the terminal's input and wakes the coroutine waiting for a key when there is some,
+    # so nothing polls. Keys already read by curses (the rest of an escape sequence, a paste) are taken first.
+    # Attributes:
+    # -----------
+    # stdscr : curses.window
+    #     The screen the keys are read from.
+    # fd : int
+    #     The terminal's input.
+    # ready : asyncio.Event
+    #     Set by the event loop when the terminal has input.
+    #
+    # Methods:
+    # --------
+    # get(timeout):
+    #     Waits for the next key.
+    # close():
+    #     Stops watching the terminal.
+
+    def __init__(self, stdscr, fd=None):
+        self.stdscr = stdscr
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self.ready = asyncio.Event()
+        asyncio.get_running_loop().add_reader(self.fd, self.ready.set)
+
+    async def get(self, timeout=None):
+
+        # Waits for the next key.
+        #
+        # Args:
+        #     timeout (float, optional): Seconds to wait at most (default: until a key is pressed).
+        #
+        # Returns:
+        #     int: The key code, or -1 if no key was pressed in time.
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        self.stdscr.timeout(0)
+        try:
+            while True:
+                self.ready.clear()
+                key = self.stdscr.getch()
+                if key != -1:
+                    return key
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return -1
+                try:
+                    await asyncio.wait_for(self.ready.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return -1
+        finally:
+            self.stdscr.timeout(-1)  # Screens that read their keys themselves wait for them
+
+    def close(self):
+        asyncio.get_running_loop().remove_reader(self.fd)
@@ -0,0 +1,228 @@
+# Loopback load test of the HTTP/JSON game API (util/http_api.py).
+#
+# Run it from the project root:
+#
+#     python -m util.api_load [--clients N] [--seconds S] [--difficulty NAME] [--server HOST:PORT] [--output PATH]
+#
+# Starts the API on a free loopback port in a process of its own (or uses the one given with --server), then
+# runs N bot clients at once for S seconds. Each keeps one keep-alive connection and sends its next request as
+# soon as the last one is answered, as a bot farm would: it deals a board, reveals its cells in a random order
+# until the game is over, fetching the state of the game every few moves, then ends the game and deals the next.
+#
+# The report gives the requests per second, the latency of every request as the client sees it, the response
+# codes, the CPU time the server took per request, and the server's own latency metrics (GET /metrics).
+# --output writes the report as JSON.
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import time
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.benchmark import prepare_data_dir
+from util.race_load import start_server, stop_server
+from util.tournament import percentile
+
+DEFAULT_CLIENTS = 50
+DEFAULT_SECONDS = 10
+STATE_EVERY = 10  # Moves between two state requests of a client
+
+
+class Client:
+
+    # A bot client of the API, on one keep-alive connection.
+    # Attributes:
+    # -----------
+    # latencies : list of float
+    #     Seconds from sending each request to reading its response.
+    # statuses : dict
+    #     HTTP status -> number of responses.
+    # games : int
+    #     Games played to the end.
+    # error : str
+    #     What stopped the client, if anything did.
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.games = 0
+        self.error = None
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+
+        # Sends a request and reads its response.
+        #
+        # Returns:
+        #     tuple: The HTTP status and the decoded JSON body (None if there is none).
+
+        data = b"" if body is None else json.dumps(body).encode()
+        start = time.perf_counter()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: loopback\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode('latin-1').split("\r\n")
+        status = int(lines[0].split(' ')[1])
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = await self.reader.readexactly(length) if length else b""
+        self.latencies.append(time.perf_counter() - start)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        return status, json.loads(payload) if payload else None
+
+    async def play(self, host, port, difficulty, deadline):
+
+        # Plays games until the deadline.
+
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        rng = random.Random()
+        try:
+            while time.perf_counter() < deadline:
+                status, game = await self.request("POST", "/games", {"difficulty": difficulty})
+                if status != 201:
+                    self.error = f"POST /games answered {status}"
+                    return
+                game_id = game["id"]
+                size = game["size"]
+                cells = list(range(size * size))
+                rng.shuffle(cells)
+                for move, index in enumerate(cells, 1):
+                    if time.perf_counter() >= deadline:
+                        break
+                    status, result = await self.request("POST", f"/games/{game_id}/reveal",
+                                                        {"row": index // size, "col": index % size})
+                    if status != 200:
+                        self.error = f"POST /games/<id>/reveal answered {status}"
+                        return
+                    if move % STATE_EVERY == 0:
+                        await self.request("GET", f"/games/{game_id}")
+                    if result["status"] != "playing":
+                        self.games += 1
+                        break
+                await self.request("DELETE", f"/games/{game_id}")
+        finally:
+            self.writer.close()
+
+
+async def run_load(host, port, clients, seconds, difficulty):
+
+    # Runs the clients against a running server.
+    #
+    # Returns:
+    #     tuple: The clients, the seconds it took and the server's metrics at the end.
+
+    bots = [Client() for _ in range(clients)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bot.play(host, port, difficulty, start + seconds) for bot in bots),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    for bot, result in zip(bots, results):
+        if isinstance(result, Exception) and bot.error is None:
+            bot.error = repr(result)
+    probe = Client()
+    probe.reader, probe.writer = await asyncio.open_connection(host, port)
+    _, metrics = await probe.request("GET", "/metrics")
+    probe.writer.close()
+    return bots, elapsed, metrics
+
+
+def summarize(bots, elapsed, server_cpu, metrics):
+    latencies = sorted(latency for bot in bots for latency in bot.latencies)
+    requests = len(latencies)
+    statuses = {}
+    for bot in bots:
+        for status, count in bot.statuses.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    return {
+        "clients": len(bots),
+        "seconds": elapsed,
+        "requests": requests,
+        "requests_per_second": requests / elapsed if elapsed else 0.0,
+        "games": sum(bot.games for bot in bots),
+        "responses": dict(sorted(statuses.items())),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5) * 1000 if latencies else None,
+            "p95": percentile(latencies, 0.95) * 1000 if latencies else None,
+            "p99": percentile(latencies, 0.99) * 1000 if latencies else None,
+            "max": latencies[-1] * 1000 if latencies else None,
+        },
+        "errors": sorted({bot.error for bot in bots if bot.error is not None}),
+        "server_cpu_seconds": server_cpu,
+        "server_metrics": metrics,
+    }
+
+
+def print_report(summary):
+    latency = summary["latency_ms"]
+    print(f"{summary['clients']} clients for {summary['seconds']:.1f} s: {summary['requests']} requests, "
+          f"{summary['requests_per_second']:.0f} per second, {summary['games']} games played to the end")
+    if latency["p50"] is not None:
+        print(f"Latency: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+              f"p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms")
+    print("Responses: " + ", ".join(f"{status}: {count}" for status, count in summary["responses"].items()))
+    if summary["server_cpu_seconds"] is not None:
+        per_request = summary["server_cpu_seconds"] / summary["requests"] * 1e6 if summary["requests"] else 0
+        print(f"Server CPU: {summary['server_cpu_seconds']:.2f} s ({per_request:.0f} us per request)")
+    for route, stats in summary["server_metrics"]["latency_ms"].items():
+        print(f"  {route:<26}{stats['count']:>8} requests, server p50 {stats['p50']:.3f} ms, "
+              f"p99 {stats['p99']:.3f} ms")
+    for error in summary["errors"]:
+        print(f"Error: {error}")
+
+
+def main(argv):
+    clients = DEFAULT_CLIENTS
+    seconds = DEFAULT_SECONDS
+    difficulty = "Easy"
+    server = None
+    output_path = None
+    if "--clients" in argv:
+        clients = int(argv[argv.index("--clients") + 1])
+    if "--seconds" in argv:
+        seconds = float(argv[argv.index("--seconds") + 1])
+    if "--difficulty" in argv:
+        difficulty = argv[argv.index("--difficulty") + 1]
+    if "--server" in argv:
+        host, port = argv[argv.index("--server") + 1].rsplit(':', 1)
+        server = (host, int(port))
+    if "--output" in argv:
+        output_path = os.path.abspath(argv[argv.index("--output") + 1])
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    original_dir = os.getcwd()
+    workdir = prepare_data_dir(os.path.join(project_dir, "data"))
+    process = None
+    server_cpu = None
+    try:
+        if server is None:
+            process, server = start_server("http_api.py")
+        bots, elapsed, metrics = asyncio.run(run_load(server[0], server[1], clients, seconds, difficulty))
+        if process is not None:
+            output, server_cpu = stop_server(process)
+            process = None
+            print(output)
+    finally:
+        if process is not None:
+            process.kill()
+        os.chdir(original_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = summarize(bots, elapsed, server_cpu, metrics)
+    print_report(summary)
+    if output_path:
+        with open(output_path, 'w') as file:
+            json.dump(summary, file, indent=2)
+        print(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,278 @@
+# Benchmark suite for board generation, scoring and the user store.
+#
+# Run it from the project root:
+#
+#     python -m util.benchmark [--output PATH] [--compare OLD_PATH] [--quick]
+#
+# Every benchmark is called repeatedly until it has run for a minimum time (or a maximum number of rounds),
+# and the min / max / mean / median / stddev of the rounds are reported, the same way pytest-benchmark does.
+# The results are written as JSON (default ./benchmark.json) so runs of different versions can be compared
+# with --compare, which prints how much slower or faster each benchmark got.
+#
+# The benchmarks run inside a temporary copy of the data directory, so the real words and users are never touched.
+#
+# Benchmarks:
+#     fill_board          Board generation per difficulty, at the difficulty's own size and at scaled sizes
+#                         (the Custom difficulty also scales its words and mines).
+#     hints               The mine hint and letter hint passes over a generated board.
+#     check_revealed      check_revealed_words() on a board with half of its cells revealed.
+#     click_sequence      A seeded game played through reveal_cell() on a board without a screen.
+#     solver              solve() on freshly generated boards of each difficulty.
+#     user_store          Indexing the user IDs, checking if an ID is taken, loading and saving one user's stats
+#                         and migrating a version 1 user file, at 10, 1k and 100k users.
+
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.classicEasy import Board as EasyBoard
+from game.classicHard import Board as HardBoard
+from game.classicExpert import Board as ExpertBoard
+from game.classicCustom import Board as CustomBoard
+from game.solver import solve
+from util import diffcalc, user_store
+from util.user import User
+from util.user_index import UserIndex
+
+DIFFICULTIES = [("Easy", EasyBoard, 7), ("Hard", HardBoard, 10), ("Expert", ExpertBoard, 12), ("Custom", CustomBoard, 20)]
+SCALED_SIZES = [7, 10, 12, 25, 50, 100]
+USER_COUNTS = [10, 1000, 100000]
+
+MIN_TIME = 0.2      # Seconds each benchmark runs for at least...
+MIN_ROUNDS = 3      # ...with at least this many rounds...
+MAX_ROUNDS = 1000   # ...and at most this many.
+
+
+def run_benchmark(func, setup=None, min_time=MIN_TIME):
+
+    # Calls func repeatedly and returns the statistics of the measured rounds.
+    #
+    # Args:
+    #     func (callable): The benchmarked code. Receives the value returned by setup, if there is a setup.
+    #     setup (callable, optional): Called before every round, its time is not measured.
+    #     min_time (float): Minimum total time of the measured rounds.
+    #
+    # Returns:
+    #     dict: min, max, mean, median, stddev (seconds), rounds and ops (rounds per second).
+
+    timings = []
+    total = 0.0
+    while len(timings) < MAX_ROUNDS and (len(timings) < MIN_ROUNDS or total < min_time):
+        if setup is not None:
+            argument = setup()
+            start = time.perf_counter()
+            func(argument)
+        else:
+            start = time.perf_counter()
+            func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+    mean = total / len(timings)
+    return {
+        "min": min(timings),
+        "max": max(timings),
+        "mean": mean,
+        "median": statistics.median(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": len(timings),
+        "ops": 1 / mean if mean > 0 else math.inf,
+    }
+
+
+def prepare_data_dir(source_data_dir):
+
+    # Copies the words and difficulty profile files into a temporary working directory and switches to it.
+    # The game code reads './data/...' relative to the working directory.
+    #
+    # Returns:
+    #     str: The temporary directory, to be removed by the caller.
+
+    workdir = tempfile.mkdtemp(prefix="wordweeper-bench-")
+    os.makedirs(os.path.join(workdir, "data"))
+    for name in ("words.txt", "difficulties.ini"):
+        shutil.copy(os.path.join(source_data_dir, name), os.path.join(workdir, "data", name))
+    os.chdir(workdir)
+    diffcalc.update_words_file()  # Make sure every word has a complexity, as the menu does before a game
+    return workdir
+
+
+def write_users(count):
+
+    # Writes a user file with the given number of users and returns the ID of the last one.
+
+    with open(user_store.STATS_PATH, 'w') as file:
+        file.write(user_store.HEADER + '\n')
+        for i in range(count):
+            stats = user_store.new_stats()
+            stats.update(games_played=i % 50, games_won=i % 20, words_revealed=i % 70, longest_word_revealed="WORD",
+                         mines_stepped=i % 9, highest_score_classic=i * 37 % 90000)
+            stats['difficulties']["Easy"] = dict(user_store.new_difficulty_stats(), games=i % 50, wins=i % 20,
+                                                 best_score=i * 37 % 90000)
+            file.write(user_store.format_record(f"user{i}", stats))
+    return f"user{count - 1}"
+
+
+def write_v1_users(count):
+
+    # Writes a version 1 user file (see util/user_store.py) with the given number of users.
+
+    with open(user_store.STATS_PATH, 'w') as file:
+        for i in range(count):
+            file.write(f"user{i},{i % 50},{i % 20},{i % 70},WORD,{i % 9},{i * 37 % 90000},0,inf,0,0\n")
+
+
+def reveal_half(board, rng):
+
+    # Uncovers a random half of the cells of a board without applying any game rule.
+
+    cell_count = board.size * board.size
+    for index in rng.sample(range(cell_count), cell_count // 2):
+        board.grid.reveal(index)
+
+
+def play_click_sequence(board_class, size, seed):
+
+    # Plays a game on a board without a screen: cells are revealed in a seeded random order
+    # until all words are found or three mines are stepped on.
+    #
+    # Returns:
+    #     int: The final score.
+
+    board = board_class(None, None, size=size, seed=seed)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    random.Random(seed).shuffle(cells)
+    for row, col in cells:
+        board.reveal_cell(row, col)
+        if board.check_all_words_revealed() or board.check_if_mine_stepped_lost():
+            break
+    return board.score
+
+
+def collect(quick=False):
+
+    # Runs every benchmark and returns the list of results.
+    #
+    # Args:
+    #     quick (bool): Skip the largest board size and user count.
+
+    results = []
+
+    def add(group, name, params, stats):
+        results.append({"group": group, "name": name, "params": params, "stats": stats})
+        print(f"{name:<50} mean {stats['mean'] * 1000:10.3f} ms  min {stats['min'] * 1000:10.3f} ms  rounds {stats['rounds']}")
+
+    sizes = SCALED_SIZES[:-1] if quick else SCALED_SIZES
+    user_counts = USER_COUNTS[:-1] if quick else USER_COUNTS
+
+    for difficulty, board_class, default_size in DIFFICULTIES:
+        board = board_class(None, None, size=default_size, seed=0)
+        add("fill_board", f"fill_board[{difficulty}]", {"difficulty": difficulty, "size": default_size},
+            run_benchmark(board.fill_board))
+
+    for difficulty, board_class, _ in DIFFICULTIES:
+        for size in sizes:
+            board = board_class(None, None, size=size, seed=size)
+            add("fill_board", f"fill_board[{difficulty}-{size}]", {"difficulty": difficulty, "size": size},
+                run_benchmark(board.fill_board))
+
+    for size in sizes:
+        board = ExpertBoard(None, None, size=size, seed=size)
+        word_letters = ''.join(board.selected_words)
+        add("hints", f"mine_hints[{size}]", {"size": size}, run_benchmark(board.grid.calculate_mine_masks))
+        add("hints", f"letter_hints[{size}]", {"size": size},
+            run_benchmark(lambda: board.grid.calculate_letter_counts(word_letters)))
+
+        reveal_half(board, random.Random(size))
+        add("check_revealed", f"check_revealed_words[{size}]", {"size": size}, run_benchmark(board.check_revealed_words))
+
+    for difficulty, board_class, default_size in DIFFICULTIES:
+        seeds = iter(range(1_000_000))
+        add("click_sequence", f"click_sequence[{difficulty}]", {"difficulty": difficulty, "size": default_size},
+            run_benchmark(lambda seed: play_click_sequence(board_class, default_size, seed), setup=lambda: next(seeds)))
+
+    for difficulty, board_class, default_size in DIFFICULTIES:
+        boards = itertools.cycle([board_class(None, None, size=default_size, seed=seed) for seed in range(50)])
+        add("solver", f"solve[{difficulty}]", {"difficulty": difficulty, "size": default_size},
+            run_benchmark(solve, setup=lambda: next(boards)))
+
+    for count in user_counts:
+        last_user_id = write_users(count)
+        add("user_store", f"index_users[{count}]", {"users": count}, run_benchmark(lambda: len(UserIndex())))
+        index = UserIndex()
+        add("user_store", f"id_taken[{count}]", {"users": count}, run_benchmark(lambda: f"USER{count // 2}" in index))
+        add("user_store", f"load_from_file[{count}]", {"users": count},
+            run_benchmark(lambda: User.load_from_file(last_user_id)))
+        board = EasyBoard(None, User(last_user_id), seed=0)
+        add("user_store", f"save_user_stats[{count}]", {"users": count}, run_benchmark(board.save_user_stats))
+        add("user_store", f"migrate[{count}]", {"users": count},
+            run_benchmark(lambda _: user_store.migrate(), setup=lambda: write_v1_users(count)))
+
+    return results
+
+
+def compare(results, old_path):
+
+    # Prints how the mean time of every benchmark changed against an earlier result file.
+
+    with open(old_path, 'r') as file:
+        old = {entry["name"]: entry["stats"] for entry in json.load(file)["benchmarks"]}
+    print(f"\nCompared with {old_path}:")
+    for entry in results:
+        if entry["name"] not in old:
+            continue
+        ratio = entry["stats"]["mean"] / old[entry["name"]]["mean"]
+        marker = "  SLOWER" if ratio > 1.1 else "  faster" if ratio < 0.9 else ""
+        print(f"{entry['name']:<50} {ratio:6.2f}x{marker}")
+
+
+def main(argv):
+    output_path = os.path.abspath("./benchmark.json")
+    compare_path = None
+    quick = "--quick" in argv
+    if "--output" in argv:
+        output_path = os.path.abspath(argv[argv.index("--output") + 1])
+    if "--compare" in argv:
+        compare_path = os.path.abspath(argv[argv.index("--compare") + 1])
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    original_dir = os.getcwd()
+    workdir = prepare_data_dir(os.path.join(project_dir, "data"))
+    try:
+        results = collect(quick)
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "machine_info": {
+            "python_version": platform.python_version(),
+            "python_implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "datetime": datetime.now().isoformat(),
+        "benchmarks": results,
+    }
+    with open(output_path, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {output_path}")
+
+    if compare_path:
+        compare(results, compare_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,3 +1,5 @@
+import os
+
 def calculate_complexity(word):
 
     # Calculate the complexity of a given word.
@@ -22,13 +24,16 @@ def update_words_file():
     # 1. Reads the words and their complexity levels from './data/words.txt'.
     # 2. If a word does not have a complexity level, it calculates the complexity using the 
     #    `calculate_complexity` function.
-    # 3. Writes the updated words and their complexity levels back to './data/words.txt'.
-    # 4. Prints a message indicating whether any words were updated with new complexity levels.
+    # 3. If any word was missing its complexity, writes the updated words and their complexity levels back to
+    #    './data/words.txt', through a temporary file so readers never see it half written.
     #
     # Note:
     # - The file './data/words.txt' should contain words and their complexity levels separated by commas.
     # - If a word does not have a complexity level, it should be followed by a comma with no value after it.
     #
+    # Returns:
+    #     bool: True if complexity levels were added.
+    #
     # Raises:
     # - IOError: If there is an issue reading from or writing to the file.
 
@@ -43,18 +48,19 @@ def update_words_file():
                 complexity = None
             words.append((word, complexity))
 
-    updated = False
-    with open('./data/words.txt', 'w') as file:
+    if all(complexity is not None for _, complexity in words):
+        return False
+    temp_path = f'./data/words.txt.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as file:
         for word, complexity in words:
             if complexity is None:
                 complexity = calculate_complexity(word)
-                updated = True
             file.write(f'{word},{complexity}\n')
+    os.replace(temp_path, './data/words.txt')
+    return True
 
-    if updated:
+if __name__ == "__main__":
+    if update_words_file():
         print("Words file updated with complexity levels.")
     else:
-        print("All words already have complexity levels.")
-
-if __name__ == "__main__":
-    update_words_file()
\ No newline at end of file
+        print("All words already have complexity levels.")
\ No newline at end of file
@@ -0,0 +1,485 @@
+# Headless HTTP/JSON API of the classic mode, for web front ends and bot farms.
+#
+# Run it from the project root:
+#
+#     python -m util.http_api [--host HOST] [--port PORT] [--sessions N] [--ttl SECONDS]
+#
+# Endpoints (request and response bodies are JSON):
+#
+#     POST   /games                {"difficulty": "Easy", "size": 12, "seed": 42, "no_guess": false}
+#                                  Deals a new board (every field is optional) -> 201, the state of the game.
+#     GET    /games/<id>           The state of a game: what a player sees of the board, the words and the score.
+#     POST   /games/<id>/reveal    {"row": 3, "col": 4}  Reveals a cell -> the cell and the score after the move.
+#     POST   /games/<id>/flag      {"row": 3, "col": 4}  Cycles the mark of a covered cell (flag, question mark,
+#                                  none), as Ctrl + click does.
+#     DELETE /games/<id>           Ends a game.
+#     GET    /metrics              Requests, response codes, sessions and the latency of every endpoint.
+#
+# Errors are answered with their HTTP status and {"error": "..."}. Moves go through the same code as the mouse
+# clicks of the game (util.replay.apply_event()), so the score follows the usual rules. Games played through
+# the API are not recorded in the statistics of any user.
+#
+# The server is one asyncio event loop with keep-alive connections, so a bot sends request after request on one
+# connection. Games are kept in memory (see util/session_store.py): the least recently used one is dropped when
+# the store is full, and games idle for longer than the time to live are dropped as well. Boards are dealt on the
+# background worker thread (see util/aio.py), as a no-guess or a large board would stall every connection. The
+# latency of every request, from its last byte read to its response written, is kept per endpoint in a
+# power-of-two histogram (util.profiler.Histogram), so the metrics cost O(1) memory.
+
+import asyncio
+import json
+import os
+import re
+import secrets
+import sys
+import time
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.classicBoard import Board
+from game.grid import COVERED, FLAGGED, QUESTIONED, MINE, EMPTY
+from game.profiles import get_profile
+from game.words import prepare_word_list
+from util import aio
+from util.profiler import Histogram
+from util.replay import REVEAL, MARK, apply_event
+from util.session_store import SessionStore, DEFAULT_CAPACITY, DEFAULT_TTL
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_HEADER = 16 * 1024  # Bytes of request line and headers accepted
+MAX_BODY = 4096  # Bytes of request body accepted
+EXPIRE_INTERVAL = 10  # Seconds between two sweeps of the expired games
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 501: "Not Implemented",
+}
+
+# (method, path pattern, handler, route name in the metrics)
+ROUTES = [
+    ("POST", re.compile(r"/games"), "new_game", "POST /games"),
+    ("GET", re.compile(r"/games/([\w-]+)"), "get_game", "GET /games/<id>"),
+    ("POST", re.compile(r"/games/([\w-]+)/reveal"), "reveal", "POST /games/<id>/reveal"),
+    ("POST", re.compile(r"/games/([\w-]+)/flag"), "flag", "POST /games/<id>/flag"),
+    ("DELETE", re.compile(r"/games/([\w-]+)"), "delete_game", "DELETE /games/<id>"),
+    ("GET", re.compile(r"/metrics"), "metrics", "GET /metrics"),
+]
+
+CORS_HEADERS = ("Access-Control-Allow-Origin: *\r\n"
+                "Access-Control-Allow-Methods: GET, POST, DELETE, OPTIONS\r\n"
+                "Access-Control-Allow-Headers: Content-Type\r\n")
+
+
+class HTTPError(Exception):
+
+    # An error answered with an HTTP status and {"error": message}.
+
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+        self.message = message
+
+
+class Game:
+
+    # A game of the API.
+    # Attributes:
+    # -----------
+    # board : Board
+    #     The board, without a screen or a user.
+    # seed_given : bool
+    #     Whether the client chose the seed, which the state then shows (the seed is the whole board).
+
+    __slots__ = ("board", "seed_given")
+
+    def __init__(self, board, seed_given):
+        self.board = board
+        self.seed_given = seed_given
+
+
+def game_status(board):
+    if board.game_won and not board.game_lose:
+        return "won"
+    if board.game_lose:
+        return "lost"
+    return "playing"
+
+
+def cell_view(board, index):
+
+    # Gets what a player sees of a cell: its mark while it is covered, its content and hints once revealed.
+
+    state = board.grid.cells[index]
+    row, col = divmod(index, board.size)
+    if state & COVERED:
+        mark = "flagged" if state & FLAGGED else "questioned" if state & QUESTIONED else "covered"
+        return {"row": row, "col": col, "state": mark}
+    letter = board.grid.letters[index]
+    return {
+        "row": row,
+        "col": col,
+        "state": "revealed",
+        "mine": bool(state & MINE),
+        "letter": chr(letter) if letter != EMPTY and not state & MINE else None,
+        "letter_hint": board.grid.letter_counts[index],
+        "mine_mask": board.grid.mine_masks[index],
+    }
+
+
+def board_rows(board):
+
+    # Gets what a player sees of the whole board, one string per row: '#' covered, 'F' flagged, '?' questioned,
+    # '*' a mine stepped on, a letter, or the letter hint digit of an empty cell. The mine hints of the revealed
+    # cells come as direction bit masks (see game/grid.py), None for covered cells.
+    #
+    # Returns:
+    #     tuple: The row strings and the rows of mine masks.
+
+    size = board.size
+    grid = board.grid
+    cells, letters, counts, masks = grid.cells, grid.letters, grid.letter_counts, grid.mine_masks
+    rows = []
+    mask_rows = []
+    for row in range(size):
+        chars = []
+        row_masks = []
+        for index in range(row * size, row * size + size):
+            state = cells[index]
+            if state & COVERED:
+                chars.append('F' if state & FLAGGED else '?' if state & QUESTIONED else '#')
+                row_masks.append(None)
+                continue
+            if state & MINE:
+                chars.append('*')
+            elif letters[index] != EMPTY:
+                chars.append(chr(letters[index]))
+            else:
+                chars.append(str(counts[index]))
+            row_masks.append(masks[index])
+        rows.append(''.join(chars))
+        mask_rows.append(row_masks)
+    return rows, mask_rows
+
+
+def read_cell(board, body):
+
+    # Gets the cell a move is made on from its request body.
+    #
+    # Raises:
+    #     HTTPError: The body does not name a cell of the board.
+
+    row = body.get("row")
+    col = body.get("col")
+    if type(row) is not int or type(col) is not int or not (0 <= row < board.size and 0 <= col < board.size):
+        raise HTTPError(400, f"row and col must be numbers from 0 to {board.size - 1}")
+    return row, col
+
+
+class GameAPI:
+
+    # The HTTP/JSON API server.
+    # Attributes:
+    # -----------
+    # sessions : SessionStore
+    #     The games, by ID.
+    # latencies : dict
+    #     Route name -> Histogram of the request latencies.
+    # responses : dict
+    #     HTTP status -> number of responses.
+    # games_created : int
+    #     Games dealt since the server started.
+    # started : float
+    #     perf_counter() when the server was created.
+    #
+    # Methods:
+    # --------
+    # new_game(body), get_game(game_id, body), reveal(game_id, body), flag(game_id, body),
+    # delete_game(game_id, body), metrics(body):
+    #     The endpoints, see the top of this file.
+    # dispatch(method, path, body):
+    #     Runs the endpoint of a request.
+    # handle_connection(reader, writer):
+    #     Serves the requests of one connection.
+    # serve(host, port, ready):
+    #     Listens for connections.
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, ttl=DEFAULT_TTL):
+        self.sessions = SessionStore(capacity, ttl)
+        self.latencies = {route: Histogram() for _, _, _, route in ROUTES}
+        self.responses = {}
+        self.games_created = 0
+        self.started = time.perf_counter()
+
+    def find_game(self, game_id):
+        game = self.sessions.get(game_id)
+        if game is None:
+            raise HTTPError(404, f"No game {game_id} (it may have expired)")
+        return game
+
+    def state(self, game_id, game):
+        board = game.board
+        rows, mine_masks = board_rows(board)
+        return {
+            "id": game_id,
+            "difficulty": board.profile.name,
+            "size": board.size,
+            "seed": board.seed if game.seed_given else None,
+            "no_guess": board.no_guess,
+            "status": game_status(board),
+            "score": board.score,
+            "moves": board.move_count,
+            "mines_stepped": board.mine_stepped_counter,
+            "words": [word if word in board.revealed_words else "_" * len(word) for word in board.selected_words],
+            "cells": rows,
+            "mine_masks": mine_masks,
+        }
+
+    async def new_game(self, body):
+        difficulty = body.get("difficulty", "Easy")
+        size = body.get("size")
+        seed = body.get("seed")
+        no_guess = bool(body.get("no_guess", False))
+        try:
+            profile = get_profile(difficulty)
+        except (KeyError, TypeError):
+            raise HTTPError(400, f"Unknown difficulty {difficulty!r}")
+        if size is not None and size != profile.size:
+            if type(size) is not int or not profile.scaled or not profile.min_size <= size <= profile.max_size:
+                raise HTTPError(400, f"{difficulty} boards cannot be {size}x{size}")
+            profile = profile.scaled_to(size)
+        if seed is not None and (type(seed) is not int or seed < 0):
+            raise HTTPError(400, "seed must be a non-negative number")
+        # Dealt on the worker thread: a no-guess board can take seconds, a 100x100 one about 17 ms
+        board = await asyncio.wrap_future(aio.in_background(Board, None, None, seed=seed, profile=profile,
+                                                            no_guess=no_guess))
+        game_id = secrets.token_hex(8)
+        game = Game(board, seed is not None)
+        self.sessions.add(game_id, game)
+        self.games_created += 1
+        return 201, self.state(game_id, game)
+
+    async def get_game(self, game_id, body):
+        return 200, self.state(game_id, self.find_game(game_id))
+
+    def move(self, game_id, body, action):
+
+        # Applies a move to a game, as a mouse click would, and answers with the cell and the score after it.
+
+        board = self.find_game(game_id).board
+        row, col = read_cell(board, body)
+        if board.game_won or board.game_lose:
+            raise HTTPError(409, f"The game is {game_status(board)}")
+        index = row * board.size + col
+        before = board.grid.cells[index]
+        apply_event(board, action, row, col)
+        return 200, {
+            "changed": board.grid.cells[index] != before,
+            "cell": cell_view(board, index),
+            "status": game_status(board),
+            "score": board.score,
+            "moves": board.move_count,
+            "mines_stepped": board.mine_stepped_counter,
+            "words_found": sorted(board.revealed_words),
+        }
+
+    async def reveal(self, game_id, body):
+        return self.move(game_id, body, REVEAL)
+
+    async def flag(self, game_id, body):
+        return self.move(game_id, body, MARK)
+
+    async def delete_game(self, game_id, body):
+        if not self.sessions.remove(game_id):
+            raise HTTPError(404, f"No game {game_id}")
+        return 204, None
+
+    async def metrics(self, body):
+        uptime = time.perf_counter() - self.started
+        requests = sum(self.responses.values())
+
+        def milliseconds(seconds):
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        latency = {}
+        for route, histogram in self.latencies.items():
+            if histogram.count:
+                latency[route] = {
+                    "count": histogram.count,
+                    "mean": milliseconds(histogram.total / histogram.count),
+                    "p50": milliseconds(histogram.percentile(0.5)),
+                    "p90": milliseconds(histogram.percentile(0.9)),
+                    "p99": milliseconds(histogram.percentile(0.99)),
+                    "max": milliseconds(histogram.maximum),
+                }
+        return 200, {
+            "uptime_seconds": round(uptime, 1),
+            "requests": requests,
+            "requests_per_second": round(requests / uptime, 1) if uptime else 0.0,
+            "responses": {str(status): count for status, count in sorted(self.responses.items())},
+            "sessions": {
+                "live": len(self.sessions),
+                "created": self.games_created,
+                "capacity": self.sessions.capacity,
+                "ttl_seconds": self.sessions.ttl,
+                "evicted": self.sessions.evicted,
+                "expired": self.sessions.expired,
+            },
+            "latency_ms": latency,
+        }
+
+    async def dispatch(self, method, path, body):
+
+        # Runs the endpoint of a request.
+        #
+        # Returns:
+        #     tuple: The HTTP status, the response body (None for none) and the route name (None if no route).
+
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        allowed = False
+        for route_method, pattern, handler, route in ROUTES:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            if body:
+                try:
+                    body = json.loads(body)
+                except (ValueError, UnicodeDecodeError):
+                    raise HTTPError(400, "The body is not JSON")
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "The body must be a JSON object")
+            else:
+                body = {}
+            status, payload = await getattr(self, handler)(*match.groups(), body)
+            return status, payload, route
+        if allowed:
+            raise HTTPError(405, f"{method} is not allowed on {path}")
+        raise HTTPError(404, f"Nothing at {path}")
+
+    async def handle_connection(self, reader, writer):
+
+        # Serves the requests of one connection, one after the other, until the client closes it or asks to.
+
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
+                    self.respond(writer, 431, {"error": "Headers too large"}, False)
+                    return
+                lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    self.respond(writer, 400, {"error": "Malformed request line"}, False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if value:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                if "transfer-encoding" in headers:
+                    self.respond(writer, 501, {"error": "Send bodies with a Content-Length"}, False)
+                    return
+                length = headers.get("content-length", "0") or "0"
+                if not (length.isascii() and length.isdigit()):
+                    self.respond(writer, 400, {"error": "Bad Content-Length"}, False)
+                    return
+                length = int(length)
+                if length > MAX_BODY:
+                    self.respond(writer, 413, {"error": "Body too large"}, False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                start = time.perf_counter()
+                route = None
+                if method == "OPTIONS":
+                    status, payload = 204, None  # CORS preflight of the web front end
+                else:
+                    try:
+                        status, payload, route = await self.dispatch(method, target, body)
+                    except HTTPError as error:
+                        status, payload = error.status, {"error": error.message}
+                    except Exception as error:
+                        status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+                self.respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if route is not None:
+                    self.latencies[route].add(time.perf_counter() - start)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, writer, status, payload, keep_alive):
+        self.responses[status] = self.responses.get(status, 0) + 1
+        data = b"" if payload is None else json.dumps(payload, separators=(',', ':')).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n{CORS_HEADERS}")
+        if not keep_alive:
+            head += "Connection: close\r\n"
+        writer.write(head.encode() + b"\r\n" + data)
+
+    async def expire_sessions(self):
+        while True:
+            await asyncio.sleep(EXPIRE_INTERVAL)
+            self.sessions.expire()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+
+        # Listens for connections until cancelled.
+        #
+        # Args:
+        #     host (str): The address to listen on.
+        #     port (int): The port (0 picks a free one).
+        #     ready (callable, optional): Called with the (host, port) listened on once the server is up.
+
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER, backlog=1024)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        expiry = asyncio.ensure_future(self.expire_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+
+
+def main(argv):
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    capacity = DEFAULT_CAPACITY
+    ttl = DEFAULT_TTL
+    if "--host" in argv:
+        host = argv[argv.index("--host") + 1]
+    if "--port" in argv:
+        port = int(argv[argv.index("--port") + 1])
+    if "--sessions" in argv:
+        capacity = int(argv[argv.index("--sessions") + 1])
+    if "--ttl" in argv:
+        ttl = float(argv[argv.index("--ttl") + 1])
+    prepare_word_list()  # Every board shares the word list
+    api = GameAPI(capacity, ttl)
+
+    def ready(address):
+        print(f"Game API listening on {address[0]}:{address[1]}", flush=True)
+
+    try:
+        asyncio.run(api.serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
+    print(f"{sum(api.responses.values())} requests, {api.games_created} games")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,384 @@
+# The leaderboard of the classic, timed and daily modes.
+#
+# Every finished game of a user updates one row per user and difficulty in the SQLite database
+# ./data/leaderboard.db: games played, games won, win rate, best score and fewest moves of a won game.
+# Each ranking has an index sorted the way it is shown, so the top of a ranking is read straight off the index
+# instead of sorting every user, and a game updates the indexes in place (Board.update_stats() calls
+# record_game()).
+#
+# Difficulties are ranked separately. Custom boards, and fixed difficulties played at another size than their
+# own, are ranked per size ("Custom-25"). Games of the timed mode are ranked apart from the others ("Timed Easy").
+# Win rates only rank users with MIN_RANKED_GAMES games or more.
+#
+# The daily challenge (game/dailyBoard.py) has a ranking per day, of the first game each user played on the
+# board of that day: wins first, then by score and by fewest moves, read off the index of the day. The same
+# database caches the seed of each day's board, so the board is only generated once per day.
+#
+# When the database does not exist yet, it is filled from the recorded replays (util/replay.py).
+#
+# The leaderboard screen reads the database on the I/O thread (see read() and util/aio.py), so opening it, or
+# filling a new one, never holds up the event loop of the menu.
+
+import asyncio
+import curses
+import os
+import sqlite3
+import time
+from contextlib import closing
+from util import aio
+from util.replay import REPLAY_DIR, REPLAY_SUFFIX, MARK, FLAG_WON, FLAG_TIMED, FLAG_DAILY, iter_records, Replay
+
+LEADERBOARD_PATH = './data/leaderboard.db'
+MIN_RANKED_GAMES = 5
+TOP_N = 20
+TIMED_PREFIX = "Timed "
+DAILY_PREFIX = "Daily "
+DAILY_DAYS = 7  # Days of the daily challenge listed, the latest first
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    user_id TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    win_rate REAL NOT NULL,
+    best_score INTEGER NOT NULL,
+    fewest_moves INTEGER,
+    PRIMARY KEY (user_id, difficulty)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_score ON results (difficulty, best_score DESC);
+CREATE INDEX IF NOT EXISTS results_by_win_rate ON results (difficulty, win_rate DESC, games DESC) WHERE games >= {min_games};
+CREATE INDEX IF NOT EXISTS results_by_moves ON results (difficulty, fewest_moves) WHERE fewest_moves IS NOT NULL;
+CREATE TABLE IF NOT EXISTS daily_boards (
+    date TEXT PRIMARY KEY,
+    seed INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_results (
+    date TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    PRIMARY KEY (date, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_by_rank ON daily_results (date, won DESC, score DESC, moves);
+""".format(min_games=MIN_RANKED_GAMES)
+
+# The same game added to a row. Multi-argument MIN() is NULL if either side is, hence the COALESCE.
+RECORD_GAME = """
+INSERT INTO results (user_id, difficulty, games, wins, win_rate, best_score, fewest_moves)
+VALUES (?1, ?2, 1, ?3, ?3, ?4, ?5)
+ON CONFLICT (user_id, difficulty) DO UPDATE SET
+    games = games + 1,
+    wins = wins + excluded.wins,
+    win_rate = CAST(wins + excluded.wins AS REAL) / (games + 1),
+    best_score = MAX(best_score, excluded.best_score),
+    fewest_moves = COALESCE(MIN(fewest_moves, excluded.fewest_moves), fewest_moves, excluded.fewest_moves)
+"""
+
+# Only the first game of a user on the board of a day is ranked
+RECORD_DAILY = """
+INSERT INTO daily_results (date, user_id, won, score, moves) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (date, user_id) DO NOTHING
+"""
+
+# Served by daily_by_rank
+DAILY_TOP = ("SELECT user_id, score, won, moves FROM daily_results WHERE date = ? "
+             "ORDER BY won DESC, score DESC, moves LIMIT ?")
+DAILY_DATES = "SELECT DISTINCT date FROM daily_results ORDER BY date DESC LIMIT ?"
+
+# Ranking name -> (query of its top rows, format of the ranked value).
+# Every query is served by the index of its ranking (see SCHEMA).
+RANKINGS = {
+    "Best score": ("SELECT user_id, best_score, games FROM results WHERE difficulty = ? "
+                   "ORDER BY best_score DESC LIMIT ?", "{}"),
+    "Win rate": ("SELECT user_id, win_rate, games FROM results WHERE difficulty = ? AND games >= {} "
+                 "ORDER BY win_rate DESC, games DESC LIMIT ?".format(MIN_RANKED_GAMES), "{:.0%}"),
+    "Fewest moves": ("SELECT user_id, fewest_moves, games FROM results WHERE difficulty = ? AND fewest_moves IS NOT NULL "
+                     "ORDER BY fewest_moves LIMIT ?", "{}"),
+}
+
+# Every distinct difficulty, found with one index lookup each
+DIFFICULTIES_QUERY = """
+WITH RECURSIVE difficulties(label) AS (
+    SELECT MIN(difficulty) FROM results
+    UNION ALL
+    SELECT (SELECT MIN(difficulty) FROM results WHERE difficulty > label) FROM difficulties WHERE label IS NOT NULL
+)
+SELECT label FROM difficulties WHERE label IS NOT NULL
+"""
+
+
+def difficulty_label(name, size, timed=False):
+
+    # Gets the name a difficulty is ranked under: its own name at its own size, with the size otherwise,
+    # after TIMED_PREFIX for the timed mode.
+    #
+    # Args:
+    #     name (str): The name of the difficulty profile.
+    #     size (int): The board size.
+    #     timed (bool): Whether the games are played in the timed mode.
+
+    from game.profiles import get_profile
+    profile = get_profile(name)
+    label = name
+    if profile.scaled or profile.size != size:
+        label = f"{name}-{size}"
+    return TIMED_PREFIX + label if timed else label
+
+
+def connect(path=LEADERBOARD_PATH):
+
+    # Opens the leaderboard database, creating it (and filling it from the replays) if it does not exist.
+    #
+    # Returns:
+    #     sqlite3.Connection: The connection.
+
+    new = not os.path.exists(path)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    if new:
+        games = []
+        daily_games = []
+        for user_id, replay in replay_records():
+            won = bool(replay.flags & FLAG_WON)
+            moves = sum(action != MARK for _, action, _, _ in replay.events())
+            games.append((user_id, difficulty_label(replay.difficulty, replay.size, bool(replay.flags & FLAG_TIMED)),
+                          int(won), replay.score, moves if won else None))
+            if replay.flags & FLAG_DAILY:
+                date = time.strftime('%Y-%m-%d', time.localtime(replay.started))
+                daily_games.append((date, user_id, int(won), replay.score, moves))
+        with connection:
+            connection.executemany(RECORD_GAME, games)
+            connection.executemany(RECORD_DAILY, daily_games)
+    return connection
+
+
+def record_game(user_id, difficulty, score, won, moves):
+
+    # Adds a finished game to the leaderboard.
+    #
+    # Args:
+    #     user_id (str): The player.
+    #     difficulty (str): The label of the difficulty, see difficulty_label().
+    #     score (int): The final score.
+    #     won (bool): Whether the game was won.
+    #     moves (int): The cells revealed, only ranked for won games.
+
+    with closing(connect()) as connection, connection:
+        connection.execute(RECORD_GAME, (user_id, difficulty, int(won), score, moves if won else None))
+
+
+def record_daily(user_id, date, score, won, moves):
+
+    # Adds a finished game of the daily challenge to the ranking of its day, unless the user already has a
+    # game there.
+    #
+    # Args:
+    #     user_id (str): The player.
+    #     date (str): The day of the board, as YYYY-MM-DD.
+    #     score (int): The final score.
+    #     won (bool): Whether the game was won.
+    #     moves (int): The cells revealed.
+
+    with closing(connect()) as connection, connection:
+        connection.execute(RECORD_DAILY, (date, user_id, int(won), score, moves))
+
+
+def daily_board_seed(date, generate):
+
+    # Gets the seed of the board of a day, generating it the first time it is asked for and caching it.
+    #
+    # Args:
+    #     date (str): The day, as YYYY-MM-DD.
+    #     generate (callable): Called with the date to get the seed when it is not cached yet.
+    #
+    # Returns:
+    #     int: The seed. When two players generate the same day at once, the first one stored is kept.
+
+    with closing(connect()) as connection:
+        row = connection.execute("SELECT seed FROM daily_boards WHERE date = ?", (date,)).fetchone()
+        if row is not None:
+            return row[0]
+        seed = generate(date)
+        with connection:
+            connection.execute("INSERT OR IGNORE INTO daily_boards (date, seed) VALUES (?, ?)", (date, seed))
+        return connection.execute("SELECT seed FROM daily_boards WHERE date = ?", (date,)).fetchone()[0]
+
+
+def replay_records():
+
+    # Reads the games of every replay file, for filling a new leaderboard.
+    #
+    # Yields:
+    #     tuple: The user ID and the Replay of each game.
+
+    if not os.path.isdir(REPLAY_DIR):
+        return
+    for name in os.listdir(REPLAY_DIR):
+        if not name.endswith(REPLAY_SUFFIX):
+            continue
+        with open(os.path.join(REPLAY_DIR, name), 'rb') as file:
+            data = file.read()
+        for body in iter_records(data):
+            try:
+                replay = Replay.decode(body)
+            except (ValueError, IndexError):
+                continue
+            yield name[:-len(REPLAY_SUFFIX)], replay
+
+
+def top(connection, difficulty, ranking, limit=TOP_N):
+
+    # Gets the top of a ranking.
+    #
+    # Args:
+    #     connection (sqlite3.Connection): The leaderboard.
+    #     difficulty (str): The label of the difficulty.
+    #     ranking (str): A key of RANKINGS.
+    #     limit (int): How many users to get.
+    #
+    # Returns:
+    #     list of tuple: (user id, ranked value, games played), best first.
+
+    query, _ = RANKINGS[ranking]
+    return connection.execute(query, (difficulty, limit)).fetchall()
+
+
+def daily_top(connection, date, limit=TOP_N):
+
+    # Gets the ranking of a day of the daily challenge: the first game of every player on the board of that day,
+    # wins first, then by score and by fewest moves.
+    #
+    # Returns:
+    #     list of tuple: (user id, score, won, moves), best first.
+
+    return connection.execute(DAILY_TOP, (date, limit)).fetchall()
+
+
+def read(func, *args):
+
+    # Runs func(connection, *args) on a connection of its own, and closes it. The screens run it on the I/O
+    # thread, after the games still being recorded there.
+
+    with closing(connect()) as connection:
+        return func(connection, *args)
+
+
+def ranked_difficulties(connection):
+
+    # Gets the labels of the difficulties with at least one game, in the order of data/difficulties.ini and
+    # by size, the timed mode last. The query hops from one difficulty to the next through results_by_score instead of reading
+    # every row. The last DAILY_DAYS days of the daily challenge come first, the latest first ("Daily 2024-05-01").
+
+    from game.profiles import load_profiles
+    labels = [row[0] for row in connection.execute(DIFFICULTIES_QUERY)]
+    order = list(load_profiles())
+
+    def sort_key(label):
+        timed = label.startswith(TIMED_PREFIX)
+        name, _, size = label[len(TIMED_PREFIX) if timed else 0:].partition('-')
+        return (timed, order.index(name) if name in order else len(order), name, int(size or 0))
+    days = [DAILY_PREFIX + row[0] for row in connection.execute(DAILY_DATES, (DAILY_DAYS,))]
+    return days + sorted(labels, key=sort_key)
+
+
+class Leaderboard:
+
+    # The leaderboard screen.
+    # Attributes:
+    # -----------
+    # stdscr : curses.window
+    #     The screen.
+    # current_user_id : str
+    #     The logged in user, highlighted in the rankings (None if nobody is logged in).
+    # difficulty : int
+    #     Index of the difficulty shown.
+    # ranking : int
+    #     Index of the ranking shown, in RANKINGS.
+    #
+    # Methods:
+    # --------
+    # display(keys):
+    #     Shows the leaderboard until ESC is pressed.
+    # draw_daily(date, rows, w):
+    #     Draws the ranking of a day of the daily challenge.
+
+    def __init__(self, stdscr, current_user_id=None):
+        self.stdscr = stdscr
+        self.current_user_id = current_user_id
+        self.difficulty = 0
+        self.ranking = 0
+
+    async def display(self, keys):
+
+        # Shows the top users of one difficulty and ranking at a time: Left / Right switch the difficulty,
+        # Tab / Up / Down switch the ranking and ESC goes back to the menu. Every ranking shown is read on the
+        # I/O thread (see read()), while the event loop goes on.
+        #
+        # Args:
+        #     keys (util.aio.KeyStream): The keys of the screen.
+
+        difficulties = await asyncio.wrap_future(aio.run_io(read, ranked_difficulties))
+        rankings = list(RANKINGS)
+        while True:
+            h, w = self.stdscr.getmaxyx()
+            limit = max(1, min(TOP_N, h - 9))
+            if not difficulties:
+                self.stdscr.clear()
+                message = "No games played yet."
+                self.stdscr.addstr(h // 2, (w - len(message)) // 2, message, curses.A_BOLD)
+            elif difficulties[self.difficulty].startswith(DAILY_PREFIX):
+                date = difficulties[self.difficulty][len(DAILY_PREFIX):]
+                rows = await asyncio.wrap_future(aio.run_io(read, daily_top, date, limit))
+                self.stdscr.clear()
+                self.draw_daily(date, rows, w)
+            else:
+                difficulty = difficulties[self.difficulty]
+                ranking = rankings[self.ranking]
+                rows = await asyncio.wrap_future(aio.run_io(read, top, difficulty, ranking, limit))
+                self.stdscr.clear()
+                title = f"Leaderboard: {difficulty}, {ranking.lower()}"
+                self.stdscr.addstr(2, (w - len(title)) // 2, title, curses.A_BOLD | curses.A_UNDERLINE)
+                value_format = RANKINGS[ranking][1]
+                header = f"{'#':>3}  {'Player':<17}{ranking:>13}{'Games':>8}"
+                x = (w - len(header)) // 2
+                self.stdscr.addstr(4, x, header, curses.A_DIM)
+                for rank, (user_id, value, games) in enumerate(rows, 1):
+                    line = f"{rank:>3}  {user_id:<17}{value_format.format(value):>13}{games:>8}"
+                    attribute = curses.color_pair(1) if user_id == self.current_user_id else curses.A_NORMAL
+                    self.stdscr.addstr(4 + rank, x, line, attribute)
+                if not rows:
+                    message = f"Nobody has played {MIN_RANKED_GAMES} games here yet." if ranking == "Win rate" else "Nobody has won here yet."
+                    self.stdscr.addstr(6, (w - len(message)) // 2, message)
+            help_text = "Left / Right: difficulty   Tab: ranking   ESC: back"
+            self.stdscr.addstr(h - 2, (w - len(help_text)) // 2, help_text, curses.A_DIM)
+            self.stdscr.refresh()
+
+            key = await keys.get()
+            if key == 27:  # ESC key
+                return
+            elif not difficulties:
+                continue
+            elif key == curses.KEY_LEFT:
+                self.difficulty = (self.difficulty - 1) % len(difficulties)
+            elif key == curses.KEY_RIGHT:
+                self.difficulty = (self.difficulty + 1) % len(difficulties)
+            elif key in (9, curses.KEY_DOWN):  # Tab
+                self.ranking = (self.ranking + 1) % len(rankings)
+            elif key == curses.KEY_UP:
+                self.ranking = (self.ranking - 1) % len(rankings)
+
+    def draw_daily(self, date, rows, w):
+
+        # Draws the ranking of a day of the daily challenge (see daily_top()).
+
+        title = f"Leaderboard: daily challenge of {date}"
+        self.stdscr.addstr(2, (w - len(title)) // 2, title, curses.A_BOLD | curses.A_UNDERLINE)
+        header = f"{'#':>3}  {'Player':<17}{'Score':>9}{'Result':>8}{'Moves':>7}"
+        x = (w - len(header)) // 2
+        self.stdscr.addstr(4, x, header, curses.A_DIM)
+        for rank, (user_id, score, won, moves) in enumerate(rows, 1):
+            line = f"{rank:>3}  {user_id:<17}{score:>9}{'won' if won else 'lost':>8}{moves:>7}"
+            attribute = curses.color_pair(1) if user_id == self.current_user_id else curses.A_NORMAL
+            self.stdscr.addstr(4 + rank, x, line, attribute)
@@ -0,0 +1,215 @@
+# A scrolling list for the curses screens, for lists longer than the screen (e.g. thousands of users).
+#
+# The list only draws the rows that fit on the screen, so a redraw costs the same however long the list is.
+# Typing filters the list to the items starting with what was typed: the items come from a SortedIndex, in
+# which the items starting with a prefix are one contiguous range found by binary search, so the filter
+# never walks the whole list either.
+
+import curses
+from bisect import bisect_left
+
+BACKSPACE_KEYS = (curses.KEY_BACKSPACE, 8, 127)
+
+
+class SortedIndex:
+
+    # Items sorted by a text key, case-insensitively, with binary search by prefix.
+    # Attributes:
+    # -----------
+    # items : list
+    #     The items, in key order.
+    # keys : list of str
+    #     The casefolded key of every item, in the same order.
+    #
+    # Methods:
+    # --------
+    # prefix_range(prefix):
+    #     Gets the range of the items whose key starts with a prefix.
+
+    def __init__(self, items, key=str):
+        pairs = sorted(((key(item).casefold(), item) for item in items), key=lambda pair: pair[0])
+        self.keys = [pair[0] for pair in pairs]
+        self.items = [pair[1] for pair in pairs]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def prefix_range(self, prefix):
+
+        # Gets the range of the items whose key starts with a prefix (case-insensitive).
+        #
+        # Returns:
+        #     tuple: (start, end), the items are self[start:end].
+
+        prefix = prefix.casefold()
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + '\U0010ffff', start)
+        return start, end
+
+
+class ListView:
+
+    # A list of items the user scrolls through and picks one from, filtered by typing.
+    # Attributes:
+    # -----------
+    # stdscr : curses.window
+    #     The screen.
+    # source : SortedIndex
+    #     The items. Anything with len(), indexing and prefix_range() works.
+    # label : function
+    #     Gets the text shown for an item.
+    # title : str
+    #     The line shown above the list.
+    # help_text : str
+    #     The line shown under the list.
+    # actions : dict
+    #     Extra keys that end the list: key code -> action name returned by run().
+    # query : str
+    #     What was typed so far.
+    # start, end : int
+    #     The range of the source matching the query.
+    # current : int
+    #     The selected row, counted from start.
+    # top : int
+    #     The first row drawn, counted from start.
+    #
+    # Methods:
+    # --------
+    # handle_key(key):
+    #     Applies a key to the list.
+    # draw():
+    #     Draws the rows on screen.
+    # run(keys):
+    #     Shows the list until an item is picked or the list is left.
+
+    def __init__(self, stdscr, source, label=str, title="", help_text=None, actions=None):
+        self.stdscr = stdscr
+        self.source = source
+        self.label = label
+        self.title = title
+        self.help_text = help_text or "Type to search, Up / Down / PgUp / PgDn to move, Enter to pick, ESC to go back."
+        self.actions = actions or {}
+        self.query = ""
+        self.start, self.end = 0, len(source)
+        self.current = 0
+        self.top = 0
+        self.list_y = 0
+        self.list_x = 0
+        self.rows = 1
+
+    def count(self):
+        return self.end - self.start
+
+    def selected(self):
+        if self.count() == 0:
+            return None
+        return self.source[self.start + self.current]
+
+    def set_query(self, query):
+        self.query = query
+        self.start, self.end = self.source.prefix_range(query)
+        self.current = 0
+        self.top = 0
+
+    def move(self, rows):
+        if self.count():
+            self.current = max(0, min(self.count() - 1, self.current + rows))
+
+    def handle_key(self, key):
+
+        # Applies a key to the list.
+        #
+        # Args:
+        #     key (int): The key code.
+        #
+        # Returns:
+        #     tuple: ("pick", item) when an item was picked, ("back", None) when the list is left,
+        #            (action, item) for the keys of actions, or None when the list goes on.
+
+        if key in self.actions:
+            return self.actions[key], self.selected()
+        if key == 27:  # ESC key clears the search first
+            if self.query:
+                self.set_query("")
+                return None
+            return "back", None
+        if key == curses.KEY_ENTER or key in [10, 13]:
+            if self.count():
+                return "pick", self.selected()
+        elif key == curses.KEY_UP:
+            self.move(-1)
+        elif key == curses.KEY_DOWN:
+            self.move(1)
+        elif key == curses.KEY_PPAGE:
+            self.move(-self.rows)
+        elif key == curses.KEY_NPAGE:
+            self.move(self.rows)
+        elif key == curses.KEY_HOME:
+            self.move(-self.count())
+        elif key == curses.KEY_END:
+            self.move(self.count())
+        elif key in BACKSPACE_KEYS:
+            if self.query:
+                self.set_query(self.query[:-1])
+        elif key == curses.KEY_MOUSE:
+            _, mx, my, _, _ = curses.getmouse()
+            row = my - self.list_y
+            if 0 <= row < self.rows and self.top + row < self.count():
+                self.current = self.top + row
+                return "pick", self.selected()
+        elif 32 <= key < 127:
+            self.set_query(self.query + chr(key))
+        return None
+
+    def draw(self):
+
+        # Draws the title, the search, the visible rows and the help line, centered on the screen.
+
+        self.stdscr.clear()
+        h, w = self.stdscr.getmaxyx()
+        self.rows = max(1, h - 8)
+        # Keep the selected row on screen
+        if self.current < self.top:
+            self.top = self.current
+        elif self.current >= self.top + self.rows:
+            self.top = self.current - self.rows + 1
+        self.top = max(0, min(self.top, self.count() - self.rows))
+
+        width = min(w - 4, max([len(self.title), 30] + [len(self.label(self.source[self.start + row]))
+                                                          for row in range(self.top, min(self.top + self.rows, self.count()))]))
+        self.list_x = (w - width) // 2
+        self.list_y = 4
+        self.stdscr.addstr(1, (w - len(self.title)) // 2, self.title[:w - 2], curses.A_BOLD | curses.A_UNDERLINE)
+        search = f"Search: {self.query}" if self.query else "Search: (type a name)"
+        position = f"{self.current + 1}/{self.count()}" if self.count() else "no match"
+        self.stdscr.addstr(2, self.list_x, search[:width])
+        self.stdscr.addstr(2, max(self.list_x, self.list_x + width - len(position)), position, curses.A_DIM)
+        for row in range(self.top, min(self.top + self.rows, self.count())):
+            text = self.label(self.source[self.start + row])[:width]
+            attribute = curses.color_pair(1) if row == self.current else curses.A_NORMAL
+            self.stdscr.addstr(self.list_y + row - self.top, self.list_x, text, attribute)
+        if self.top > 0:
+            self.stdscr.addstr(self.list_y - 1, self.list_x + width - 1, "^", curses.A_DIM)
+        if self.top + self.rows < self.count():
+            self.stdscr.addstr(self.list_y + self.rows, self.list_x + width - 1, "v", curses.A_DIM)
+        self.stdscr.addstr(h - 2, max(0, (w - len(self.help_text)) // 2), self.help_text[:w - 1], curses.A_DIM)
+        self.stdscr.refresh()
+
+    async def run(self, keys):
+
+        # Shows the list until an item is picked or the list is left.
+        #
+        # Args:
+        #     keys (util.aio.KeyStream): The keys of the screen.
+        #
+        # Returns:
+        #     tuple: The result of handle_key() that ended the list.
+
+        while True:
+            self.draw()
+            result = self.handle_key(await keys.get())
+            if result is not None:
+                return result
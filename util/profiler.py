@@ -0,0 +1,258 @@
+# Opt-in timing instrumentation for the game.
+#
+# Instrumentation is off unless it is enabled by the WORDWEEPER_PROFILE environment variable
+# (its value is the report path) or by `python main.py --profile [PATH]`. When it is off, every
+# helper in this module returns straight away, so the hooks can stay in the game code.
+#
+# Samples are not kept one by one. Each timed section only keeps a count, a total, the min/max
+# and a histogram with power-of-two microsecond buckets, so memory use does not grow with play time.
+# The histograms are written to the report file when the program exits.
+#
+# Functions:
+#     enable(path): Turns instrumentation on and writes the report to path on exit.
+#     is_enabled(): Returns True if instrumentation is on.
+#     record(name, seconds): Adds one sample to the histogram of the given section.
+#     timer(name): Context manager timing the enclosed block.
+#     timed(name): Decorator timing every call of the decorated function.
+#     format_report(): Returns the aggregated histograms as text.
+#     write_report(path): Writes the aggregated histograms to a file.
+# Classes:
+#     Histogram: The count, total, extremes and power-of-two buckets of a series of durations, also used by
+#                the always-on request metrics of the HTTP API (util/http_api.py).
+
+import atexit
+import os
+import threading
+import time
+
+DEFAULT_REPORT_PATH = "./profile_report.txt"
+
+_enabled = False
+_report_path = None
+_sections = {}  # Section name -> Histogram
+_lock = threading.Lock()  # Boards are also generated by the background board pool
+
+
+def enable(path=DEFAULT_REPORT_PATH):
+
+    # Turns instrumentation on. The report is written to path when the program exits.
+    #
+    # Args:
+    #     path (str): Where the report is written.
+
+    global _enabled, _report_path
+    if not _enabled:
+        atexit.register(_write_on_exit)
+    _enabled = True
+    _report_path = path
+
+
+def is_enabled():
+    return _enabled
+
+
+def _bucket(seconds):
+
+    # Returns the histogram bucket of a duration: bucket n holds durations in [2^(n-1), 2^n) microseconds.
+
+    return max(0, int(seconds * 1_000_000)).bit_length()
+
+
+class Histogram:
+
+    # The durations of a timed section, without keeping the samples.
+    # Attributes:
+    # -----------
+    # count : int
+    #     The number of samples.
+    # total, minimum, maximum : float
+    #     The sum and the extremes of the samples, in seconds.
+    # buckets : dict
+    #     Bucket -> number of samples, see _bucket().
+    #
+    # Methods:
+    # --------
+    # add(seconds):
+    #     Adds a sample.
+    # percentile(fraction):
+    #     Gets the upper bound of the bucket holding a percentile.
+    # copy():
+    #     Gets a copy, for reading while samples are added.
+
+    __slots__ = ("count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+        bucket = _bucket(seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+
+        # Gets a percentile, as the upper bound of the bucket it falls in (at most the largest sample).
+        #
+        # Args:
+        #     fraction (float): The percentile, e.g. 0.99.
+        #
+        # Returns:
+        #     float: Seconds, or None without samples.
+
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min((1 << bucket) / 1_000_000, self.maximum)
+        return self.maximum
+
+    def copy(self):
+        histogram = Histogram()
+        histogram.count, histogram.total = self.count, self.total
+        histogram.minimum, histogram.maximum = self.minimum, self.maximum
+        histogram.buckets = dict(self.buckets)
+        return histogram
+
+
+def record(name, seconds):
+
+    # Adds one sample to the histogram of a timed section.
+    #
+    # Args:
+    #     name (str): The name of the section, e.g. "draw_board".
+    #     seconds (float): The measured wall time.
+
+    if not _enabled:
+        return
+    with _lock:
+        section = _sections.get(name)
+        if section is None:
+            section = _sections[name] = Histogram()
+        section.add(seconds)
+
+
+class _Timer:
+
+    # Context manager returned by timer(). Records the time spent inside the with block.
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+
+    # Does nothing, returned by timer() when instrumentation is off.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+
+    # Times the enclosed with block.
+    #
+    # Example:
+    #     with profiler.timer("calculate_mine_hint"):
+    #         ...
+
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def timed(name):
+
+    # Decorator timing every call of the decorated function under the given section name.
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
+
+
+def _format_us(microseconds):
+    if microseconds >= 1000:
+        return f"{microseconds / 1000:.2f}ms"
+    return f"{microseconds:.0f}us"
+
+
+def format_report():
+
+    # Returns the aggregated histograms of all timed sections as text.
+
+    with _lock:
+        sections = {name: section.copy() for name, section in _sections.items()}
+    lines = []
+    for name in sorted(sections):
+        section = sections[name]
+        count, total, minimum, maximum, buckets = (section.count, section.total, section.minimum, section.maximum,
+                                                   section.buckets)
+        lines.append(f"{name}: count={count} total={_format_us(total * 1e6)} mean={_format_us(total / count * 1e6)} "
+                     f"min={_format_us(minimum * 1e6)} max={_format_us(maximum * 1e6)}")
+        largest = max(buckets.values())
+        for bucket in sorted(buckets):
+            low = 0 if bucket == 0 else 1 << (bucket - 1)
+            high = 1 << bucket
+            bar = "#" * max(1, buckets[bucket] * 40 // largest)
+            lines.append(f"  {_format_us(low):>9} - {_format_us(high):<9} | {bar} {buckets[bucket]}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_report(path):
+
+    # Writes the aggregated histograms to a file.
+    #
+    # Args:
+    #     path (str): The report path.
+
+    with open(path, 'w') as file:
+        file.write(format_report())
+
+
+def _write_on_exit():
+    if _sections and _report_path:
+        write_report(_report_path)
+
+
+if os.environ.get("WORDWEEPER_PROFILE"):
+    enable(os.environ["WORDWEEPER_PROFILE"])
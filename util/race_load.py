@@ -0,0 +1,310 @@
+# Loopback load test of the race server (util/race_server.py).
+#
+# Run it from the project root:
+#
+#     python -m util.race_load [--matches N] [--players N] [--difficulty NAME] [--delay MS] [--server HOST:PORT]
+#                              [--output PATH]
+#
+# Starts a race server on a free loopback port in a process of its own (or uses the one given with --server),
+# then connects N matches worth of bot players at once. They join quick matches, so the server groups them
+# into races as they come. Every bot builds the board from the seed it gets, as the game does, and reveals its
+# cells that hold no mine in a random order that favours the cells of the words, one move every --delay
+# milliseconds (give or take half), each after the delta of its previous move came back. The bots play each of
+# their moves on their own board as well and check that the server's score agrees.
+#
+# The report gives the moves per second, the time from sending a move to getting its delta back (the latency a
+# player feels), the bytes per delta and the CPU time the server took. --output writes the report as JSON.
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import time
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.classicBoard import Board
+from game.grid import MINE
+from game.profiles import get_profile
+from util.benchmark import prepare_data_dir
+from util.race_protocol import JOIN, MOVE, START, DELTA, END, ERROR, encode, read_message
+from util.replay import ACTION_KINDS, REVEAL, apply_event
+from util.tournament import percentile
+
+DEFAULT_MATCHES = 200
+DEFAULT_PLAYERS = 2
+DEFAULT_DELAY = 20  # Milliseconds between the moves of a bot
+WANDER = 0.7  # How far behind the cells of the words the bots reveal other cells (0: never before them)
+
+
+class Bot:
+
+    # A bot player, connected to the server.
+    # Attributes:
+    # -----------
+    # number : int
+    #     The bot's number, its name and the seed of its move order.
+    # delay : float
+    #     Mean seconds between two moves.
+    # rng : random.Random
+    #     The random generator of the move order and the delays.
+    # writer : asyncio.StreamWriter
+    #     The connection to the server.
+    # slot : int
+    #     The bot's slot in its race (None until it starts).
+    # board : Board
+    #     The bot's own copy of the board.
+    # order : list of int
+    #     The cells left to reveal, last first.
+    # sent_at : float
+    #     perf_counter() when the move waiting for its delta was sent.
+    # latencies : list of float
+    #     Seconds from sending each move to getting its delta.
+    # delta_bytes, deltas : int
+    #     Bytes and number of deltas received.
+    # mismatches : int
+    #     Deltas whose score is not the one of the bot's own board.
+    # won, error : bool / str
+    #     Whether the bot won its race, and the error the server sent (if any).
+    #
+    # Methods:
+    # --------
+    # play(host, port, difficulty, players):
+    #     Joins a quick match and plays until the race is over.
+
+    def __init__(self, number, delay):
+        self.number = number
+        self.delay = delay
+        self.rng = random.Random(number)
+        self.slot = None
+        self.board = None
+        self.order = []
+        self.writer = None
+        self.sent_at = None
+        self.latencies = []
+        self.delta_bytes = 0
+        self.deltas = 0
+        self.mismatches = 0
+        self.won = False
+        self.error = None
+
+    def send_move(self):
+        if self.writer.is_closing() or not self.order:
+            return
+        index = self.order.pop()
+        self.sent_at = time.perf_counter()
+        self.writer.write(encode(MOVE, index * ACTION_KINDS + REVEAL))
+
+    def start(self, seed, difficulty, size, slot):
+        profile = get_profile(difficulty)
+        if size != profile.size:
+            profile = profile.scaled_to(size)
+        self.slot = slot
+        self.board = Board(None, None, seed=seed, profile=profile)
+        cells = self.board.grid.cells
+        word_cells = self.word_cells()
+        safe = [index for index in range(size * size) if not cells[index] & MINE]
+        # The cells of the words come first, mixed with a few others, and the move order is popped from the end
+        self.order = sorted(safe, key=lambda index: self.rng.random() + (index not in word_cells) * WANDER,
+                            reverse=True)
+        self.send_move()
+
+    def word_cells(self):
+
+        # Gets the cells of the words on the bot's board, as a player who has seen its answer would know them.
+
+        board = self.board
+        letters = board.grid.letters
+        cells = set()
+        for word in board.selected_words:
+            data = word.encode()
+            for start in range(len(letters)):
+                row, col = divmod(start, board.size)
+                if col + len(word) <= board.size and letters[start:start + len(word)] == data:
+                    cells.update(range(start, start + len(word)))
+                if row + len(word) <= board.size and letters[start:start + len(word) * board.size:board.size] == data:
+                    cells.update(range(start, start + len(word) * board.size, board.size))
+        return cells
+
+    def own_delta(self, event, score, status):
+        self.latencies.append(time.perf_counter() - self.sent_at)
+        index, action = divmod(event, ACTION_KINDS)
+        apply_event(self.board, action, *divmod(index, self.board.size))
+        if self.board.score != score:
+            self.mismatches += 1
+        if not status:
+            delay = self.delay * self.rng.uniform(0.5, 1.5)
+            asyncio.get_running_loop().call_later(delay, self.send_move)
+
+    async def play(self, host, port, difficulty, players):
+        reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode(JOIN, "", f"bot{self.number}", difficulty, players, 0))
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                kind = message[0]
+                if kind == START:
+                    _, seed, difficulty, size, slot, _ = message
+                    self.start(seed, difficulty, size, slot)
+                elif kind == DELTA:
+                    _, slot, event, score, _, status = message
+                    self.deltas += 1
+                    self.delta_bytes += len(encode(*message))
+                    if slot == self.slot:
+                        self.own_delta(event, score, status)
+                elif kind == END:
+                    self.won = message[1] == self.slot + 1
+                    break
+                elif kind == ERROR:
+                    self.error = message[1]
+                    break
+        finally:
+            self.writer.close()
+
+
+async def run_load(host, port, matches, players, difficulty, delay):
+
+    # Plays the matches against a running server.
+    #
+    # Returns:
+    #     tuple: The bots and the seconds it took.
+
+    bots = [Bot(number, delay) for number in range(matches * players)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bot.play(host, port, difficulty, players) for bot in bots),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    for bot, result in zip(bots, results):
+        if isinstance(result, Exception) and bot.error is None:
+            bot.error = repr(result)
+    return bots, elapsed
+
+
+def start_server(script="race_server.py"):
+
+    # Starts a server of util/ on a free loopback port, in its own process and the current directory.
+    #
+    # Args:
+    #     script (str): The server's file in util/, which prints "... listening on HOST:PORT" once it is up.
+    #
+    # Returns:
+    #     tuple: The process and the (host, port) it listens on.
+
+    server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+    process = subprocess.Popen([sys.executable, server_path, "--port", "0"], stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "Race server listening on HOST:PORT"
+    host, port = line.split()[-1].rsplit(':', 1)
+    return process, (host, int(port))
+
+
+def stop_server(process):
+
+    # Stops a server started by start_server().
+    #
+    # Returns:
+    #     tuple: The server's last line of output and the CPU seconds it used.
+
+    process.send_signal(signal.SIGINT)
+    output = process.stdout.read().strip()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = status
+    return output, usage.ru_utime + usage.ru_stime
+
+
+def summarize(bots, elapsed, server_cpu):
+    latencies = sorted(latency for bot in bots for latency in bot.latencies)
+    moves = len(latencies)
+    deltas = sum(bot.deltas for bot in bots)
+    return {
+        "bots": len(bots),
+        "seconds": elapsed,
+        "moves": moves,
+        "moves_per_second": moves / elapsed if elapsed else 0.0,
+        "deltas_received": deltas,
+        "bytes_per_delta": sum(bot.delta_bytes for bot in bots) / deltas if deltas else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5) * 1000 if latencies else None,
+            "p95": percentile(latencies, 0.95) * 1000 if latencies else None,
+            "p99": percentile(latencies, 0.99) * 1000 if latencies else None,
+            "max": latencies[-1] * 1000 if latencies else None,
+        },
+        "races_won": sum(bot.won for bot in bots),
+        "score_mismatches": sum(bot.mismatches for bot in bots),
+        "errors": sorted({bot.error for bot in bots if bot.error is not None}),
+        "server_cpu_seconds": server_cpu,
+    }
+
+
+def print_report(summary, matches, players):
+    latency = summary["latency_ms"]
+    print(f"{matches} races of {players} players ({summary['bots']} connections) in {summary['seconds']:.1f} s")
+    print(f"{summary['moves']} moves, {summary['moves_per_second']:.0f} per second, "
+          f"{summary['deltas_received']} deltas received, {summary['bytes_per_delta']:.1f} bytes each")
+    if latency["p50"] is not None:
+        print(f"Move to delta: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+              f"p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms")
+    print(f"Races won: {summary['races_won']}, score mismatches: {summary['score_mismatches']}")
+    if summary["server_cpu_seconds"] is not None:
+        per_move = summary["server_cpu_seconds"] / summary["moves"] * 1e6 if summary["moves"] else 0
+        print(f"Server CPU: {summary['server_cpu_seconds']:.2f} s ({per_move:.0f} us per move)")
+    for error in summary["errors"]:
+        print(f"Error: {error}")
+
+
+def main(argv):
+    matches = DEFAULT_MATCHES
+    players = DEFAULT_PLAYERS
+    difficulty = "Easy"
+    delay = DEFAULT_DELAY
+    server = None
+    output_path = None
+    if "--matches" in argv:
+        matches = int(argv[argv.index("--matches") + 1])
+    if "--players" in argv:
+        players = int(argv[argv.index("--players") + 1])
+    if "--difficulty" in argv:
+        difficulty = argv[argv.index("--difficulty") + 1]
+    if "--delay" in argv:
+        delay = float(argv[argv.index("--delay") + 1])
+    if "--server" in argv:
+        host, port = argv[argv.index("--server") + 1].rsplit(':', 1)
+        server = (host, int(port))
+    if "--output" in argv:
+        output_path = os.path.abspath(argv[argv.index("--output") + 1])
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    original_dir = os.getcwd()
+    workdir = prepare_data_dir(os.path.join(project_dir, "data"))
+    process = None
+    server_cpu = None
+    try:
+        if server is None:
+            process, server = start_server()
+        bots, elapsed = asyncio.run(run_load(server[0], server[1], matches, players, difficulty, delay / 1000))
+        if process is not None:
+            output, server_cpu = stop_server(process)
+            process = None
+            print(output)
+    finally:
+        if process is not None:
+            process.kill()
+        os.chdir(original_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = summarize(bots, elapsed, server_cpu)
+    print_report(summary, matches, players)
+    if output_path:
+        with open(output_path, 'w') as file:
+            json.dump(summary, file, indent=2)
+        print(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,178 @@
+# The protocol of the race mode (see util/race_server.py and game/raceBoard.py).
+#
+# Players of a race play copies of one seeded board: the server only sends the seed, the difficulty and the
+# board size once, every client builds the board from them (boards built from the same seed are identical),
+# and from then on only the moves travel, as deltas of a few bytes. The server plays every move on its own
+# copy of the player's board, so the scores are the server's.
+#
+# Every message is framed like a replay record (util/replay.py): the varint length of its body, then the body,
+# which starts with the message type. Fields are varints (zigzag varints for scores) and texts are a varint
+# length followed by UTF-8.
+#
+# Client to server:
+#     JOIN      room, name, difficulty, players, size    Joins a room, or the quick match when the room is empty.
+#                                                        The first player sets the number of players the room
+#                                                        waits for and the board size (0: the difficulty's).
+#     MOVE      event                                    A move, as cell index * ACTION_KINDS + action: a
+#                                                        reveal, a chord or a mark. Marks are not sent on
+#                                                        to the other players.
+#
+# Server to client:
+#     LOBBY     joined, players                          Players in the room so far, sent when it changes.
+#     START     seed, difficulty, size, slot, names      The race starts: the board, the player's own slot and
+#                                                        the names of the players by slot.
+#     DELTA     slot, event, score, words, status        A move of a player, with the player's score, words
+#                                                        found and FLAG_WON / FLAG_LOST status after it.
+#     LEFT      slot                                     A player left the race.
+#     END       winner                                   The race is over: the slot of the winner + 1, or 0.
+#     ERROR     text                                     The message was refused, the connection is closed.
+#
+# A reveal on a board of up to 32x32 cells reaches every player as a DELTA of 7 to 10 bytes, frame included.
+
+from util.replay import write_varint, read_varint, zigzag, unzigzag, FLAG_WON, FLAG_LOST
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_MESSAGE = 4096  # Longest message body accepted
+
+# Message types
+JOIN = 1
+MOVE = 2
+LOBBY = 16
+START = 17
+DELTA = 18
+LEFT = 19
+END = 20
+ERROR = 21
+
+# The fields of every message type: 'v' varint, 'z' zigzag varint, 's' text, 'l' list of texts
+FIELDS = {
+    JOIN: "sssvv",
+    MOVE: "v",
+    LOBBY: "vv",
+    START: "vsvvl",
+    DELTA: "vvzvv",
+    LEFT: "v",
+    END: "v",
+    ERROR: "s",
+}
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def write_text(out, text):
+    data = text.encode('utf-8')
+    write_varint(out, len(data))
+    out += data
+
+
+def read_text(data, pos):
+    length, pos = read_varint(data, pos)
+    if pos + length > len(data):
+        raise ProtocolError("Text cut short")
+    return bytes(data[pos:pos + length]).decode('utf-8'), pos + length
+
+
+def encode(kind, *values):
+
+    # Encodes a message with its frame.
+    #
+    # Args:
+    #     kind (int): The message type.
+    #     values: The fields of the message type, in order (see FIELDS).
+    #
+    # Returns:
+    #     bytes: The length prefix and the body.
+
+    body = bytearray([kind])
+    for field, value in zip(FIELDS[kind], values):
+        if field == 'v':
+            write_varint(body, value)
+        elif field == 'z':
+            write_varint(body, zigzag(value))
+        elif field == 's':
+            write_text(body, value)
+        else:
+            write_varint(body, len(value))
+            for text in value:
+                write_text(body, text)
+    frame = bytearray()
+    write_varint(frame, len(body))
+    return bytes(frame + body)
+
+
+def decode(body):
+
+    # Decodes the body of a message.
+    #
+    # Returns:
+    #     tuple: The message type, then its fields.
+    #
+    # Raises:
+    #     ProtocolError: The message is of an unknown type or damaged.
+
+    if not body or body[0] not in FIELDS:
+        raise ProtocolError("Unknown message")
+    message = [body[0]]
+    pos = 1
+    try:
+        for field in FIELDS[body[0]]:
+            if field == 'v':
+                value, pos = read_varint(body, pos)
+            elif field == 'z':
+                value, pos = read_varint(body, pos)
+                value = unzigzag(value)
+            elif field == 's':
+                value, pos = read_text(body, pos)
+            else:
+                count, pos = read_varint(body, pos)
+                value = []
+                for _ in range(count):
+                    text, pos = read_text(body, pos)
+                    value.append(text)
+            message.append(value)
+    except (IndexError, UnicodeDecodeError):
+        raise ProtocolError("Message cut short")
+    return tuple(message)
+
+
+async def read_message(reader):
+
+    # Reads the next message from a stream.
+    #
+    # Args:
+    #     reader (asyncio.StreamReader): The connection.
+    #
+    # Returns:
+    #     tuple: The decoded message (see decode()), or None when the connection was closed.
+
+    length = 0
+    shift = 0
+    while True:
+        byte = await reader.read(1)
+        if not byte:
+            return None
+        length |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            break
+        shift += 7
+    if length > MAX_MESSAGE:
+        raise ProtocolError("Message too long")
+    try:
+        body = await reader.readexactly(length)
+    except EOFError:
+        return None
+    return decode(body)
+
+
+def status_flags(board):
+
+    # Gets the status of a player's board as FLAG_WON / FLAG_LOST bits (0 while the game goes on).
+
+    if board.game_won and not board.game_lose:
+        return FLAG_WON
+    if board.game_lose:
+        return FLAG_LOST
+    return 0
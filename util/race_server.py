@@ -0,0 +1,390 @@
+# The race server: players race to find the words of the same seeded board, over a local TCP connection.
+#
+# Run it from the project root:
+#
+#     python -m util.race_server [--host HOST] [--port PORT]
+#
+# and pick *Race* in the menu of each player (see game/raceBoard.py), or run util/race_load.py against it.
+#
+# Players join a named room, or the quick match of a difficulty, which groups players as they come. Once a
+# room has all its players the race starts: every player gets the seed of the board, and the server deals
+# the board once and gives each player a copy of it. Every move is played on the copy of its player through the usual
+# game rules (util.replay.apply_event(), the same path as a mouse click), so the score is worked out by
+# the Board classes, and is sent to every player of the room as a delta (see util/race_protocol.py), never as
+# a board. The first player to find all the words with a positive score wins the race.
+#
+# One event loop serves every room. Nothing a room does blocks it: a board takes up to tens of milliseconds to
+# deal, so it is dealt on the worker thread (see util/aio.py) and only copied on the loop, moves are applied as
+# they are read, and the deltas are queued on the connections without waiting for them to be sent. A player
+# whose connection falls too far behind is dropped, rather than holding up their room.
+
+import asyncio
+import os
+import random
+import sys
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.classicBoard import Board
+from game.profiles import get_profile
+from game.words import prepare_word_list
+from util import aio
+from util.race_protocol import (DEFAULT_HOST, DEFAULT_PORT, JOIN, MOVE, LOBBY, START, DELTA, LEFT, END, ERROR,
+                                ProtocolError, encode, read_message, status_flags)
+from util.replay import ACTION_KINDS, REVEAL, MARK, CHORD, apply_event
+
+MAX_PLAYERS = 8
+MAX_NAME_LENGTH = 16
+MAX_ROOM_LENGTH = 32
+MAX_BUFFERED = 64 * 1024  # Bytes queued on a connection before its player is dropped
+JOIN_TIMEOUT = 30  # Seconds a new connection has to join a room
+
+
+class Player:
+
+    # A player of a race.
+    # Attributes:
+    # -----------
+    # slot : int
+    #     The player's place in the room, from 0.
+    # name : str
+    #     The name the other players see.
+    # writer : asyncio.StreamWriter
+    #     The player's connection.
+    # board : Board
+    #     The server's copy of the player's board (None until the race starts).
+    # connected : bool
+    #     Whether the player is still in the race.
+    #
+    # Methods:
+    # --------
+    # playing():
+    #     Checks if the player is still racing.
+    # send(data):
+    #     Queues a message on the player's connection.
+
+    def __init__(self, slot, name, writer):
+        self.slot = slot
+        self.name = name
+        self.writer = writer
+        self.board = None
+        self.connected = True
+
+    def playing(self):
+        return self.connected and self.board is not None and not (self.board.game_won or self.board.game_lose)
+
+    def send(self, data):
+
+        # Queues a message on the player's connection without waiting for it to be sent. A player whose
+        # connection has more than MAX_BUFFERED bytes waiting is dropped: its connection is closed, and the
+        # server takes the player out of the room as for any closed connection.
+
+        if not self.connected or self.writer.is_closing():
+            return
+        self.writer.write(data)
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            self.writer.transport.abort()
+
+
+class Match:
+
+    # A room of players racing on copies of one board.
+    # Attributes:
+    # -----------
+    # room : str
+    #     The name of the room ("" for a quick match).
+    # profile : DifficultyProfile
+    #     The difficulty, at the board size of the room.
+    # capacity : int
+    #     The number of players the race starts with.
+    # seed : int
+    #     The seed of the board.
+    # players : list of Player
+    #     The players, by slot.
+    # board : Board
+    #     The board dealt for the race, which the players get copies of (None until it is dealt).
+    # started : bool
+    #     Whether the race has started: the room is full, its board may still be being dealt.
+    # finished : bool
+    #     Whether the race is over.
+    # winner : Player
+    #     The winner of the race (None if there is none yet, or none at all).
+    #
+    # Methods:
+    # --------
+    # join(name, writer):
+    #     Adds a player, and starts the race once the room is full.
+    # deal():
+    #     Deals the board and gives a copy of it to every player.
+    # move(player, event):
+    #     Plays a move of a player and sends it to the room.
+    # leave(player):
+    #     Takes a player out of the room.
+    # check_over():
+    #     Ends the race once nobody is racing any more.
+    # finish(winner):
+    #     Ends the race.
+    # broadcast(data):
+    #     Sends a message to every player in the room.
+
+    def __init__(self, room, profile, capacity, seed=None):
+        self.room = room
+        self.profile = profile
+        self.capacity = capacity
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.players = []
+        self.board = None
+        self.started = False
+        self.finished = False
+        self.winner = None
+
+    def join(self, name, writer):
+
+        # Adds a player. The player that fills the room starts the race, whose board is then dealt by deal().
+
+        player = Player(len(self.players), name, writer)
+        self.players.append(player)
+        self.broadcast(encode(LOBBY, len(self.players), self.capacity))
+        self.started = len(self.players) == self.capacity
+        return player
+
+    async def deal(self):
+
+        # Deals the board of the race once, on the worker thread so the other rooms go on meanwhile, then gives
+        # every player a copy of it (see Board.copy()) and sends them the start of the race. Moves sent while
+        # the board is dealt are ignored, and a player leaving then does not end the race of the others.
+
+        self.board = await asyncio.wrap_future(aio.in_background(Board, None, None, seed=self.seed,
+                                                                 profile=self.profile))
+        names = [player.name for player in self.players]
+        for player in self.players:
+            player.board = self.board.copy()
+            player.send(encode(START, self.seed, self.profile.name, self.profile.size, player.slot, names))
+        self.check_over()  # Everybody may have left while the board was dealt
+
+    def move(self, player, event):
+
+        # Plays a move of a player on the player's board and sends the resulting delta to the room.
+        # Moves made before the race starts, after the player's game is over, reveals of cells already revealed
+        # and chords that open nothing change nothing and are not sent. Neither are marks, which are only kept
+        # so the chords of the player open the cells they open on the player's screen.
+        #
+        # Args:
+        #     player (Player): The player.
+        #     event (int): The move, as cell index * ACTION_KINDS + action.
+        #
+        # Raises:
+        #     ProtocolError: The move is not a reveal, a mark or a chord of a cell of the board.
+
+        index, action = divmod(event, ACTION_KINDS)
+        if action not in (REVEAL, MARK, CHORD) or index >= self.profile.size ** 2:
+            raise ProtocolError("Moves reveal, mark or chord a cell of the board")
+        if self.finished or not player.playing():
+            return
+        board = player.board
+        moves = board.move_count
+        apply_event(board, action, *divmod(index, board.size))
+        if board.move_count == moves:
+            return
+        self.broadcast(encode(DELTA, player.slot, event, board.score, len(board.revealed_words),
+                              status_flags(board)))
+        if board.game_won and not board.game_lose:
+            self.finish(player)
+        else:
+            self.check_over()
+
+    def leave(self, player):
+
+        # Takes a player out of the room. Before the race, the others move up a slot; during it, the
+        # player's slot stays and the others are told.
+
+        player.connected = False
+        if not self.started:
+            self.players.remove(player)
+            for slot, other in enumerate(self.players):
+                other.slot = slot
+            self.broadcast(encode(LOBBY, len(self.players), self.capacity))
+        elif not self.finished:
+            self.broadcast(encode(LEFT, player.slot))
+            self.check_over()
+
+    def check_over(self):
+        if self.board is not None and not any(player.playing() for player in self.players):
+            self.finish(None)
+
+    def finish(self, winner):
+        self.finished = True
+        self.winner = winner
+        self.broadcast(encode(END, 0 if winner is None else winner.slot + 1))
+
+    def broadcast(self, data):
+        for player in self.players:
+            player.send(data)
+
+
+class RaceServer:
+
+    # Hosts the rooms of every race in one event loop.
+    # Attributes:
+    # -----------
+    # rooms : dict
+    #     Room name -> Match, for the named rooms whose race is not over.
+    # quick_matches : dict
+    #     (difficulty, size, players) -> the Match of the quick match still waiting for players.
+    # races_started, races_finished, moves : int
+    #     Counters, shown when the server stops.
+    #
+    # Methods:
+    # --------
+    # find_match(room, difficulty, capacity, size):
+    #     Gets the room a player joins.
+    # changed(match, started, finished):
+    #     Counts the races started and finished, and forgets the rooms that take no more players.
+    # handle_client(reader, writer):
+    #     Serves one connection.
+    # serve(host, port, ready):
+    #     Listens for connections.
+
+    def __init__(self):
+        self.rooms = {}
+        self.quick_matches = {}
+        self.races_started = 0
+        self.races_finished = 0
+        self.moves = 0
+
+    def find_match(self, room, difficulty, capacity, size):
+
+        # Gets the room a player joins: the named room (created by its first player, whose settings it
+        # keeps), or the quick match waiting for players of the same difficulty, board size and player count.
+        #
+        # Raises:
+        #     ProtocolError: The settings are invalid, or the race of the named room has already started.
+
+        try:
+            profile = get_profile(difficulty)
+        except KeyError:
+            raise ProtocolError(f"Unknown difficulty {difficulty!r}")
+        if not 1 <= capacity <= MAX_PLAYERS:
+            raise ProtocolError(f"A race takes 1 to {MAX_PLAYERS} players")
+        if size and size != profile.size:
+            if not profile.scaled or not profile.min_size <= size <= profile.max_size:
+                raise ProtocolError(f"{difficulty} boards cannot be {size}x{size}")
+            profile = profile.scaled_to(size)
+        if room:
+            match = self.rooms.get(room)
+            if match is None:
+                match = self.rooms[room] = Match(room, profile, capacity)
+            elif match.started:
+                raise ProtocolError(f"The race in room {room!r} has already started")
+            return match
+        key = (difficulty, profile.size, capacity)
+        match = self.quick_matches.get(key)
+        if match is None:
+            match = self.quick_matches[key] = Match("", profile, capacity)
+        return match
+
+    def changed(self, match, started, finished):
+
+        # Counts the race of a room that has just started or finished, and forgets the rooms that take no more
+        # players: a quick match once its race has started or everybody left it, a named room once its race is
+        # over or everybody left it, so the name can be used again.
+        #
+        # Args:
+        #     match (Match): The room.
+        #     started, finished (bool): Whether its race had started and finished before the change.
+
+        if match.started and not started:
+            self.races_started += 1
+        if match.finished and not finished:
+            self.races_finished += 1
+        empty = not any(player.connected for player in match.players)
+        if match.room:
+            if (match.finished or empty) and self.rooms.get(match.room) is match:
+                del self.rooms[match.room]
+        else:
+            key = (match.profile.name, match.profile.size, match.capacity)
+            if (match.started or empty) and self.quick_matches.get(key) is match:
+                del self.quick_matches[key]
+
+    async def handle_client(self, reader, writer):
+
+        # Serves one connection: the JOIN message, then the moves of the player until the connection closes.
+        # A refused message gets an ERROR and closes the connection.
+
+        match = None
+        player = None
+        try:
+            message = await asyncio.wait_for(read_message(reader), JOIN_TIMEOUT)
+            if message is None:
+                return
+            if message[0] != JOIN:
+                raise ProtocolError("Join a room first")
+            _, room, name, difficulty, capacity, size = message
+            if not name or len(name) > MAX_NAME_LENGTH or len(room) > MAX_ROOM_LENGTH:
+                raise ProtocolError(f"Names take 1 to {MAX_NAME_LENGTH} characters, rooms up to {MAX_ROOM_LENGTH}")
+            match = self.find_match(room, difficulty, capacity, size)
+            player = match.join(name, writer)
+            self.changed(match, False, False)
+            if match.started:
+                await match.deal()
+                self.changed(match, True, False)
+            while player.connected:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                if message[0] != MOVE:
+                    raise ProtocolError("Only moves are sent during a race")
+                finished = match.finished
+                match.move(player, message[1])
+                self.moves += 1
+                self.changed(match, True, finished)
+        except ProtocolError as error:
+            writer.write(encode(ERROR, str(error)))
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            if player is not None and player.connected:
+                started, finished = match.started, match.finished
+                match.leave(player)
+                self.changed(match, started, finished)
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+
+        # Listens for connections until cancelled.
+        #
+        # Args:
+        #     host (str): The address to listen on.
+        #     port (int): The port (0 picks a free one).
+        #     ready (callable, optional): Called with the (host, port) listened on once the server is up.
+
+        server = await asyncio.start_server(self.handle_client, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv):
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    if "--host" in argv:
+        host = argv[argv.index("--host") + 1]
+    if "--port" in argv:
+        port = int(argv[argv.index("--port") + 1])
+    prepare_word_list()  # Every board of every room shares the word list
+    server = RaceServer()
+
+    def ready(address):
+        print(f"Race server listening on {address[0]}:{address[1]}", flush=True)
+
+    try:
+        asyncio.run(server.serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
+    print(f"{server.races_started} races started, {server.races_finished} finished, {server.moves} moves")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
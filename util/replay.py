@@ -0,0 +1,514 @@
+# Game replays.
+#
+# Every game records the seed of its board and the moves made, so it can be rebuilt and watched again.
+# The replays of a user are appended to ./data/replays/<user id>.wwr when the game's stats are saved.
+#
+# File format: a sequence of records, each the varint length of its body followed by the body:
+#
+#     version      1 byte (FORMAT_VERSION)
+#     seed         varint
+#     difficulty   varint length + ASCII name of the difficulty profile
+#     size         varint
+#     flags        varint: FLAG_NO_GUESS | FLAG_WON | FLAG_LOST | FLAG_TIMED | FLAG_DAILY | FLAG_FLOOD
+#     started      varint, Unix time the game started
+#     score        zigzag varint, the final score
+#     events       until the end of the body, each two varints:
+#                      ticks since the previous event (TICK_SECONDS each)
+#                      cell index * ACTION_KINDS + action
+#
+# Varints store 7 bits per byte, low bits first, with the top bit set on every byte but the last. A move
+# a few seconds after the previous one on a board of up to 32x32 cells takes 3 bytes, so a whole game is
+# a few hundred bytes. The length prefixes let readers skip a record without decoding it.
+
+import curses
+import os
+import time
+
+REPLAY_DIR = './data/replays'
+REPLAY_SUFFIX = '.wwr'
+FORMAT_VERSION = 1
+
+TICK_SECONDS = 0.1  # Time resolution of the events
+
+# Actions, stored in the low bits of the cell index
+REVEAL = 0
+MARK = 1  # Cycles the flag / question mark of a cell
+CHORD = 2  # Reveals the unflagged neighbours of a revealed cell whose mines are all flagged (Board.chord())
+ACTION_KINDS = 4  # Room for more actions without changing the format
+
+FLAG_NO_GUESS = 1
+FLAG_WON = 2
+FLAG_LOST = 4
+FLAG_TIMED = 8  # Played in the timed mode (game/timedBoard.py)
+FLAG_DAILY = 16  # Played on the board of the daily challenge (game/dailyBoard.py)
+FLAG_FLOOD = 32  # Played with the flood reveal (Board.flood_fill()), which the reveals need to be played again
+
+# Longest wait between two moves when a replay plays by itself
+MAX_PLAY_DELAY = 1.0
+
+
+def write_varint(out, value):
+
+    # Appends a non-negative integer as a varint.
+    #
+    # Args:
+    #     out (bytearray): The buffer to append to.
+    #     value (int): The integer.
+
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+
+    # Reads a varint.
+    #
+    # Args:
+    #     data (bytes): The buffer.
+    #     pos (int): Where the varint starts.
+    #
+    # Returns:
+    #     tuple: The integer and the position after it.
+
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        pos += 1
+        byte = data[pos]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos + 1
+        shift += 7
+
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class Replay:
+
+    # One recorded game.
+    # Attributes:
+    # -----------
+    # seed : int
+    #     The seed the board was built from.
+    # difficulty : str
+    #     The name of the difficulty profile.
+    # size : int
+    #     The board size.
+    # flags : int
+    #     FLAG_NO_GUESS, FLAG_WON and FLAG_LOST bits.
+    # started : int
+    #     Unix time the game started.
+    # score : int
+    #     The final score.
+    # event_data : bytes
+    #     The encoded events, decoded on demand by events().
+    #
+    # Methods:
+    # --------
+    # events():
+    #     Decodes the moves of the game.
+    # encode():
+    #     Encodes the replay as a record body.
+    # decode(body):
+    #     Decodes a record body.
+
+    def __init__(self, seed, difficulty, size, flags, started, score, event_data):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.size = size
+        self.flags = flags
+        self.started = started
+        self.score = score
+        self.event_data = event_data
+
+    def events(self):
+
+        # Decodes the moves of the game.
+        #
+        # Yields:
+        #     tuple: (tick, action, row, col), tick counted in TICK_SECONDS from the start of the game.
+
+        data = self.event_data
+        size = self.size
+        pos = 0
+        tick = 0
+        end = len(data)
+        while pos < end:
+            delta, pos = read_varint(data, pos)
+            code, pos = read_varint(data, pos)
+            tick += delta
+            index, action = divmod(code, ACTION_KINDS)
+            row, col = divmod(index, size)
+            yield tick, action, row, col
+
+    def encode(self):
+        body = bytearray([FORMAT_VERSION])
+        write_varint(body, self.seed)
+        name = self.difficulty.encode('ascii')
+        write_varint(body, len(name))
+        body += name
+        write_varint(body, self.size)
+        write_varint(body, self.flags)
+        write_varint(body, self.started)
+        write_varint(body, zigzag(self.score))
+        body += self.event_data
+        return bytes(body)
+
+    @classmethod
+    def decode(cls, body):
+
+        # Decodes a record body. The events are kept encoded until events() is called.
+        #
+        # Raises:
+        #     ValueError: If the record was written by an unknown version of the format.
+
+        if body[0] != FORMAT_VERSION:
+            raise ValueError(f"Unknown replay format version {body[0]}")
+        seed, pos = read_varint(body, 1)
+        length, pos = read_varint(body, pos)
+        difficulty = bytes(body[pos:pos + length]).decode('ascii')
+        size, pos = read_varint(body, pos + length)
+        flags, pos = read_varint(body, pos)
+        started, pos = read_varint(body, pos)
+        score, pos = read_varint(body, pos)
+        return cls(seed, difficulty, size, flags, started, unzigzag(score), bytes(body[pos:]))
+
+
+class ReplayRecorder:
+
+    # Records the moves of a game as they are made.
+    # Attributes:
+    # -----------
+    # start_time : float
+    #     perf_counter() when the game started.
+    # started : int
+    #     Unix time the game started.
+    # event_data : bytearray
+    #     The encoded events so far.
+    # last_tick : int
+    #     The tick of the last event.
+    #
+    # Methods:
+    # --------
+    # record(action, index):
+    #     Records a move.
+    # set_tick(tick):
+    #     Sets the clock back or forward to a tick, for playing a replay again.
+    # finish(board):
+    #     Builds the replay of the finished game.
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.started = int(time.time())
+        self.event_data = bytearray()
+        self.last_tick = 0
+
+    def record(self, action, index):
+
+        # Records a move.
+        #
+        # Args:
+        #     action (int): REVEAL or MARK.
+        #     index (int): The index of the cell (row * size + col).
+
+        tick = int((time.perf_counter() - self.start_time) / TICK_SECONDS)
+        write_varint(self.event_data, max(0, tick - self.last_tick))
+        write_varint(self.event_data, index * ACTION_KINDS + action)
+        self.last_tick = max(tick, self.last_tick)
+
+    def set_tick(self, tick):
+
+        # Sets the clock so that the next move is recorded at a tick, for boards playing a replay again: the
+        # time bonus of the timed mode is counted from the tick of the last move.
+
+        self.start_time = time.perf_counter() - (tick + 0.5) * TICK_SECONDS
+
+    def finish(self, board):
+
+        # Builds the replay of a game.
+        #
+        # Args:
+        #     board (Board): The board the game was played on.
+        #
+        # Returns:
+        #     Replay: The replay.
+
+        flags = 0
+        if board.no_guess:
+            flags |= FLAG_NO_GUESS
+        if board.game_won:
+            flags |= FLAG_WON
+        if board.game_lose:
+            flags |= FLAG_LOST
+        if board.timed:
+            flags |= FLAG_TIMED
+        if board.daily:
+            flags |= FLAG_DAILY
+        if board.flood:
+            flags |= FLAG_FLOOD
+        return Replay(board.seed, board.profile.name, board.size, flags, self.started, board.score,
+                      bytes(self.event_data))
+
+
+def replay_path(user_id):
+    return os.path.join(REPLAY_DIR, user_id + REPLAY_SUFFIX)
+
+
+def save_replay(user_id, replay):
+
+    # Appends a replay to the replay file of a user.
+    #
+    # Args:
+    #     user_id (str): The user.
+    #     replay (Replay): The replay.
+
+    body = replay.encode()
+    record = bytearray()
+    write_varint(record, len(body))
+    record += body
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    with open(replay_path(user_id), 'ab') as file:
+        file.write(record)
+
+
+def iter_records(data):
+
+    # Splits the content of a replay file into record bodies, without decoding them.
+    # A record cut short (e.g. by a crash while it was written) ends the file.
+    #
+    # Args:
+    #     data (bytes): The content of a replay file.
+    #
+    # Yields:
+    #     memoryview: The body of every record.
+
+    view = memoryview(data)
+    pos = 0
+    end = len(data)
+    while pos < end:
+        try:
+            length, body_start = read_varint(data, pos)
+        except IndexError:
+            return
+        if body_start + length > end:
+            return
+        yield view[body_start:body_start + length]
+        pos = body_start + length
+
+
+def load_replays(user_id):
+
+    # Reads every replay of a user, oldest first.
+    #
+    # Returns:
+    #     list of Replay: The replays (empty if the user has none).
+
+    path = replay_path(user_id)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as file:
+        data = file.read()
+    replays = []
+    for body in iter_records(data):
+        try:
+            replays.append(Replay.decode(body))
+        except (ValueError, IndexError):
+            continue  # Written by another version of the format, or damaged
+    return replays
+
+
+def build_board(replay, stdscr=None):
+
+    # Rebuilds the board a replay was played on, before any move.
+    #
+    # Args:
+    #     replay (Replay): The replay.
+    #     stdscr (curses.window, optional): The screen to draw the board on.
+    #
+    # Returns:
+    #     Board: The board, without a user so nothing is recorded for it.
+
+    from game.profiles import get_profile
+    if replay.flags & FLAG_TIMED:
+        from game.timedBoard import TimedBoard as Board
+    else:
+        from game.classicBoard import Board
+    board = Board(stdscr, None, size=replay.size, seed=replay.seed, profile=get_profile(replay.difficulty))
+    board.flood = bool(replay.flags & FLAG_FLOOD)
+    return board
+
+
+def apply_event(board, action, row, col, tick=None):
+
+    # Applies one recorded move to a board, as the game loop does.
+    # The tick of the move matters to the timed mode only, whose time bonus depends on it.
+
+    covered = board.grid.cells[row * board.size + col] & 1  # game.grid.COVERED
+    if covered if action == CHORD else not covered:  # Chords are made on revealed cells, other moves on covered ones
+        return
+    if tick is not None:
+        board.replay.set_tick(tick)
+    if action == MARK:
+        board.toggle_mark(row, col)
+    elif action == REVEAL or action == CHORD:
+        if action == REVEAL:
+            board.reveal_cell(row, col)
+        elif not board.chord(row, col):
+            return
+        if not board.check_all_words_revealed():
+            board.check_if_mine_stepped_lost()
+
+
+def describe(replay):
+    outcome = "won" if replay.flags & FLAG_WON else "lost" if replay.flags & FLAG_LOST else "left"
+    started = time.strftime('%Y-%m-%d %H:%M', time.localtime(replay.started))
+    mode = "Timed " if replay.flags & FLAG_TIMED else "Daily " if replay.flags & FLAG_DAILY else ""
+    return f"{started}  {mode}{replay.difficulty}-{replay.size}  {outcome:<5} {replay.score:>8}"
+
+
+class ReplayViewer:
+
+    # Steps through a replay on screen, drawing every position with Board.draw_board().
+    # Attributes:
+    # -----------
+    # stdscr : curses.window
+    #     The screen.
+    # replay : Replay
+    #     The replay shown.
+    # events : list
+    #     The decoded moves.
+    # position : int
+    #     How many moves the board shows.
+    # board : Board
+    #     The rebuilt board after position moves.
+    # playing : bool
+    #     Whether the replay moves on by itself, at the pace of the game.
+    #
+    # Methods:
+    # --------
+    # seek(position):
+    #     Shows the board after the given number of moves.
+    # run(keys):
+    #     Runs the viewer until ESC is pressed.
+
+    def __init__(self, stdscr, replay):
+        self.stdscr = stdscr
+        self.replay = replay
+        self.events = list(replay.events())
+        self.position = 0
+        self.board = build_board(replay, stdscr)
+        self.playing = False
+
+    def seek(self, position):
+
+        # Shows the board after the given number of moves. Going back rebuilds the board from its seed.
+
+        position = max(0, min(len(self.events), position))
+        if position < self.position:
+            viewport = self.board.viewport
+            self.board = build_board(self.replay, self.stdscr)
+            self.board.viewport = viewport  # Stay on the same part of the board
+            self.position = 0
+        for tick, action, row, col in self.events[self.position:position]:
+            apply_event(self.board, action, row, col, tick)
+        self.position = position
+
+    def draw(self):
+        self.board.draw_board()
+        h, w = self.stdscr.getmaxyx()
+        tick = self.events[self.position - 1][0] if self.position else 0
+        status = (f"Replay {describe(self.replay)}  move {self.position}/{len(self.events)}  "
+                  f"{tick * TICK_SECONDS:6.1f} s  {'playing' if self.playing else 'paused'}")
+        self.stdscr.addstr(0, 2, status[:w - 4], curses.A_REVERSE)
+        self.stdscr.addstr(1, 2, "Space/. next  , back  p play/pause  g/G first/last  esc back"[:w - 4])
+        self.stdscr.refresh()
+
+    async def run(self, keys):
+
+        # Runs the viewer: Space or '.' shows the next move, ',' the previous one, 'p' plays the moves at the
+        # pace they were made (pauses longer than MAX_PLAY_DELAY are cut short), 'g' / 'G' jump to the first
+        # and last move, the scrolling keys of the game move around large boards and ESC leaves.
+        #
+        # Args:
+        #     keys (util.aio.KeyStream): The keys of the screen, awaited until the next move is due.
+
+        while True:
+            self.draw()
+            delay = None
+            if self.playing and self.position < len(self.events):
+                previous_tick = self.events[self.position - 1][0] if self.position else 0
+                delay = min(MAX_PLAY_DELAY, (self.events[self.position][0] - previous_tick) * TICK_SECONDS)
+            else:
+                self.playing = False
+            key = await keys.get(delay)
+            if key == -1:
+                self.seek(self.position + 1)
+            elif key == 27:  # ESC key
+                return
+            elif key in (ord(' '), ord('.')):
+                self.seek(self.position + 1)
+            elif key == ord(','):
+                self.seek(self.position - 1)
+            elif key == ord('g'):
+                self.seek(0)
+            elif key == ord('G'):
+                self.seek(len(self.events))
+            elif key == ord('p'):
+                self.playing = not self.playing
+            elif key == curses.KEY_MOUSE:
+                _, _, _, _, button_state = curses.getmouse()
+                self.board.handle_scroll(key, button_state)
+            else:
+                self.board.handle_scroll(key)
+
+
+async def choose_replay(stdscr, keys, replays):
+
+    # Lists the replays of a user, newest first, and lets the user pick one with the arrow keys and Enter.
+    #
+    # Args:
+    #     stdscr (curses.window): The screen.
+    #     keys (util.aio.KeyStream): The keys of the screen.
+    #     replays (list of Replay): The replays, oldest first.
+    #
+    # Returns:
+    #     Replay: The picked replay, or None if ESC was pressed.
+
+    replays = replays[::-1]
+    current = 0
+    top = 0
+    while True:
+        stdscr.clear()
+        h, w = stdscr.getmaxyx()
+        stdscr.addstr(1, 2, "Replays (Enter to watch, ESC to go back)")
+        if not replays:
+            stdscr.addstr(3, 2, "No games recorded yet.")
+        rows = max(1, h - 5)
+        top = min(max(top, current - rows + 1), current)
+        for offset, replay in enumerate(replays[top:top + rows]):
+            line = f"{describe(replay)}  {len(replay.event_data) + 20:>5} B"[:w - 4]
+            if top + offset == current:
+                stdscr.addstr(3 + offset, 2, line, curses.color_pair(1))
+            else:
+                stdscr.addstr(3 + offset, 2, line)
+        stdscr.refresh()
+        key = await keys.get()
+        if key == 27:  # ESC key
+            return None
+        elif key == curses.KEY_UP and current > 0:
+            current -= 1
+        elif key == curses.KEY_DOWN and current < len(replays) - 1:
+            current += 1
+        elif (key == curses.KEY_ENTER or key in [10, 13]) and replays:
+            return replays[current]
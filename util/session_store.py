@@ -0,0 +1,97 @@
+# An in-memory store of the games played through the HTTP API (see util/http_api.py).
+#
+# Sessions are kept in an OrderedDict in the order they were last used, so both limits cost O(1) per request:
+# the least recently used session is the first one, evicted when the store is full, and the sessions idle for
+# longer than the time to live are all at the front, dropped by expire() from there until the first session
+# still alive. A session that expired but was not swept yet is never handed out.
+
+import time
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 10000
+DEFAULT_TTL = 1800  # Seconds a game is kept after its last request
+
+
+class SessionStore:
+
+    # The sessions of the HTTP API, with LRU eviction and a time to live.
+    # Attributes:
+    # -----------
+    # capacity : int
+    #     Sessions kept at most.
+    # ttl : float
+    #     Seconds a session is kept after it was last used.
+    # sessions : OrderedDict
+    #     Session ID -> (last use, value), least recently used first.
+    # evicted, expired : int
+    #     Sessions dropped to make room, and for being idle too long.
+    #
+    # Methods:
+    # --------
+    # add(session_id, value):
+    #     Stores a new session, evicting the least recently used one if the store is full.
+    # get(session_id):
+    #     Gets a session and marks it used.
+    # remove(session_id):
+    #     Drops a session.
+    # expire():
+    #     Drops the sessions idle for longer than the time to live.
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def add(self, session_id, value):
+        self.expire()
+        while len(self.sessions) >= self.capacity:
+            self.sessions.popitem(last=False)
+            self.evicted += 1
+        self.sessions[session_id] = (self.clock(), value)
+
+    def get(self, session_id):
+
+        # Gets a session and marks it as just used.
+        #
+        # Returns:
+        #     The value of the session, or None if there is none (or it has expired).
+
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            return None
+        now = self.clock()
+        if now - entry[0] > self.ttl:
+            del self.sessions[session_id]
+            self.expired += 1
+            return None
+        self.sessions[session_id] = (now, entry[1])
+        self.sessions.move_to_end(session_id)
+        return entry[1]
+
+    def remove(self, session_id):
+
+        # Drops a session.
+        #
+        # Returns:
+        #     bool: Whether there was one.
+
+        return self.sessions.pop(session_id, None) is not None
+
+    def expire(self):
+
+        # Drops the sessions idle for longer than the time to live, from the least recently used one on.
+
+        deadline = self.clock() - self.ttl
+        sessions = self.sessions
+        while sessions:
+            session_id, (last_used, _) = next(iter(sessions.items()))
+            if last_used > deadline:
+                break
+            del sessions[session_id]
+            self.expired += 1
@@ -0,0 +1,255 @@
+# Snapshots of games in progress, so a game left with ESC can be resumed later from the user menu.
+#
+# A board is rebuilt from its seed like a replay (util/replay.py), so a snapshot only holds what the moves
+# changed: which cells are covered, flagged or question-marked, the score and the counters of the scoring rules,
+# and the replay recorded so far, which goes on when the game is resumed. The snapshot of a user is rewritten after
+# every move of a classic game (see Board.autosave()), on the I/O thread, to ./data/snapshots/<user id>.wws, and
+# removed once the game is over. A user has one snapshot at most: starting another game replaces it on its
+# first move.
+#
+# File format (numbers are varints, see util/replay.py):
+#
+#     version               1 byte (FORMAT_VERSION)
+#     seed                  varint
+#     difficulty            varint length + ASCII name of the difficulty profile
+#     size                  varint
+#     flags                 varint: FLAG_NO_GUESS | FLAG_FLOOD
+#     started               varint, Unix time the game started
+#     score                 zigzag varint
+#     move_count, mine_stepped_counter, random_click_counter
+#                           varints
+#     random_click_cap      varint, the cap + 1 (0 for None)
+#     base_penalty_random   zigzag varint
+#     last_revealed         varint, the cell index + 1 (0 for None)
+#     current_word          varint, its position in the selected words + 1 (0 for None)
+#     words                 varint, the number of selected words
+#     revealed_words        varint, one bit per selected word, in the order they were selected
+#     word_reveal_status    per selected word: varint count, then the cell indexes
+#     last_tick             varint, the replay tick of the last move
+#     events                varint length + the replay events so far
+#     covered               one bit per cell, first cell first, (size * size + 7) // 8 bytes
+#     flagged, questioned   the same
+#
+# A 12x12 game of 30 moves takes under 200 bytes, most of them its replay, and encoding it takes about 10
+# microseconds (100 on a 100x100 board): the bitsets are packed through one big integer rather than cell by cell.
+
+import os
+from game.grid import COVERED, FLAGGED, QUESTIONED, MINE
+from util.replay import write_varint, read_varint, zigzag, unzigzag, FLAG_NO_GUESS, FLAG_FLOOD
+
+SNAPSHOT_DIR = './data/snapshots'
+SNAPSHOT_SUFFIX = '.wws'
+FORMAT_VERSION = 1
+
+# Translation tables between cell states and bytes of 0 / 1, and between those and ASCII '0' / '1'
+_BIT_OF = {bit: bytes(1 if state & bit else 0 for state in range(256)) for bit in (COVERED, FLAGGED, QUESTIONED)}
+_STATE_OF = {bit: bytes([0, bit]) + bytes(254) for bit in (COVERED, FLAGGED, QUESTIONED)}
+_MINE_ONLY = bytes(state & MINE for state in range(256))
+_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_ASCII = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def pack_bits(cells, bit):
+
+    # Packs one state bit of every cell into a bitset, the first cell in the highest bit of the first byte.
+
+    count = len(cells)
+    digits = cells.translate(_BIT_OF[bit]).translate(_TO_ASCII)
+    return int(digits, 2).to_bytes((count + 7) // 8, 'big')
+
+
+def unpack_bits(data, count, bit):
+
+    # Unpacks a bitset of pack_bits() into the state bit of every cell: bytes of 0 or bit.
+
+    digits = format(int.from_bytes(data, 'big'), f'0{count}b').encode()
+    return digits.translate(_FROM_ASCII).translate(_STATE_OF[bit])
+
+
+def encode(board):
+
+    # Builds the snapshot of a game in progress.
+    #
+    # Args:
+    #     board (Board): The board being played.
+    #
+    # Returns:
+    #     bytes: The snapshot.
+
+    body = bytearray([FORMAT_VERSION])
+    write_varint(body, board.seed)
+    name = board.profile.name.encode('ascii')
+    write_varint(body, len(name))
+    body += name
+    write_varint(body, board.size)
+    write_varint(body, (FLAG_NO_GUESS if board.no_guess else 0) | (FLAG_FLOOD if board.flood else 0))
+    write_varint(body, board.replay.started)
+    write_varint(body, zigzag(board.score))
+    write_varint(body, board.move_count)
+    write_varint(body, board.mine_stepped_counter)
+    write_varint(body, board.random_click_counter)
+    write_varint(body, 0 if board.random_click_cap is None else board.random_click_cap + 1)
+    write_varint(body, zigzag(board.base_penalty_random))
+    write_varint(body, 0 if board.last_revealed is None else board.last_revealed + 1)
+    words = board.selected_words
+    write_varint(body, 0 if board.current_word is None else words.index(board.current_word) + 1)
+    write_varint(body, len(words))
+    write_varint(body, sum(1 << position for position, word in enumerate(words) if word in board.revealed_words))
+    for word in words:
+        cells = board.word_reveal_status.get(word, [])
+        write_varint(body, len(cells))
+        for index in cells:
+            write_varint(body, index)
+    write_varint(body, board.replay.last_tick)
+    write_varint(body, len(board.replay.event_data))
+    body += board.replay.event_data
+    cells = board.grid.cells
+    for bit in (COVERED, FLAGGED, QUESTIONED):
+        body += pack_bits(cells, bit)
+    return bytes(body)
+
+
+def restore(data, stdscr, user):
+
+    # Rebuilds a game from its snapshot: the board from its seed, then the state the moves left it in.
+    #
+    # Args:
+    #     data (bytes): The snapshot.
+    #     stdscr (curses.window): The screen to play on.
+    #     user (User): The player.
+    #
+    # Returns:
+    #     Board: The board, ready to be played on.
+    #
+    # Raises:
+    #     ValueError: The snapshot is damaged or was written by another version of the format.
+
+    from game.classicBoard import Board
+    from game.profiles import get_profile
+    try:
+        if data[0] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data[0]}")
+        seed, pos = read_varint(data, 1)
+        length, pos = read_varint(data, pos)
+        difficulty = data[pos:pos + length].decode('ascii')
+        pos += length
+        size, pos = read_varint(data, pos)
+        flags, pos = read_varint(data, pos)
+        values = []
+        for _ in range(10):
+            value, pos = read_varint(data, pos)
+            values.append(value)
+        (started, score, moves, mines_stepped, random_clicks, random_click_cap, base_penalty, last_revealed,
+         current_word, word_count) = values
+        # The seed of a no-guess board is the one of its fair layout, which it is rebuilt from directly
+        board = Board(stdscr, user, size=size, seed=seed, profile=get_profile(difficulty))
+        board.no_guess = bool(flags & FLAG_NO_GUESS)
+        board.flood = bool(flags & FLAG_FLOOD)
+        words = board.selected_words
+        if word_count != len(words):
+            raise ValueError("The board of the snapshot cannot be rebuilt")
+        revealed, pos = read_varint(data, pos)
+        status = {}
+        for word in words:
+            count, pos = read_varint(data, pos)
+            cells = []
+            for _ in range(count):
+                index, pos = read_varint(data, pos)
+                cells.append(index)
+            status[word] = cells
+        last_tick, pos = read_varint(data, pos)
+        length, pos = read_varint(data, pos)
+        events = data[pos:pos + length]
+        pos += length
+        cell_count = size * size
+        bitset_length = (cell_count + 7) // 8
+        state = int.from_bytes(board.grid.cells.translate(_MINE_ONLY), 'big')
+        for bit in (COVERED, FLAGGED, QUESTIONED):
+            bitset = data[pos:pos + bitset_length]
+            if len(bitset) != bitset_length:
+                raise ValueError("The snapshot is cut short")
+            state |= int.from_bytes(unpack_bits(bitset, cell_count, bit), 'big')
+            pos += bitset_length
+    except (IndexError, UnicodeDecodeError, KeyError) as error:
+        raise ValueError(f"Damaged snapshot ({error!r})")
+
+    board.grid.cells[:] = state.to_bytes(cell_count, 'big')
+    board.grid.revealed_cells = cell_count - board.grid.cells.translate(_BIT_OF[COVERED]).count(1)
+    board.minimap = type(board.minimap)(board.grid)
+    board.score = unzigzag(score)
+    board.move_count = moves
+    board.mine_stepped_counter = mines_stepped
+    board.random_click_counter = random_clicks
+    board.random_click_cap = None if random_click_cap == 0 else random_click_cap - 1
+    board.base_penalty_random = unzigzag(base_penalty)
+    board.last_revealed = None if last_revealed == 0 else last_revealed - 1
+    board.current_word = None if current_word == 0 else words[current_word - 1]
+    board.revealed_words = {word for position, word in enumerate(words) if revealed >> position & 1}
+    board.word_reveal_status = status
+    board.replay.started = started
+    board.replay.event_data = bytearray(events)
+    board.replay.last_tick = last_tick
+    board.replay.set_tick(last_tick)  # The time away from the game is not recorded
+    board.saved_events = len(events)
+    return board
+
+
+def snapshot_path(user_id):
+    return os.path.join(SNAPSHOT_DIR, user_id + SNAPSHOT_SUFFIX)
+
+
+def save_snapshot(user_id, data):
+
+    # Writes the snapshot of a user, replacing the previous one in one step, so a crash mid-write leaves the
+    # previous snapshot whole. Runs on the I/O thread (see util/aio.py).
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = snapshot_path(user_id)
+    with open(path + '.tmp', 'wb') as file:
+        file.write(data)
+    os.replace(path + '.tmp', path)
+
+
+def load_snapshot(user_id):
+
+    # Reads the snapshot of a user.
+    #
+    # Returns:
+    #     bytes: The snapshot, or None if the user has no game to resume.
+
+    try:
+        with open(snapshot_path(user_id), 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def remove_snapshot(user_id):
+    try:
+        os.remove(snapshot_path(user_id))
+    except FileNotFoundError:
+        pass
+
+
+def describe(data):
+
+    # Describes the game of a snapshot for the menu, e.g. "Hard-10, 14 moves, score 120".
+    #
+    # Returns:
+    #     str: The description, or None if the snapshot is damaged.
+
+    try:
+        if data[0] != FORMAT_VERSION:
+            return None
+        _, pos = read_varint(data, 1)
+        length, pos = read_varint(data, pos)
+        difficulty = data[pos:pos + length].decode('ascii')
+        pos += length
+        size, pos = read_varint(data, pos)
+        _, pos = read_varint(data, pos)
+        _, pos = read_varint(data, pos)
+        score, pos = read_varint(data, pos)
+        moves, pos = read_varint(data, pos)
+    except (IndexError, UnicodeDecodeError):
+        return None
+    return f"{difficulty}-{size}, {moves} moves, score {unzigzag(score)}"
@@ -0,0 +1,183 @@
+# Tournament of the bot strategies of game/bots.py.
+#
+# Run it from the project root:
+#
+#     python -m util.tournament [--games N] [--strategies random,greedy,solver] [--difficulties Easy,Hard]
+#                               [--size SIZE] [--workers N] [--output PATH]
+#
+# Every strategy plays the same seeded boards of every difficulty (seeds 0 to N-1), so their scores can be
+# compared game by game. The games are spread over worker processes. The boards keep the score under the
+# usual rules (calculate_total_score(), penalty_multiplier(), the random click caps and bonus points), and
+# the report lists the mean, spread and extremes of the scores and how often each strategy won, to see how
+# the scoring system treats different ways of playing.
+#
+# The games run inside a temporary copy of the data directory, as the benchmarks do, so the real words and
+# users are never touched. --output writes every game and the summary as JSON.
+
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import time
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.bots import STRATEGIES, play
+from util.benchmark import DIFFICULTIES, prepare_data_dir
+
+DEFAULT_GAMES = 100
+
+
+def play_match(task):
+
+    # Plays one game of a strategy on a seeded board. Runs in a worker process.
+    #
+    # Args:
+    #     task (tuple): (strategy name, difficulty name, board size, seed).
+    #
+    # Returns:
+    #     dict: The task and the outcome of the game.
+
+    strategy_name, difficulty, size, seed = task
+    board_class = next(board_class for name, board_class, _ in DIFFICULTIES if name == difficulty)
+    board = play(board_class(None, None, size=size, seed=seed), STRATEGIES[strategy_name](seed))
+    return {
+        "strategy": strategy_name,
+        "difficulty": difficulty,
+        "size": size,
+        "seed": seed,
+        "score": board.score,
+        "won": board.game_won,
+        "mine_lose": board.mine_lose,
+        "words_found": len(board.revealed_words),
+        "words": len(board.selected_words),
+        "moves": board.move_count,
+        "mines_stepped": board.mine_stepped_counter,
+    }
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(games):
+
+    # Sums up the games of every difficulty and strategy.
+    #
+    # Args:
+    #     games (list of dict): The results of play_match().
+    #
+    # Returns:
+    #     list of dict: One summary per difficulty and strategy, in the order they were first played.
+
+    groups = {}
+    for game in games:
+        groups.setdefault((game["difficulty"], game["size"], game["strategy"]), []).append(game)
+    summaries = []
+    for (difficulty, size, strategy), group in groups.items():
+        scores = sorted(game["score"] for game in group)
+        summaries.append({
+            "difficulty": difficulty,
+            "size": size,
+            "strategy": strategy,
+            "games": len(group),
+            "mean": statistics.mean(scores),
+            "stddev": statistics.stdev(scores) if len(scores) > 1 else 0.0,
+            "median": statistics.median(scores),
+            "min": scores[0],
+            "p5": percentile(scores, 0.05),
+            "p95": percentile(scores, 0.95),
+            "max": scores[-1],
+            "negative": sum(score < 0 for score in scores) / len(scores),
+            "won": sum(game["won"] for game in group) / len(group),
+            "mine_lose": sum(game["mine_lose"] for game in group) / len(group),
+            "words_found": statistics.mean(game["words_found"] / game["words"] for game in group),
+            "moves": statistics.mean(game["moves"] for game in group),
+        })
+    return summaries
+
+
+def print_report(summaries):
+    print(f"{'difficulty':<12}{'strategy':<10}{'games':>6}{'mean':>10}{'stddev':>10}{'min':>9}{'median':>9}"
+          f"{'max':>9}{'<0':>6}{'won':>6}{'mines':>7}{'words':>7}{'moves':>7}")
+    for summary in summaries:
+        print(f"{summary['difficulty'] + '-' + str(summary['size']):<12}{summary['strategy']:<10}{summary['games']:>6}"
+              f"{summary['mean']:>10.0f}{summary['stddev']:>10.0f}{summary['min']:>9}{summary['median']:>9.0f}"
+              f"{summary['max']:>9}{summary['negative']:>6.0%}{summary['won']:>6.0%}{summary['mine_lose']:>7.0%}"
+              f"{summary['words_found']:>7.0%}{summary['moves']:>7.1f}")
+
+
+def run_tournament(strategies, difficulties, games, size=None, workers=None):
+
+    # Plays every strategy on the seeded boards of every difficulty, spread over worker processes.
+    # Must run in a directory holding the data files (see prepare_data_dir()).
+    #
+    # Args:
+    #     strategies (list of str): Names of the strategies, keys of game.bots.STRATEGIES.
+    #     difficulties (list of str): Names of the difficulties.
+    #     games (int): Boards per difficulty.
+    #     size (int, optional): The board size of every difficulty (default: the size of each difficulty).
+    #     workers (int, optional): Worker processes (default: one per CPU).
+    #
+    # Returns:
+    #     list of dict: The results of play_match(), in task order.
+
+    sizes = {name: default_size for name, _, default_size in DIFFICULTIES}
+    tasks = [(strategy, difficulty, size or sizes[difficulty], seed)
+             for difficulty in difficulties for seed in range(games) for strategy in strategies]
+    with multiprocessing.Pool(workers) as pool:
+        # The slow solver games and the fast random ones are mixed in every chunk
+        return pool.map(play_match, tasks, chunksize=max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 8)))
+
+
+def main(argv):
+    games = DEFAULT_GAMES
+    strategies = list(STRATEGIES)
+    difficulties = [name for name, _, _ in DIFFICULTIES]
+    size = None
+    workers = None
+    output_path = None
+    if "--games" in argv:
+        games = int(argv[argv.index("--games") + 1])
+    if "--strategies" in argv:
+        strategies = argv[argv.index("--strategies") + 1].split(',')
+    if "--difficulties" in argv:
+        difficulties = argv[argv.index("--difficulties") + 1].split(',')
+    if "--size" in argv:
+        size = int(argv[argv.index("--size") + 1])
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+    if "--output" in argv:
+        output_path = os.path.abspath(argv[argv.index("--output") + 1])
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            sys.exit(f"Unknown strategy {strategy!r}, pick from {', '.join(STRATEGIES)}")
+    for difficulty in difficulties:
+        if difficulty not in [name for name, _, _ in DIFFICULTIES]:
+            sys.exit(f"Unknown difficulty {difficulty!r}, pick from {', '.join(name for name, _, _ in DIFFICULTIES)}")
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    original_dir = os.getcwd()
+    workdir = prepare_data_dir(os.path.join(project_dir, "data"))
+    start = time.perf_counter()
+    try:
+        results = run_tournament(strategies, difficulties, games, size, workers)
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+
+    summaries = summarize(results)
+    print_report(summaries)
+    print(f"\n{len(results)} games in {elapsed:.1f} s")
+    if output_path:
+        with open(output_path, 'w') as file:
+            json.dump({"summary": summaries, "games": results}, file, indent=2)
+        print(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,94 @@
+# An in-memory index of the user IDs, for registration and login.
+#
+# The IDs are kept sorted by their casefolded form, so the IDs starting with what the player has typed so far
+# are one range found by binary search (the login list filters as the player types, see util/list_view.py),
+# and in a set of casefolded IDs, so checking whether a new ID is taken costs a hash of the ID instead of a
+# scan of the user file. IDs differing only in case count as taken: replays are stored in one file per user
+# ID, and those would clash on case-insensitive file systems.
+#
+# The index is read from the user store the first time it is needed and updated by add() on registration,
+# so the menu comes up without reading the user file. The screens read it with load() on the I/O thread (see
+# util/aio.py), the one thread that reads and writes the user file, before they use it.
+
+from bisect import bisect_right
+from util import user_store
+from util.list_view import SortedIndex
+
+_index = None
+
+
+class UserIndex(SortedIndex):
+
+    # The sorted user IDs (see SortedIndex), read from the user store on first use.
+    # Attributes:
+    # -----------
+    # path : str
+    #     The user file.
+    # loaded : bool
+    #     Whether the IDs have been read.
+    # folded : set of str
+    #     The casefolded IDs.
+    #
+    # Methods:
+    # --------
+    # load():
+    #     Reads the IDs from the user store, if they have not been read yet.
+    # user_id in index:
+    #     Checks if an ID (or the same ID in another case) is taken.
+    # add(user_id):
+    #     Adds the ID of a new user.
+    # invalidate():
+    #     Makes the next use read the user store again.
+
+    def __init__(self, path=user_store.STATS_PATH):
+        self.path = path
+        self.loaded = False
+        self.keys = []
+        self.items = []
+        self.folded = set()
+
+    def load(self):
+        if not self.loaded:
+            SortedIndex.__init__(self, user_store.iter_user_ids(self.path))
+            self.folded = set(self.keys)
+            self.loaded = True
+
+    def __len__(self):
+        self.load()
+        return len(self.items)
+
+    def __getitem__(self, index):
+        self.load()
+        return self.items[index]
+
+    def __contains__(self, user_id):
+        self.load()
+        return user_id.casefold() in self.folded
+
+    def prefix_range(self, prefix):
+        self.load()
+        return SortedIndex.prefix_range(self, prefix)
+
+    def add(self, user_id):
+
+        # Adds the ID of a new user, keeping the index sorted.
+
+        self.load()
+        key = user_id.casefold()
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.items.insert(position, user_id)
+        self.folded.add(key)
+
+    def invalidate(self):
+        self.loaded = False
+
+
+def get_user_index():
+
+    # Returns the user index shared by the menu and the statistics screen, created on first use.
+
+    global _index
+    if _index is None:
+        _index = UserIndex()
+    return _index
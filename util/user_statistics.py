@@ -1,21 +1,26 @@
+import asyncio
 import curses
-import os
+from util import aio
 from util.user import User
+from util.user_index import get_user_index
+from util.list_view import ListView
 
 class UserStatistics:
     # A class to manage and display user statistics in a terminal-based interface using curses.
     # Attributes:
     #     stdscr (curses.window): The main window object for curses.
-    #     users (list): A list of User objects loaded from a file.
+    #     keys (util.aio.KeyStream): The keys of the screen.
+    #     users (UserIndex): The sorted user IDs.
     #     current_user (User): The currently selected user.
+    #     user_list (ListView): The scrolling, searchable list of users (see util/list_view.py).
     # Methods:
-    #     __init__(stdscr):
-    #         Initializes the UserStatistics object with the given curses window.
+    #     __init__(stdscr, keys):
+    #         Initializes the UserStatistics object with the given curses window and keys.
     #     load_users():
-    #         Loads user data from a file and returns a list of User objects.
+    #         Gets the index of the user IDs.
     #     check_window_size():
     #         Checks if the terminal window size meets the minimum requirements.
-    #         Displays a message and waits for user input if the window is too small.
+    #         Displays a message and awaits a key if the window is too small.
     #     display():
     #         Main loop to display user statistics. Continuously checks window size and
     #         allows user to select a user and view their statistics.
@@ -26,46 +31,39 @@ class UserStatistics:
     #         Displays the statistics of the currently selected user.
     #         Waits for user input to return to user selection.
 
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, keys):
 
         # Initializes the UserStatistics class.
         # 
         # Args:
         #     stdscr: The standard screen object for the curses application.
+        #     keys (util.aio.KeyStream): The keys of the screen.
         # 
         # Attributes:
         #     stdscr: The standard screen object for the curses application.
-        #     users (dict): A dictionary of users loaded from storage.
+        #     keys: The keys of the screen, awaited instead of blocking in getch().
+        #     users (UserIndex): The sorted user IDs.
         #     current_user: The currently active user, initially set to None.
+        #     user_list (ListView): The user selection list, created when it is first shown.
 
         self.stdscr = stdscr
+        self.keys = keys
         self.users = self.load_users()
         self.current_user = None
+        self.user_list = None
 
     def load_users(self):
 
-        # Loads user data from a file and returns a list of User objects.
-        # 
-        # The method reads from './data/user.txt' and expects each line in the file to contain
-        # 11 comma-separated values corresponding to the attributes of a User object.
-        # 
+        # Gets the index of the user IDs shared with the menu (see util/user_index.py), read on the I/O thread
+        # by display(). The statistics of a user are read from the user store when the user is selected, so they
+        # are never stale.
+        #
         # Returns:
-        #     list: A list of User objects loaded from the file.
-        # 
-        # Raises:
-        #     ValueError: If any of the fields cannot be converted to the appropriate type.
+        #     UserIndex: The sorted user IDs, read from './data/user.txt' on first use.
 
-        users = []
-        if os.path.exists('./data/user.txt'):
-            with open('./data/user.txt', 'r') as file:
-                for line in file:
-                    data = line.strip().split(',')
-                    if len(data) == 11:  # Ensure the correct number of fields
-                        user = User(data[0], int(data[1]), int(data[2]), int(data[3]), data[4], int(data[5]), int(data[6]), int(data[7]), float(data[8]), int(data[9]), int(data[10]))
-                        users.append(user)
-        return users
+        return get_user_index()
 
-    def check_window_size(self):
+    async def check_window_size(self):
 
         # Checks if the current terminal window size meets the minimum required dimensions.
         # The minimum required dimensions are:
@@ -73,8 +71,7 @@ class UserStatistics:
         # - Width: 142 columns
         #
         # If the terminal window is too small, a message is displayed prompting the user to 
-        # increase the window size. The function waits for the user to press a key before 
-        # returning.
+        # increase the window size. The function awaits a key before returning.
         #
         # Returns:
         #     bool: True if the terminal window size is sufficient, False otherwise.
@@ -91,11 +88,11 @@ class UserStatistics:
             x = (w - len(message)) // 2
             size_prompt.addstr(y, x, message, curses.A_BOLD)
             size_prompt.refresh()
-            size_prompt.getch()  # Wait for user input
+            await self.keys.get()  # Wait for user input
             return False
         return True
 
-    def display(self):
+    async def display(self):
 
         # Display user statistics in a loop until the user exits.
         # 
@@ -107,28 +104,30 @@ class UserStatistics:
         # Returns:
         #     None
 
+        if not self.users.loaded:
+            await asyncio.wrap_future(aio.run_io(self.users.load))  # With the other user file I/O, off the loop
         while True:
-            if not self.check_window_size():
+            if not await self.check_window_size():
                 continue
             if self.current_user is None:
-                if not self.select_user():
+                if not await self.select_user():
                     break  # Exit the loop if ESC is pressed in select_user
-            self.display_user_stats()
+            await self.display_user_stats()
 
-    def select_user(self):
+    async def select_user(self):
 
         # Displays a user selection menu in a curses window and allows the user to select a user to view statistics.
         # The function handles the following:
         # - Displays a message if no users are registered.
-        # - Allows navigation through the list of users using the arrow keys.
+        # - Allows navigation through the list of users using the arrow and page keys, and searching it by typing
+        #   (see util/list_view.py), however many users there are.
         # - Allows selection of a user using the Enter key or mouse click.
         # - Returns to the main menu if the ESC key is pressed.
         # Returns:
         #     bool: True if a user is selected, False if the ESC key is pressed to return to the main menu.
 
-        current_row = 0
         while True:
-            if not self.check_window_size():
+            if not await self.check_window_size():
                 continue
             self.stdscr.clear()
             h, w = self.stdscr.getmaxyx()
@@ -138,56 +137,32 @@ class UserStatistics:
                 self.stdscr.addstr(h // 2 + 5, (w - len("Press ESC to return to the main menu.")) // 2, "Press ESC to return to the main menu.", curses.A_DIM)
                 self.stdscr.refresh()
                 while True:
-                    if not self.check_window_size():
+                    if not await self.check_window_size():
                         continue
-                    key = self.stdscr.getch()
+                    key = await self.keys.get()
                     if key == 27:  # ESC key
                         return False
             else:
-                self.stdscr.addstr(h // 2 - len(self.users) // 2 - 1, (w - len("Select a user to view statistics:")) // 2, "Select a user to view statistics:", curses.A_BOLD | curses.A_UNDERLINE)
-                for idx, user in enumerate(self.users):
-                    x = (w - len(f"{idx + 1}. {user.user_id}")) // 2
-                    y = h // 2 - len(self.users) // 2 + idx
-                    if idx == current_row:
-                        self.stdscr.attron(curses.color_pair(1))
-                        self.stdscr.addstr(y, x, f"{idx + 1}. {user.user_id}")
-                        self.stdscr.attroff(curses.color_pair(1))
-                    else:
-                        self.stdscr.addstr(y, x, f"{idx + 1}. {user.user_id}")
-                self.stdscr.addstr(h // 2 + len(self.users) // 2 + 4, (w - len("Press ESC to return to the main menu.")) // 2, "Press ESC to return to the main menu.", curses.A_DIM)
-                self.stdscr.refresh()
-
-                while True:
-                    if not self.check_window_size():
-                        continue
-                    key = self.stdscr.getch()
-                    if key == 27:  # ESC key
-                        return False
-                    elif key == curses.KEY_UP and current_row > 0:
-                        current_row -= 1
-                        break
-                    elif key == curses.KEY_DOWN and current_row < len(self.users) - 1:
-                        current_row += 1
-                        break
-                    elif key == curses.KEY_ENTER or key in [10, 13]:
-                        self.current_user = self.users[current_row]
-                        return True
-                    elif key == curses.KEY_MOUSE:
-                        _, mx, my, _, _ = curses.getmouse()
-                        for idx, user in enumerate(self.users):
-                            x = (w - len(f"{idx + 1}. {user.user_id}")) // 2
-                            y = h // 2 - len(self.users) // 2 + idx
-                            if y == my and x <= mx <= x + len(f"{idx + 1}. {user.user_id}"):
-                                self.current_user = self.users[idx]
-                                return True
-
-    def display_user_stats(self):
+                # Only the rows on screen are drawn, and typing jumps to the users starting with the typed text.
+                # The list is kept, so coming back from a user's statistics keeps the search and position.
+                if self.user_list is None:
+                    self.user_list = ListView(self.stdscr, self.users, title="Select a user to view statistics:",
+                                              help_text="Type to search, Enter to view, ESC to return to the main menu.")
+                action, user_id = await self.user_list.run(self.keys)
+                if action != "pick":
+                    return False
+                # Read on the I/O thread, after the games of the user still being saved there
+                user = await asyncio.wrap_future(aio.run_io(User.load_from_file, user_id))
+                self.current_user = user or User(user_id)
+                return True
+
+    async def display_user_stats(self):
 
         # Display the current user's statistics in a curses window.
         # This method continuously checks the window size and updates the display
         # to show the user's statistics centered on the screen. The statistics
         # include the number of games played, games won, highest score in classic
-        # mode, and highest score in timed mode. The user can press the ESC key
+        # mode, and the results of every difficulty played. The user can press the ESC key
         # to return to the user selection screen.
         #
         # The statistics are displayed as follows:
@@ -195,7 +170,7 @@ class UserStatistics:
         # - Games Played: <games_played>
         # - Games Won: <games_won>
         # - Highest Score (Classic Mode): <highest_score_classic>
-        # - Highest Score (Timed Mode): <highest_score_timed>
+        # - <difficulty>: <games> games, <wins> won, best score <best_score>, fewest moves <best_moves>, <mines> mines
         # - Press ESC to return to user selection.
         # The method handles window resizing and ensures the text is always centered.
         #
@@ -203,7 +178,7 @@ class UserStatistics:
         #     None
 
         while True:
-            if not self.check_window_size():
+            if not await self.check_window_size():
                 continue
             self.stdscr.clear()
             h, w = self.stdscr.getmaxyx()
@@ -217,16 +192,26 @@ class UserStatistics:
             self.stdscr.addstr(start_y + 2, (w - len(f"Games Played: {stats['games_played']}")) // 2, f"Games Played: {stats['games_played']}")
             self.stdscr.addstr(start_y + 3, (w - len(f"Games Won: {stats['games_won']}")) // 2, f"Games Won: {stats['games_won']}")
             self.stdscr.addstr(start_y + 4, (w - len(f"Highest Score (Classic Mode): {stats['highest_score_classic']}")) // 2 + 6, f"Highest Score: {stats['highest_score_classic']}")
-            self.stdscr.addstr(start_y + 10, (w - len("Press ESC to return to user selection.")) // 2, "Press ESC to return to user selection.", curses.A_DIM)
+
+            # One line per difficulty played, as many as fit above the help line
+            difficulties = list(stats['difficulties'].items())[:max(0, h - start_y - 9)]
+            for idx, (label, difficulty) in enumerate(difficulties):
+                best_score = difficulty['best_score'] if difficulty['best_score'] is not None else 'N/A'
+                best_moves = difficulty['best_moves'] if difficulty['best_moves'] is not None else 'N/A'
+                line = (f"{label}: {difficulty['games']} games, {difficulty['wins']} won, best score {best_score}, "
+                        f"fewest moves {best_moves}, {difficulty['mines_stepped']} mines")
+                self.stdscr.addstr(start_y + 6 + idx, (w - len(line)) // 2, line)
+            help_y = max(start_y + 10, start_y + 7 + len(difficulties))
+            self.stdscr.addstr(help_y, (w - len("Press ESC to return to user selection.")) // 2, "Press ESC to return to user selection.", curses.A_DIM)
 
             # Refresh the window to show the changes
             self.stdscr.refresh()
 
             # Wait for user input to return to user selection
             while True:
-                if not self.check_window_size():
+                if not await self.check_window_size():
                     continue
-                key = self.stdscr.getch()
+                key = await self.keys.get()
                 if key == 27:  # ESC key
                     self.current_user = None
                     return
\ No newline at end of file
@@ -0,0 +1,335 @@
+# The user store: the statistics of every user, kept in ./data/user.txt.
+#
+# This module is the only place that knows the layout of the file. Everything else reads and writes users
+# through iter_users(), iter_user_ids(), load_user(), add_user() and save_user(), which work on the stats
+# dictionaries made by new_stats().
+#
+# File layout (SCHEMA_VERSION 2): a header line "#wordweeper-stats,2", then one line per user holding the user
+# ID, the FIELDS in order and the per-difficulty aggregates, comma-separated. The aggregates are one
+# "label:games:wins:best_score:best_moves:mines_stepped" group per difficulty, separated by ';'
+# (labels as in util/leaderboard.py, e.g. "Easy" or "Custom-25"). Empty numbers are None.
+#
+# Files without a header are version 1: eleven columns whose last three were read as average / min / max steps
+# by the boards and written as min steps / total steps / steps games by User. Nothing ever updated them, so
+# they are read the way User wrote them. A version 1 file is migrated the first time it is read: it is
+# converted line by line into a new file, so memory use does not grow with the number of users, and kept as
+# user.txt.v1.
+
+import math
+import os
+
+STATS_PATH = './data/user.txt'
+SCHEMA_VERSION = 2
+HEADER = f"#wordweeper-stats,{SCHEMA_VERSION}"
+
+# (name, type, default) of the overall statistics, in file order
+FIELDS = [
+    ("games_played", int, 0),
+    ("games_won", int, 0),
+    ("words_revealed", int, 0),
+    ("longest_word_revealed", str, ""),
+    ("mines_stepped", int, 0),
+    ("highest_score_classic", int, 0),  # The best score of all classic difficulties
+    ("highest_score_timed", int, 0),  # The best score of the timed mode
+    ("min_steps_used", int, None),  # Fewest moves of a won game
+    ("total_steps", int, 0),
+    ("games_played_steps", int, 0),
+]
+
+# (name, type, default) of the statistics of one difficulty, in file order
+DIFFICULTY_FIELDS = [
+    ("games", int, 0),
+    ("wins", int, 0),
+    ("best_score", int, None),
+    ("best_moves", int, None),  # Fewest moves of a won game
+    ("mines_stepped", int, 0),
+]
+
+
+def new_stats():
+
+    # Returns the statistics of a user who has not played yet.
+    #
+    # Returns:
+    #     dict: The FIELDS with their defaults, and 'difficulties': {} (label -> dict of DIFFICULTY_FIELDS).
+
+    stats = {name: default for name, _, default in FIELDS}
+    stats['difficulties'] = {}
+    return stats
+
+
+def new_difficulty_stats():
+    return {name: default for name, _, default in DIFFICULTY_FIELDS}
+
+
+def format_value(value):
+    return "" if value is None else str(value)
+
+
+def parse_value(text, kind):
+    if kind is str:
+        return text
+    return None if text == "" else kind(text)
+
+
+def format_record(user_id, stats):
+
+    # Formats the line of a user (with its newline).
+
+    values = [user_id] + [format_value(stats[name]) for name, _, _ in FIELDS]
+    groups = []
+    for label, difficulty in stats['difficulties'].items():
+        groups.append(':'.join([label] + [format_value(difficulty[name]) for name, _, _ in DIFFICULTY_FIELDS]))
+    values.append(';'.join(groups))
+    return ','.join(values) + '\n'
+
+
+def parse_record(line):
+
+    # Parses the line of a user.
+    #
+    # Returns:
+    #     tuple: (user id, stats dict).
+    #
+    # Raises:
+    #     ValueError: If the line does not have the fields of the schema.
+
+    data = line.rstrip('\n').split(',')
+    if len(data) != len(FIELDS) + 2:
+        raise ValueError(f"Expected {len(FIELDS) + 2} fields, got {len(data)}")
+    stats = {name: parse_value(text, kind) for (name, kind, _), text in zip(FIELDS, data[1:])}
+    difficulties = {}
+    if data[-1]:
+        for group in data[-1].split(';'):
+            parts = group.split(':')
+            difficulties[parts[0]] = {name: parse_value(text, kind)
+                                      for (name, kind, _), text in zip(DIFFICULTY_FIELDS, parts[1:])}
+    stats['difficulties'] = difficulties
+    return data[0], stats
+
+
+def parse_v1_record(line):
+
+    # Parses the line of a user in a version 1 file.
+    #
+    # Returns:
+    #     tuple: (user id, stats dict), or None if the line does not have the eleven columns or their numbers.
+
+    data = line.strip().split(',')
+    if len(data) != 11:
+        return None
+    stats = new_stats()
+    try:
+        min_steps = float(data[8])
+        stats.update({
+            'games_played': int(data[1]),
+            'games_won': int(data[2]),
+            'words_revealed': int(data[3]),
+            'longest_word_revealed': data[4],
+            'mines_stepped': int(data[5]),
+            'highest_score_classic': int(data[6]),
+            'highest_score_timed': int(data[7]),
+            'total_steps': int(float(data[9])),
+            'games_played_steps': int(float(data[10])),
+        })
+    except ValueError:
+        return None
+    stats['min_steps_used'] = int(min_steps) if math.isfinite(min_steps) else None
+    return data[0], stats
+
+
+def file_version(path=STATS_PATH):
+
+    # Gets the schema version of a user file from its first line (None if the file is missing or empty).
+
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as file:
+        first_line = file.readline()
+    if not first_line:
+        return None
+    if first_line.startswith('#wordweeper-stats,'):
+        return int(first_line.strip().split(',')[1])
+    return 1
+
+
+def migrate(path=STATS_PATH):
+
+    # Converts a version 1 user file to the current schema, one line at a time. The old file is kept next
+    # to the new one with a ".v1" suffix. Lines without the eleven columns were ignored by every reader of
+    # version 1 files (and lines with broken numbers made them fail), so they are dropped.
+    #
+    # Args:
+    #     path (str): The user file.
+    #
+    # Returns:
+    #     int: The number of users converted.
+
+    converted = 0
+    temp_path = path + '.tmp'
+    with open(path, 'r') as source, open(temp_path, 'w') as target:
+        target.write(HEADER + '\n')
+        for line in source:
+            record = parse_v1_record(line)
+            if record is not None:
+                target.write(format_record(*record))
+                converted += 1
+    os.replace(path, path + '.v1')
+    os.replace(temp_path, path)
+    return converted
+
+
+def open_current(path=STATS_PATH):
+
+    # Opens a user file for reading after migrating it if needed, positioned after the header.
+    #
+    # Returns:
+    #     file: The open file, or None if there is no file.
+    #
+    # Raises:
+    #     ValueError: If the file was written by a newer version of the game.
+
+    version = file_version(path)
+    if version is None:
+        return None
+    if version == 1:
+        migrate(path)
+    elif version > SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema version {version}, this game reads up to {SCHEMA_VERSION}")
+    file = open(path, 'r')
+    file.readline()  # The header
+    return file
+
+
+def iter_users(path=STATS_PATH):
+
+    # Reads every user, one line at a time.
+    #
+    # Yields:
+    #     tuple: (user id, stats dict), in file order.
+
+    file = open_current(path)
+    if file is None:
+        return
+    with file:
+        for line in file:
+            try:
+                yield parse_record(line)
+            except ValueError:
+                continue
+
+
+def iter_user_ids(path=STATS_PATH):
+
+    # Reads the ID of every user, without parsing their statistics.
+    #
+    # Yields:
+    #     str: The user IDs, in file order.
+
+    file = open_current(path)
+    if file is None:
+        return
+    with file:
+        for line in file:
+            end = line.find(',')
+            if end > 0:
+                yield line[:end]
+
+
+def load_user(user_id, path=STATS_PATH):
+
+    # Reads the statistics of one user.
+    #
+    # Returns:
+    #     dict: The stats dict, or None if the user is not in the file.
+
+    prefix = user_id + ','
+    file = open_current(path)
+    if file is None:
+        return None
+    with file:
+        for line in file:
+            if line.startswith(prefix):
+                return parse_record(line)[1]
+    return None
+
+
+def add_user(user_id, stats, path=STATS_PATH):
+
+    # Appends a new user to the file, creating it if needed.
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    version = file_version(path)
+    if version == 1:
+        migrate(path)
+    with open(path, 'a') as file:
+        if version is None:
+            file.write(HEADER + '\n')
+        file.write(format_record(user_id, stats))
+
+
+def save_user(user_id, stats, path=STATS_PATH):
+
+    # Replaces the line of a user, or adds the user if it is not in the file. The file is copied line by
+    # line into a new file that then replaces it, so a crash never leaves it half written.
+
+    source = open_current(path)
+    if source is None:
+        add_user(user_id, stats, path)
+        return
+    prefix = user_id + ','
+    found = False
+    temp_path = path + '.tmp'
+    with source, open(temp_path, 'w') as target:
+        target.write(HEADER + '\n')
+        for line in source:
+            if not found and line.startswith(prefix):
+                target.write(format_record(user_id, stats))
+                found = True
+            else:
+                target.write(line)
+        if not found:
+            target.write(format_record(user_id, stats))
+    os.replace(temp_path, path)
+
+
+def add_game(stats, difficulty, score, won, moves, mines_stepped, words, timed=False):
+
+    # Adds a finished game to the statistics of a user.
+    #
+    # Args:
+    #     stats (dict): The stats dict, updated in place.
+    #     difficulty (str): The label of the difficulty, see util.leaderboard.difficulty_label().
+    #     score (int): The final score.
+    #     won (bool): Whether the game was won.
+    #     moves (int): The cells revealed.
+    #     mines_stepped (int): The mines stepped on.
+    #     words (list of str): The words found.
+    #     timed (bool): Whether the game was played in the timed mode, whose high score is kept apart.
+
+    stats['games_played'] += 1
+    stats['words_revealed'] += len(words)
+    stats['mines_stepped'] += mines_stepped
+    stats['total_steps'] += moves
+    stats['games_played_steps'] += 1
+    for word in words:
+        if len(word) > len(stats['longest_word_revealed']):
+            stats['longest_word_revealed'] = word
+    high_score = 'highest_score_timed' if timed else 'highest_score_classic'
+    stats[high_score] = max(stats[high_score], score)
+    if won:
+        stats['games_won'] += 1
+        if stats['min_steps_used'] is None or moves < stats['min_steps_used']:
+            stats['min_steps_used'] = moves
+
+    aggregate = stats['difficulties'].setdefault(difficulty, new_difficulty_stats())
+    aggregate['games'] += 1
+    aggregate['mines_stepped'] += mines_stepped
+    if aggregate['best_score'] is None or score > aggregate['best_score']:
+        aggregate['best_score'] = score
+    if won:
+        aggregate['wins'] += 1
+        if aggregate['best_moves'] is None or moves < aggregate['best_moves']:
+            aggregate['best_moves'] = moves
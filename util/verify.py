@@ -0,0 +1,173 @@
+# Replay verifier: plays every recorded game again and audits the high scores of the user store.
+#
+# Run it from the project root:
+#
+#     python -m util.verify [--users ID,ID] [--workers N] [--output PATH]
+#
+# Every replay in ./data/replays (see util/replay.py) is played again on a board without a screen, rebuilt from
+# its seed, through the same Board.reveal_cell() and scoring code as the game, as fast as the moves can be
+# applied. A replay whose recorded score differs from the recomputed one was altered. The highest_score_classic
+# of every user in ./data/user.txt is then checked against the best recomputed score of the user's classic
+# replays (timed games are replayed and checked too, but their high score is kept apart).
+# Users are spread over worker processes, one user per task.
+#
+# Verdicts:
+#     ok                  Every replay matches and so does the high score.
+#     replay mismatch     A replay's recorded score is not what its moves score.
+#     score mismatch      The high score is not the best score of the user's games.
+#     unverified          The user has games without a replay (played before replays were recorded), and the
+#                         high score is higher than any replay, so it can be neither confirmed nor refuted.
+#
+# The exit status is 1 when a replay or score mismatch was found, so a nightly job can alert on it.
+# The boards are rebuilt from the current data/words.txt, so replays recorded with another word list mismatch.
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# Make the project importable when this file is run directly as well as with -m
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util import user_store
+from util.replay import REPLAY_DIR, REPLAY_SUFFIX, FLAG_TIMED, apply_event, build_board, load_replays
+
+OK = "ok"
+REPLAY_MISMATCH = "replay mismatch"
+SCORE_MISMATCH = "score mismatch"
+UNVERIFIED = "unverified"
+FAILED = (REPLAY_MISMATCH, SCORE_MISMATCH)
+
+
+def replay_score(replay):
+
+    # Plays a replay again on a board without a screen.
+    #
+    # Args:
+    #     replay (Replay): The replay.
+    #
+    # Returns:
+    #     int: The score its moves get.
+
+    board = build_board(replay)
+    for tick, action, row, col in replay.events():
+        apply_event(board, action, row, col, tick)
+    return board.score
+
+
+def load_user_scores():
+
+    # Reads the games played and the classic high score of every user in ./data/user.txt.
+    #
+    # Returns:
+    #     dict: user id -> (games_played, highest_score_classic).
+
+    return {user_id: (stats['games_played'], stats['highest_score_classic']) for user_id, stats in user_store.iter_users()}
+
+
+def verify_user(task):
+
+    # Verifies the replays and the high score of one user. Runs in a worker process.
+    #
+    # Args:
+    #     task (tuple): (user id, games played, highest_score_classic), the last two None for users
+    #                   that have replays but no entry in the user store.
+    #
+    # Returns:
+    #     dict: The verdict and what it is based on.
+
+    user_id, games_played, highest_score = task
+    replays = load_replays(user_id)
+    altered = []
+    best_score = 0  # highest_score_classic starts at 0
+    for number, replay in enumerate(replays):
+        score = replay_score(replay)
+        if score != replay.score:
+            altered.append({"replay": number, "recorded": replay.score, "recomputed": score})
+        if not replay.flags & FLAG_TIMED:
+            best_score = max(best_score, score)
+
+    if altered:
+        verdict = REPLAY_MISMATCH
+    elif highest_score is None or highest_score < best_score:
+        verdict = SCORE_MISMATCH
+    elif highest_score == best_score:
+        verdict = OK
+    elif games_played > len(replays):
+        verdict = UNVERIFIED
+    else:
+        verdict = SCORE_MISMATCH
+    return {
+        "user": user_id,
+        "verdict": verdict,
+        "highest_score_classic": highest_score,
+        "best_replay_score": best_score,
+        "games_played": games_played,
+        "replays": len(replays),
+        "altered_replays": altered,
+    }
+
+
+def run_verification(user_ids=None, workers=None):
+
+    # Verifies every user in parallel.
+    #
+    # Args:
+    #     user_ids (list of str, optional): The users to verify (default: every user of the user store and
+    #                                       every user with a replay file).
+    #     workers (int, optional): Worker processes (default: one per CPU).
+    #
+    # Returns:
+    #     list of dict: The results of verify_user(), in user order.
+
+    scores = load_user_scores()
+    if user_ids is None:
+        user_ids = set(scores)
+        if os.path.isdir(REPLAY_DIR):
+            user_ids.update(name[:-len(REPLAY_SUFFIX)] for name in os.listdir(REPLAY_DIR) if name.endswith(REPLAY_SUFFIX))
+        user_ids = sorted(user_ids)
+    tasks = [(user_id,) + scores.get(user_id, (None, None)) for user_id in user_ids]
+    with multiprocessing.Pool(workers) as pool:
+        # Users with many games and users with few are mixed in every chunk
+        return pool.map(verify_user, tasks, chunksize=max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 8)))
+
+
+def main(argv):
+    user_ids = None
+    workers = None
+    output_path = None
+    if "--users" in argv:
+        user_ids = argv[argv.index("--users") + 1].split(',')
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+    if "--output" in argv:
+        output_path = argv[argv.index("--output") + 1]
+
+    start = time.perf_counter()
+    results = run_verification(user_ids, workers)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result["verdict"] != OK:
+            print(f"{result['user']:<17}{result['verdict']:<17}high score {result['highest_score_classic']}, "
+                  f"best replay {result['best_replay_score']}, {result['replays']} replays of "
+                  f"{result['games_played']} games")
+            for altered in result["altered_replays"]:
+                print(f"{'':<17}replay {altered['replay']}: recorded {altered['recorded']}, "
+                      f"recomputed {altered['recomputed']}")
+    replays = sum(result["replays"] for result in results)
+    counts = {verdict: sum(result["verdict"] == verdict for result in results)
+              for verdict in (OK, REPLAY_MISMATCH, SCORE_MISMATCH, UNVERIFIED)}
+    print(f"\n{len(results)} users, {replays} replays in {elapsed:.1f} s ({replays / max(elapsed, 1e-9):.0f} replays/s): "
+          + ", ".join(f"{count} {verdict}" for verdict, count in counts.items()))
+    if output_path:
+        with open(output_path, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {output_path}")
+    if any(result["verdict"] in FAILED for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])